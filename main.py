@@ -1,9 +1,17 @@
 import logging
 
 from src.utils.io import load_data, load_config
+from src.utils.memory import MemoryBudget, set_memory_budget
+from src.utils.rendering import RenderProfile, set_render_profile
+from src.data.validation import validate_data
+from src.data.text_normalization import normalize_text_columns
+from src.analysis.network import add_network_features
+from src.data.reshape import TimeFamilies
 from src.utils.basic_visualization import *
 
 from src.visualization.quantitative import *
+from src.visualization.dashboard import build_dashboard_aggregates, serve_dashboard
+from src.models.folds import build_fold_store
 
 # Configuration globale du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -14,23 +22,36 @@ raw_path = config["data"]["raw_path"]
 encoding = config["data"]["encoding"]
 
 figures_path = config["visualization"]["save_path"]
+# thumbnail=True : vignettes basse résolution, pleine résolution à la demande avec render_full_resolution
+set_render_profile(RenderProfile.from_config(config, thumbnail=False))
+set_memory_budget(MemoryBudget.from_config(config))
 
 df_speed_dating = load_data(raw_path, encoding=encoding)
+validation_report = validate_data(df_speed_dating)
+df_speed_dating = normalize_text_columns(df_speed_dating, cache_path=config["data"]["text_mapping_path"])
+df_speed_dating = add_network_features(df_speed_dating)
 
 display_head(df_speed_dating)
 display_info(df_speed_dating)
 display_description(df_speed_dating)
 plot_missing_values(df_speed_dating, figures_path)
 
-# plot_temporal_histograms(df_speed_dating, "attr1_", ["1", "2", "3"], "gender", save_path=figures_path)
-plot_temporal_histograms2(df_speed_dating, "attr1_", ["1", "2", "3"], "gender", save_path=figures_path)
+# Vues longues partagées par tous les graphiques longitudinaux
+families = TimeFamilies(df_speed_dating)
+
+# plot_temporal_histograms(df_speed_dating, "attr1_", ["1", "2", "3"], "gender", save_path=figures_path, families=families)
+plot_temporal_histograms2(df_speed_dating, "attr1_", ["1", "2", "3"], "gender", save_path=figures_path, families=families)
 
 # plot_scatter_comparison(df_speed_dating, "attr1_1", "attr", "gender", save_path=figures_path)
 
-# plot_violin_comparison(df_speed_dating, ["attr3_1", "attr_o"], "gender", save_path=figures_path)
+# plot_violin_comparison(df_speed_dating, ["attr3_1", "attr_o"], "gender", save_path=figures_path, families=families)
 
 # plot_boxplots_by_decision(df_speed_dating, ["attr", "sinc", "intel", "fun", "amb", "shar", "like", "prob"], "dec", save_path=figures_path)
 
 # plot_scatter_comparison(df_speed_dating, "int_corr", "like", "dec", save_path=figures_path)
 
-# plot_correlation_heatmap(df_speed_dating, ["attr", "sinc", "intel", "fun", "amb", "shar", "like", "prob", "dec"], save_path=figures_path)
\ No newline at end of file
+# plot_correlation_heatmap(df_speed_dating, ["attr", "sinc", "intel", "fun", "amb", "shar", "like", "prob", "dec"], save_path=figures_path)
+
+# fold_store = build_fold_store(df_speed_dating, config, "./data/processed/folds")
+
+# serve_dashboard(build_dashboard_aggregates(df_speed_dating, cache_path="./data/processed/dashboard_aggregates.pkl"))
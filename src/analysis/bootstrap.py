@@ -0,0 +1,262 @@
+"""
+Module pour les intervalles de confiance par bootstrap.
+Contient un rééchantillonnage vectorisé (matrices d'indices traitées par blocs pour borner
+la mémoire, éventuellement réparties sur plusieurs processus) pour les différences de
+moyennes / médianes entre groupes et pour les corrélations. Les observations répétées d'un même
+participant (une ligne par rendez-vous) peuvent être rééchantillonnées par grappes entières.
+"""
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from scipy.stats import rankdata
+from typing import Dict, List
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Nombre maximal d'éléments d'une matrice d'indices rééchantillonnés par bloc
+MAX_BLOCK_ELEMENTS = 5_000_000
+
+
+def _location(resampled: np.ndarray, statistic: str) -> np.ndarray:
+    if statistic == "mean":
+        return resampled.mean(axis=1)
+    if statistic == "median":
+        return np.median(resampled, axis=1)
+    raise ValueError(f"Statistique non supportée: {statistic}")
+
+
+def _weighted_location(values: np.ndarray, weights: np.ndarray, statistic: str) -> np.ndarray:
+    """Moyenne ou médiane pondérée de `values` (n,) pour chaque ligne de `weights` (réplications, n)."""
+    if statistic == "mean":
+        return weights @ values / weights.sum(axis=1)
+    if statistic == "median":
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[:, order], axis=1)
+        half = cumulative[:, -1:] / 2
+        # Milieu des deux valeurs centrales (comme np.median pour des poids unitaires)
+        lower = (cumulative < half).sum(axis=1)
+        upper = np.minimum((cumulative <= half).sum(axis=1), len(values) - 1)
+        return (values[order][lower] + values[order][upper]) / 2
+    raise ValueError(f"Statistique non supportée: {statistic}")
+
+
+def _row_correlation(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    xc = x - x.mean(axis=1, keepdims=True)
+    yc = y - y.mean(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (xc * yc).sum(axis=1) / np.sqrt((xc ** 2).sum(axis=1) * (yc ** 2).sum(axis=1))
+
+
+def _evaluate(kind: str, statistic: str, samples: tuple) -> float:
+    """Statistique observée sur les échantillons d'origine."""
+    if kind.startswith("cluster_"):
+        # Échantillons (valeurs, grappes) : chaque ligne de poids 1
+        weights = tuple(np.ones((1, len(s))) for s in samples[::2])
+        return float(_evaluate_block(kind, statistic, (samples[::2], weights))[0])
+    return float(_evaluate_block(kind, statistic, tuple(s[None, :] for s in samples))[0])
+
+
+def _evaluate_block(kind: str, statistic: str, resampled: tuple) -> np.ndarray:
+    if kind in ("cluster_difference", "cluster_location"):
+        values, weights = resampled
+        locations = [_weighted_location(v, w, statistic) for v, w in zip(values, weights)]
+        return locations[0] - locations[1] if kind == "cluster_difference" else locations[0]
+    if kind == "difference":
+        return _location(resampled[0], statistic) - _location(resampled[1], statistic)
+    if kind == "location":
+        return _location(resampled[0], statistic)
+    if kind == "correlation":
+        x, y = resampled
+        if statistic == "spearman":
+            x, y = rankdata(x, axis=1), rankdata(y, axis=1)
+        elif statistic != "pearson":
+            raise ValueError(f"Méthode de corrélation non supportée: {statistic}")
+        return _row_correlation(x, y)
+    raise ValueError(f"Type de bootstrap non supporté: {kind}")
+
+
+def _bootstrap_block(kind: str, statistic: str, samples: tuple, n_resamples: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Calcule un bloc de réplications bootstrap à partir d'une matrice d'indices."""
+    rng = np.random.default_rng(seed)
+    if kind.startswith("cluster_"):
+        # Grappes tirées avec remise : chaque ligne reçoit le nombre de tirages de sa grappe
+        values, weights = samples[::2], []
+        for codes in samples[1::2]:
+            n_clusters = codes.max() + 1
+            draws = rng.integers(0, n_clusters, size=(n_resamples, n_clusters))
+            draws += np.arange(n_resamples)[:, None] * n_clusters
+            counts = np.bincount(draws.ravel(), minlength=n_resamples * n_clusters).reshape(n_resamples, n_clusters)
+            weights.append(counts[:, codes].astype(float))
+        return _evaluate_block(kind, statistic, (values, tuple(weights)))
+    if kind == "correlation":
+        # Échantillon apparié : les mêmes indices pour x et y
+        idx = rng.integers(0, len(samples[0]), size=(n_resamples, len(samples[0])))
+        resampled = (samples[0][idx], samples[1][idx])
+    else:
+        resampled = tuple(s[rng.integers(0, len(s), size=(n_resamples, len(s)))] for s in samples)
+    return _evaluate_block(kind, statistic, resampled)
+
+
+def bootstrap_distribution(kind: str, statistic: str, samples: tuple, n_resamples: int = 2000,
+                           chunk_size: int = None, n_jobs: int = 1, random_state: int = None) -> np.ndarray:
+    """
+    Génère la distribution bootstrap d'une statistique, par blocs de réplications.
+
+    Le résultat ne dépend que de `random_state` et `chunk_size`, pas de `n_jobs`.
+
+    Args:
+        kind (str): "difference" (deux échantillons), "location" (un échantillon) ou "correlation" (appariés) ;
+            "cluster_difference" et "cluster_location" rééchantillonnent des grappes entières.
+        statistic (str): "mean"/"median" pour les différences et positions, "pearson"/"spearman" pour les corrélations.
+        samples (tuple): Échantillons (tableaux 1D sans valeurs manquantes) ; pour les grappes,
+            couples (valeurs, codes de grappe 0..k-1) à plat : (x, codes_x[, y, codes_y]).
+        n_resamples (int): Nombre de réplications.
+        chunk_size (int, optional): Réplications par bloc (par défaut bornée par MAX_BLOCK_ELEMENTS).
+        n_jobs (int): Nombre de processus.
+        random_state (int, optional): Graine.
+
+    Returns:
+        np.ndarray: Les n_resamples réplications.
+    """
+    if chunk_size is None:
+        chunk_size = max(1, MAX_BLOCK_ELEMENTS // max(len(s) for s in samples))
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    if n_jobs == 1 or len(sizes) == 1:
+        blocks = [_bootstrap_block(kind, statistic, samples, size, seed) for size, seed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            blocks = list(executor.map(_bootstrap_block, [kind] * len(sizes), [statistic] * len(sizes),
+                                       [samples] * len(sizes), sizes, seeds))
+    return np.concatenate(blocks)
+
+
+def _summarize(kind: str, statistic: str, samples: tuple, confidence: float, **kwargs) -> Dict[str, float]:
+    if any(len(s) < 2 for s in samples):
+        raise ValueError("Chaque échantillon doit contenir au moins deux valeurs.")
+    if kind.startswith("cluster_") and any(codes.max() < 1 for codes in samples[1::2]):
+        raise ValueError("Chaque échantillon doit contenir au moins deux grappes.")
+    replicates = bootstrap_distribution(kind, statistic, samples, **kwargs)
+    alpha = (1 - confidence) / 2
+    low, high = np.nanquantile(replicates, [alpha, 1 - alpha])
+    return {"estimate": _evaluate(kind, statistic, samples), "ci_low": float(low), "ci_high": float(high),
+            "std_error": float(np.nanstd(replicates, ddof=1)), "confidence": confidence, "n_resamples": len(replicates)}
+
+
+def _clustered(values, clusters) -> tuple:
+    """Valeurs non manquantes et codes 0..k-1 de leur grappe (ex. participant)."""
+    values = pd.Series(np.asarray(values, dtype=float))
+    observed = values.notna().to_numpy()
+    codes = pd.factorize(pd.Series(np.asarray(clusters))[observed])[0]
+    return values[observed].to_numpy(), codes
+
+
+def bootstrap_difference_ci(x, y, statistic: str = "mean", confidence: float = 0.95, x_clusters=None, y_clusters=None,
+                            **kwargs) -> Dict[str, float]:
+    """
+    Intervalle de confiance bootstrap (percentile) de la différence stat(x) - stat(y).
+
+    Args:
+        x, y: Échantillons indépendants (les valeurs manquantes sont ignorées).
+        statistic (str): "mean" ou "median".
+        confidence (float): Niveau de confiance.
+        x_clusters, y_clusters (optional): Grappe de chaque valeur (ex. iid) : les grappes sont
+            rééchantillonnées entières, les observations d'un même participant n'étant pas indépendantes.
+        **kwargs: n_resamples, chunk_size, n_jobs, random_state (voir `bootstrap_distribution`).
+
+    Returns:
+        Dict[str, float]: estimate, ci_low, ci_high, std_error, confidence, n_resamples.
+    """
+    if x_clusters is not None and y_clusters is not None:
+        samples = _clustered(x, x_clusters) + _clustered(y, y_clusters)
+        return _summarize("cluster_difference", statistic, samples, confidence, **kwargs)
+    samples = tuple(pd.Series(s, dtype=float).dropna().to_numpy() for s in (x, y))
+    return _summarize("difference", statistic, samples, confidence, **kwargs)
+
+
+def bootstrap_correlation_ci(x, y, method: str = "pearson", confidence: float = 0.95, **kwargs) -> Dict[str, float]:
+    """
+    Intervalle de confiance bootstrap (percentile) d'une corrélation entre deux variables appariées.
+
+    Args:
+        x, y: Variables appariées (les paires incomplètes sont ignorées).
+        method (str): "pearson" ou "spearman".
+        confidence (float): Niveau de confiance.
+        **kwargs: n_resamples, chunk_size, n_jobs, random_state (voir `bootstrap_distribution`).
+
+    Returns:
+        Dict[str, float]: estimate, ci_low, ci_high, std_error, confidence, n_resamples.
+    """
+    pairs = pd.DataFrame({"x": np.asarray(x, dtype=float), "y": np.asarray(y, dtype=float)}).dropna()
+    return _summarize("correlation", method, (pairs["x"].to_numpy(), pairs["y"].to_numpy()), confidence, **kwargs)
+
+
+def bootstrap_group_ci(df: pd.DataFrame, value_col: str, group_col: str, statistic: str = "mean",
+                       confidence: float = 0.95, cluster_col: str = None, **kwargs) -> pd.DataFrame:
+    """
+    Intervalle de confiance bootstrap de la moyenne (ou médiane) de chaque groupe.
+
+    Args:
+        df (pd.DataFrame): DataFrame contenant les données.
+        value_col (str): Variable quantitative (ex. "attr1_1").
+        group_col (str): Colonne de regroupement (ex. "gender").
+        statistic (str): "mean" ou "median".
+        confidence (float): Niveau de confiance.
+        cluster_col (str, optional): Grappe (ex. "iid") rééchantillonnée entière : sans elle, des
+            variables constantes par participant répétées sur chaque rendez-vous donnent des
+            intervalles trop étroits.
+        **kwargs: n_resamples, chunk_size, n_jobs, random_state (voir `bootstrap_distribution`).
+
+    Returns:
+        pd.DataFrame: Une ligne par groupe (estimate, ci_low, ci_high, ...).
+    """
+    rows = {}
+    for group, subset in df.groupby(group_col):
+        if cluster_col is not None:
+            values, codes = _clustered(subset[value_col], subset[cluster_col])
+            if len(values) < 2 or codes.max(initial=0) < 1:
+                continue
+            rows[group] = _summarize("cluster_location", statistic, (values, codes), confidence, **kwargs)
+            continue
+        values = subset[value_col].dropna().to_numpy(dtype=float)
+        if len(values) < 2:
+            continue
+        rows[group] = _summarize("location", statistic, (values,), confidence, **kwargs)
+    return pd.DataFrame.from_dict(rows, orient="index").rename_axis(group_col)
+
+
+def compare_groups(df: pd.DataFrame, value_cols: List[str], group_col: str, statistic: str = "mean",
+                   confidence: float = 0.95, cluster_col: str = None, **kwargs) -> pd.DataFrame:
+    """
+    Compare deux groupes (ex. hommes et femmes) sur plusieurs variables, avec IC bootstrap de la différence.
+
+    Args:
+        df (pd.DataFrame): DataFrame contenant les données.
+        value_cols (List[str]): Variables à comparer (ex. ["attr1_1", "attr1_2", "attr1_3"]).
+        group_col (str): Colonne à exactement deux modalités.
+        statistic (str): "mean" ou "median".
+        confidence (float): Niveau de confiance.
+        cluster_col (str, optional): Grappe (ex. "iid") rééchantillonnée entière (voir `bootstrap_group_ci`).
+        **kwargs: n_resamples, chunk_size, n_jobs, random_state (voir `bootstrap_distribution`).
+
+    Returns:
+        pd.DataFrame: Une ligne par variable ; la différence est groupe 2 - groupe 1 (modalités triées).
+    """
+    groups = sorted(df[group_col].dropna().unique())
+    if len(groups) != 2:
+        raise ValueError(f"{group_col} doit contenir exactement deux modalités.")
+    rows = {}
+    for col in value_cols:
+        if col not in df.columns:
+            logger.warning(f"Colonne {col} absente, ignorée")
+            continue
+        second, first = df[df[group_col] == groups[1]], df[df[group_col] == groups[0]]
+        clusters = (second[cluster_col], first[cluster_col]) if cluster_col is not None else (None, None)
+        rows[col] = bootstrap_difference_ci(second[col], first[col], statistic, confidence, *clusters, **kwargs)
+    result = pd.DataFrame.from_dict(rows, orient="index")
+    result.insert(0, "comparison", f"{groups[1]} - {groups[0]}")
+    return result
@@ -0,0 +1,148 @@
+"""
+Module pour le calcul des tableaux de contingence.
+Contient un moteur qui factorise chaque colonne qualitative une seule fois et construit
+les tableaux croisés (2 ou n variables) en ne comptant que les combinaisons de codes
+observées, avec cache.
+"""
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency
+from typing import Dict, Tuple
+
+
+class ContingencyEngine:
+    """
+    Moteur de tableaux de contingence partagé entre les graphiques qualitatifs.
+
+    Chaque colonne est factorisée (codes entiers triés) à la première utilisation ;
+    les tableaux et statistiques calculés sont mis en cache.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._codes: Dict[str, Tuple[np.ndarray, pd.Index]] = {}
+        self._tables: Dict[Tuple[str, ...], pd.DataFrame] = {}
+        self._counts: Dict[str, pd.Series] = {}
+        self._stats: Dict[Tuple[str, ...], Dict[str, float]] = {}
+
+    def codes(self, column: str) -> Tuple[np.ndarray, pd.Index]:
+        """
+        Retourne les codes entiers (-1 pour les valeurs manquantes) et les modalités d'une colonne.
+
+        Args:
+            column (str): Colonne qualitative.
+
+        Returns:
+            Tuple[np.ndarray, pd.Index]: Codes et modalités triées.
+        """
+        if column not in self._codes:
+            codes, uniques = pd.factorize(self.df[column], sort=True)
+            self._codes[column] = (codes, pd.Index(uniques, name=column))
+        return self._codes[column]
+
+    def counts(self, column: str) -> pd.Series:
+        """
+        Compte les modalités d'une colonne (équivalent de `value_counts`).
+
+        Args:
+            column (str): Colonne qualitative.
+
+        Returns:
+            pd.Series: Effectifs triés par ordre décroissant.
+        """
+        if column not in self._counts:
+            codes, uniques = self.codes(column)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            series = pd.Series(counts, index=uniques, name="count")
+            self._counts[column] = series.sort_values(ascending=False, kind="stable")
+        return self._counts[column]
+
+    def _observed_counts(self, columns: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray, list]:
+        """
+        Compte les seules combinaisons de modalités observées (jamais le tableau n-aire complet).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, list]: Codes des combinaisons observées (une ligne par
+            colonne), effectifs et modalités de chaque colonne.
+        """
+        all_codes, levels = zip(*(self.codes(col) for col in columns))
+        stacked = np.vstack(all_codes)
+        stacked = stacked[:, (stacked >= 0).all(axis=0)]
+        combos, counts = np.unique(stacked, axis=1, return_counts=True)
+        return combos, counts, list(levels)
+
+    def table(self, *columns: str) -> pd.DataFrame:
+        """
+        Construit le tableau de contingence des colonnes données (équivalent de `pd.crosstab`).
+
+        Pour n > 2 colonnes, les n-1 premières forment l'index (MultiIndex) et la dernière les colonnes.
+        Seules les combinaisons observées sont comptées : la taille du calcul ne dépend pas du
+        produit des nombres de modalités.
+
+        Args:
+            *columns (str): Au moins deux colonnes qualitatives.
+
+        Returns:
+            pd.DataFrame: Effectifs croisés, sans ligne ni colonne entièrement nulle.
+        """
+        if len(columns) < 2:
+            raise ValueError("Au moins deux colonnes sont nécessaires pour un tableau de contingence.")
+        key = tuple(columns)
+        if key not in self._tables:
+            combos, counts, levels = self._observed_counts(key)
+            # Lignes : combinaisons observées des n-1 premières colonnes (ordre lexicographique)
+            row_combos, row_codes = np.unique(combos[:-1], axis=1, return_inverse=True)
+            col_codes, col_positions = np.unique(combos[-1], return_inverse=True)
+            values = np.zeros((row_combos.shape[1], len(col_codes)), dtype=np.int64)
+            values[row_codes.ravel(), col_positions] = counts
+            if len(levels) == 2:
+                index = levels[0][row_combos[0]]
+            else:
+                index = pd.MultiIndex.from_arrays([level[codes] for level, codes in zip(levels[:-1], row_combos)],
+                                                  names=[level.name for level in levels[:-1]])
+            self._tables[key] = pd.DataFrame(values, index=index, columns=levels[-1][col_codes])
+        return self._tables[key]
+
+    def proportions(self, *columns: str, normalize: str = "index") -> pd.DataFrame:
+        """
+        Normalise un tableau de contingence (par ligne, par colonne ou au total).
+
+        Args:
+            *columns (str): Colonnes du tableau.
+            normalize (str): "index", "columns" ou "all".
+
+        Returns:
+            pd.DataFrame: Proportions.
+        """
+        table = self.table(*columns)
+        if normalize == "index":
+            return table.div(table.sum(axis=1), axis=0)
+        if normalize == "columns":
+            return table.div(table.sum(axis=0), axis=1)
+        if normalize == "all":
+            return table / table.to_numpy().sum()
+        raise ValueError(f"Normalisation non supportée: {normalize}")
+
+    def association(self, *columns: str) -> Dict[str, float]:
+        """
+        Calcule le test du chi-deux et le V de Cramér sur le tableau de contingence.
+
+        Args:
+            *columns (str): Colonnes du tableau.
+
+        Returns:
+            Dict[str, float]: chi2, p_value, dof et cramers_v.
+        """
+        key = tuple(columns)
+        if key not in self._stats:
+            table = self.table(*columns).to_numpy()
+            n = table.sum()
+            min_dim = min(table.shape) - 1
+            if min_dim < 1 or n == 0:
+                result = {"chi2": 0.0, "p_value": 1.0, "dof": 0, "cramers_v": 0.0}
+            else:
+                chi2, p_value, dof, _ = chi2_contingency(table, correction=False)
+                result = {"chi2": float(chi2), "p_value": float(p_value), "dof": int(dof),
+                          "cramers_v": float(np.sqrt(chi2 / (n * min_dim)))}
+            self._stats[key] = result
+        return self._stats[key]
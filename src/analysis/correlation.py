@@ -0,0 +1,110 @@
+"""
+Module pour le calcul des matrices de corrélation sous budget mémoire.
+Contient une corrélation de Pearson par morceaux de lignes (moments centrés par paires de colonnes
+calculés par produits matriciels puis fusionnés par la mise à jour de Chan, comme `DataFrame.corr`
+sur les paires complètes) et une fonction qui choisit entre calcul direct, calcul par morceaux
+et échantillonnage selon le budget mémoire actif.
+"""
+import numpy as np
+import pandas as pd
+from typing import List
+
+from src.utils.memory import get_memory_budget, track_peak
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Taille minimale d'un morceau déduite du budget : en deçà, le coût par morceau domine
+MIN_CHUNK_ROWS = 1024
+
+
+def chunked_corr(df: pd.DataFrame, chunk_rows: int = 100000, min_periods: int = 1) -> pd.DataFrame:
+    """
+    Corrélation de Pearson sur les observations complètes de chaque paire, calculée par morceaux de lignes.
+
+    Pour chaque paire (i, j), l'effectif, les moyennes, les sommes des carrés des écarts et le
+    co-moment sur les lignes où i et j sont observées sont calculés par morceau, sur des valeurs
+    recentrées par la moyenne de chaque colonne du morceau, puis fusionnés par la mise à jour de
+    Chan (comme `MomentSketch`) : pas de soustraction de grandes sommes brutes, donc pas de perte
+    de précision lorsque les valeurs sont loin de 0. Seules des matrices colonnes × colonnes sont
+    conservées ; le résultat coïncide avec `DataFrame.corr` aux erreurs d'arrondi près.
+
+    Args:
+        df (pd.DataFrame): Données (colonnes numériques).
+        chunk_rows (int): Nombre de lignes par morceau.
+        min_periods (int): Nombre minimal d'observations communes par paire.
+
+    Returns:
+        pd.DataFrame: Matrice de corrélation.
+    """
+    columns = df.columns
+    p = len(columns)
+    # mean[i, j] : moyenne de x_i sur les lignes où x_j est aussi observée (idem pour m2)
+    n, mean, m2, comoment = (np.zeros((p, p)) for _ in range(4))
+    for start in range(0, len(df), chunk_rows):
+        block = df.iloc[start:start + chunk_rows].to_numpy(dtype=float)
+        observed = (~np.isnan(block)).astype(float)
+        with np.errstate(invalid="ignore"):
+            shift = np.nan_to_num(np.nanmean(block, axis=0))
+        values = np.where(observed > 0, block - shift, 0.0)
+        n_chunk = observed.T @ observed
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sx = values.T @ observed
+            mean_chunk = np.where(n_chunk > 0, sx / n_chunk, 0.0)
+            m2_chunk = (values ** 2).T @ observed - mean_chunk * sx
+            comoment_chunk = values.T @ values - mean_chunk * sx.T
+        mean_chunk += shift[:, None]
+
+        # Fusion de Chan : écarts entre les moyennes du morceau et les moyennes courantes
+        total = n + n_chunk
+        delta = mean_chunk - mean
+        weight = np.divide(n * n_chunk, total, out=np.zeros_like(total), where=total > 0)
+        mean += delta * np.divide(n_chunk, total, out=np.zeros_like(total), where=total > 0)
+        m2 += m2_chunk + delta ** 2 * weight
+        comoment += comoment_chunk + delta * delta.T * weight
+        n = total
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = comoment / np.sqrt(m2 * m2.T)
+    corr[n < max(min_periods, 2)] = np.nan
+    corr = np.clip(corr, -1, 1)
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+def correlation_matrix(df: pd.DataFrame, columns: List[str] = None, method: str = "pearson") -> pd.DataFrame:
+    """
+    Matrice de corrélation des colonnes numériques, adaptée au budget mémoire actif.
+
+    Les colonnes sont d'abord projetées sur les colonnes numériques (ou `columns`). Si le calcul
+    direct dépasse le budget, la corrélation de Pearson est calculée par morceaux de lignes ;
+    les corrélations de rang, qui nécessitent toutes les lignes, sont calculées sur un échantillon.
+
+    Args:
+        df (pd.DataFrame): Données.
+        columns (List[str], optional): Colonnes à corréler.
+        method (str): "pearson", "spearman" ou "kendall".
+
+    Returns:
+        pd.DataFrame: Matrice de corrélation.
+    """
+    budget = get_memory_budget()
+    numeric = df[columns] if columns is not None else df.select_dtypes(include=["number", "bool"])
+    n, p = numeric.shape
+    # Copie float64 des données, masque des valeurs manquantes et matrice résultat
+    direct_bytes = n * p * 9 + p * p * 8
+    with track_peak("Matrice de corrélation"):
+        if budget.fits("Matrice de corrélation", direct_bytes):
+            return numeric.corr(method=method)
+        if method == "pearson":
+            fitted_rows = int((budget.limit_bytes - 6 * p * p * 8) / max(p * 24, 1))
+            if fitted_rows < min(budget.chunk_rows, MIN_CHUNK_ROWS):
+                logger.warning(f"Morceaux de {max(fitted_rows, 0)} lignes pour tenir dans le budget : "
+                               f"ramenés au minimum de {MIN_CHUNK_ROWS} lignes")
+            chunk_rows = max(min(budget.chunk_rows, max(fitted_rows, MIN_CHUNK_ROWS)), 1)
+            logger.info(f"Matrice de corrélation par morceaux de {chunk_rows} lignes")
+            return chunked_corr(numeric, chunk_rows)
+        n_rows = max(int(n * budget.limit_bytes / direct_bytes), 2)
+        logger.info(f"Matrice de corrélation ({method}) sur un échantillon de {n_rows} lignes sur {n}")
+        return numeric.sample(n=min(n_rows, n), random_state=budget.random_state).corr(method=method)
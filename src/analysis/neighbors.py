@@ -0,0 +1,241 @@
+"""
+Module pour la recherche de plus proches voisins entre participants.
+Contient un index KD-tree / ball-tree sur les vecteurs de préférences (une ligne par iid),
+avec requêtes k-NN et par rayon en lot, insertion incrémentale et persistance.
+"""
+import numpy as np
+import pandas as pd
+from scipy.spatial.distance import cdist
+from sklearn.neighbors import KDTree, BallTree
+from typing import List, Tuple
+
+from src.utils.io import save_model, load_model
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+PREFERENCE_COLUMNS = ["attr1_1", "sinc1_1", "intel1_1", "fun1_1", "amb1_1", "shar1_1"]
+
+_TREES = {"kd_tree": KDTree, "ball_tree": BallTree}
+
+
+def build_participant_matrix(df: pd.DataFrame, columns: List[str], id_col: str = "iid") -> pd.DataFrame:
+    """
+    Construit la matrice participant (une ligne par identifiant) à partir des lignes de rendez-vous.
+
+    Args:
+        df (pd.DataFrame): DataFrame au niveau rendez-vous.
+        columns (List[str]): Colonnes du vecteur de préférences.
+        id_col (str): Colonne identifiant le participant (ex. "iid").
+
+    Returns:
+        pd.DataFrame: Matrice indexée par id_col, sans valeurs manquantes.
+    """
+    participants = df.groupby(id_col, sort=True)[columns].first()
+    n_incomplete = participants.isna().any(axis=1).sum()
+    if n_incomplete:
+        logger.info(f"{n_incomplete} participants ignorés (vecteur incomplet)")
+    return participants.dropna()
+
+
+class ParticipantIndex:
+    """
+    Index de plus proches voisins sur les vecteurs de préférences des participants.
+
+    Les nouveaux participants (nouvelle vague) sont d'abord placés dans un tampon interrogé
+    par force brute ; l'arbre est reconstruit lorsque le tampon dépasse `rebuild_ratio`
+    fois la taille de l'arbre.
+    """
+
+    def __init__(self, columns: List[str] = None, algorithm: str = "kd_tree", leaf_size: int = 40,
+                 rebuild_ratio: float = 0.2, id_col: str = "iid"):
+        if algorithm not in _TREES:
+            raise ValueError(f"Algorithme non supporté: {algorithm}")
+        self.columns = list(columns) if columns is not None else list(PREFERENCE_COLUMNS)
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+        self.id_col = id_col
+        self._tree = None
+        self._tree_ids = np.empty(0, dtype=np.int64)
+        self._tree_points = np.empty((0, len(self.columns)))
+        self._buffer_ids = np.empty(0, dtype=np.int64)
+        self._buffer_points = np.empty((0, len(self.columns)))
+
+    def __len__(self) -> int:
+        return len(self._tree_ids) + len(self._buffer_ids)
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Identifiants indexés, dans l'ordre interne (arbre puis tampon)."""
+        return np.concatenate([self._tree_ids, self._buffer_ids])
+
+    def _participants(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        participants = build_participant_matrix(df, self.columns, self.id_col)
+        return participants.index.to_numpy(dtype=np.int64), participants.to_numpy(dtype=float)
+
+    def _rebuild(self) -> None:
+        self._tree_ids = np.concatenate([self._tree_ids, self._buffer_ids])
+        self._tree_points = np.vstack([self._tree_points, self._buffer_points])
+        self._buffer_ids = self._buffer_ids[:0]
+        self._buffer_points = self._buffer_points[:0]
+        self._tree = _TREES[self.algorithm](self._tree_points, leaf_size=self.leaf_size)
+        logger.info(f"Index {self.algorithm} reconstruit sur {len(self._tree_ids)} participants")
+
+    def fit(self, df: pd.DataFrame) -> "ParticipantIndex":
+        """
+        Construit l'index à partir d'un DataFrame au niveau rendez-vous.
+
+        Args:
+            df (pd.DataFrame): Données contenant id_col et les colonnes du vecteur.
+
+        Returns:
+            ParticipantIndex: L'index construit.
+        """
+        ids, points = self._participants(df)
+        self._tree_ids, self._tree_points = ids[:0], points[:0]
+        self._buffer_ids, self._buffer_points = ids, points
+        self._rebuild()
+        return self
+
+    def add(self, df: pd.DataFrame) -> "ParticipantIndex":
+        """
+        Ajoute les participants d'une nouvelle vague sans reconstruire tout l'index.
+
+        Args:
+            df (pd.DataFrame): Nouvelles lignes (id_col et colonnes du vecteur).
+
+        Returns:
+            ParticipantIndex: L'index mis à jour.
+
+        Raises:
+            ValueError: Si un participant est déjà indexé.
+        """
+        ids, points = self._participants(df)
+        duplicates = np.intersect1d(ids, self.ids)
+        if duplicates.size:
+            raise ValueError(f"Participants déjà indexés: {duplicates.tolist()}")
+        self._buffer_ids = np.concatenate([self._buffer_ids, ids])
+        self._buffer_points = np.vstack([self._buffer_points, points])
+        if self._tree is None or len(self._buffer_ids) > self.rebuild_ratio * len(self._tree_ids):
+            self._rebuild()
+        return self
+
+    def _as_points(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            X = X[self.columns]
+        points = np.asarray(X, dtype=float)
+        return points.reshape(1, -1) if points.ndim == 1 else points
+
+    def query(self, X, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recherche en lot des k plus proches voisins.
+
+        Args:
+            X: Vecteurs de requête (DataFrame avec les colonnes de l'index ou tableau n x d).
+            k (int): Nombre de voisins.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distances et identifiants (n x k), triés par distance.
+        """
+        if len(self) == 0:
+            raise ValueError("L'index est vide.")
+        points = self._as_points(X)
+        k = min(k, len(self))
+        k_tree = min(k, len(self._tree_ids))
+        dist, ind = self._tree.query(points, k=k_tree)
+        ids = self._tree_ids[ind]
+        if len(self._buffer_ids):
+            buffer_dist = cdist(points, self._buffer_points)
+            dist = np.hstack([dist, buffer_dist])
+            ids = np.hstack([ids, np.broadcast_to(self._buffer_ids, buffer_dist.shape)])
+            order = np.argsort(dist, axis=1, kind="stable")[:, :k]
+            dist = np.take_along_axis(dist, order, axis=1)
+            ids = np.take_along_axis(ids, order, axis=1)
+        return dist, ids
+
+    def query_radius(self, X, radius: float) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """
+        Recherche en lot des participants situés à moins de `radius`.
+
+        Args:
+            X: Vecteurs de requête (DataFrame avec les colonnes de l'index ou tableau n x d).
+            radius (float): Rayon de recherche.
+
+        Returns:
+            Tuple[List[np.ndarray], List[np.ndarray]]: Distances et identifiants par requête, triés par distance.
+        """
+        if len(self) == 0:
+            raise ValueError("L'index est vide.")
+        points = self._as_points(X)
+        ind, dist = self._tree.query_radius(points, r=radius, return_distance=True, sort_results=True)
+        buffer_dist = cdist(points, self._buffer_points) if len(self._buffer_ids) else None
+        distances, ids = [], []
+        for i in range(len(points)):
+            d, found = dist[i], self._tree_ids[ind[i]]
+            if buffer_dist is not None:
+                mask = buffer_dist[i] <= radius
+                d = np.concatenate([d, buffer_dist[i][mask]])
+                found = np.concatenate([found, self._buffer_ids[mask]])
+                order = np.argsort(d, kind="stable")
+                d, found = d[order], found[order]
+            distances.append(d)
+            ids.append(found)
+        return distances, ids
+
+    def neighbors_of(self, ids, k: int = 5) -> pd.DataFrame:
+        """
+        Retourne les k voisins les plus proches de participants déjà indexés (hors eux-mêmes).
+
+        Args:
+            ids: Identifiants des participants de référence.
+            k (int): Nombre de voisins.
+
+        Returns:
+            pd.DataFrame: Une ligne par couple (participant, voisin) avec le rang et la distance.
+        """
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        all_ids = self.ids
+        all_points = np.vstack([self._tree_points, self._buffer_points])
+        position = pd.Index(all_ids).get_indexer(ids)
+        if (position < 0).any():
+            raise KeyError(f"Participants non indexés: {ids[position < 0].tolist()}")
+        dist, found = self.query(all_points[position], k=k + 1)
+        not_self = found != ids[:, None]
+        # On retire le participant lui-même, puis on garde k voisins par ligne
+        keep = not_self & (np.cumsum(not_self, axis=1) <= k)
+        rows = np.repeat(ids, keep.sum(axis=1))
+        return pd.DataFrame({
+            self.id_col: rows,
+            "neighbor": found[keep],
+            "rank": np.cumsum(keep, axis=1)[keep],
+            "distance": dist[keep],
+        })
+
+    def save(self, path: str) -> None:
+        """
+        Sauvegarde l'index via la couche io.
+
+        Args:
+            path: Chemin du fichier de l'index.
+        """
+        save_model(self, path)
+
+    @staticmethod
+    def load(path: str) -> "ParticipantIndex":
+        """
+        Charge un index sauvegardé avec `save`.
+
+        Args:
+            path: Chemin du fichier de l'index.
+
+        Returns:
+            ParticipantIndex: L'index chargé.
+        """
+        index = load_model(path)
+        if not isinstance(index, ParticipantIndex):
+            raise TypeError(f"{path} ne contient pas un ParticipantIndex.")
+        return index
@@ -0,0 +1,190 @@
+"""
+Module pour l'analyse du réseau des rencontres.
+Contient la construction, en une seule fois, des matrices d'adjacence creuses des rencontres
+(iid -> pid) et des décisions (dec, dec_o, match) de toutes les vagues (matrice diagonale par
+blocs, une vague par bloc), et les métriques des participants calculées par algèbre linéaire
+creuse : degrés, réciprocité, sélectivité, popularité, assortativité et centralité (PageRank).
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Préfixe des métriques jointes aux rendez-vous ; calculées à partir de dec, dec_o et match, elles
+# contiennent la cible de chaque ligne et sont exclues des features par défaut des plis, avec ces
+# colonnes elles-mêmes (voir `src.models.folds.is_post_decision`)
+NETWORK_PREFIX = "net_"
+
+
+class MatchNetwork:
+    """
+    Réseau orienté des rencontres d'un DataFrame au format « une ligne par rendez-vous ».
+
+    Matrices (n_participants × n_participants, CSR) :
+        - dates : 1 si i a rencontré j ;
+        - decisions : 1 si i a dit oui à j (dec de la ligne (i, j), complété par dec_o de la ligne (j, i)) ;
+        - matches : 1 si la rencontre i–j est un match (colonne match, sinon oui réciproque).
+
+    Args:
+        df (pd.DataFrame): Données (colonnes id_col, partner_col, et si présentes wave_col, dec, dec_o, match).
+        id_col (str): Identifiant du participant.
+        partner_col (str): Identifiant du partenaire.
+        wave_col (str): Colonne de la vague.
+    """
+
+    def __init__(self, df: pd.DataFrame, id_col: str = "iid", partner_col: str = "pid", wave_col: str = "wave"):
+        self.id_col = id_col
+        data = df.dropna(subset=[id_col, partner_col])
+        codes, self.participants = pd.factorize(np.concatenate([data[id_col].to_numpy(), data[partner_col].to_numpy()]))
+        n_edges = len(data)
+        self.n = len(self.participants)
+        self._source, self._target = codes[:n_edges], codes[n_edges:]
+
+        # Vague de chaque participant (celle de sa première apparition)
+        self.waves = np.full(self.n, np.nan)
+        if wave_col in data.columns:
+            wave = np.tile(data[wave_col].to_numpy(dtype=float), 2)
+            first = np.unique(codes, return_index=True)[1]
+            self.waves[codes[first]] = wave[first]
+
+        self.dates = self._adjacency(np.ones(n_edges), self._source, self._target)
+        self.dates = self.dates.maximum(self.dates.T)
+        dec = data["dec"].to_numpy(dtype=float) if "dec" in data.columns else np.full(n_edges, np.nan)
+        dec_o = data["dec_o"].to_numpy(dtype=float) if "dec_o" in data.columns else np.full(n_edges, np.nan)
+        self.decisions = self._adjacency(np.nan_to_num(dec), self._source, self._target) \
+            .maximum(self._adjacency(np.nan_to_num(dec_o), self._target, self._source))
+        mutual = self.decisions.multiply(self.decisions.T)
+        if "match" in data.columns:
+            match = self._adjacency(np.nan_to_num(data["match"].to_numpy(dtype=float)), self._source, self._target)
+            self.matches = match.maximum(match.T)
+        else:
+            self.matches = mutual.tocsr()
+        self._mutual = mutual.tocsr()
+        logger.info(f"Réseau: {self.n} participants, {self.dates.nnz // 2} rencontres, {self.decisions.nnz} oui")
+
+    def _adjacency(self, weights: np.ndarray, source: np.ndarray, target: np.ndarray) -> sparse.csr_matrix:
+        """Matrice binaire (les doublons éventuels sont fusionnés)."""
+        keep = weights > 0
+        matrix = sparse.csr_matrix((np.ones(keep.sum()), (source[keep], target[keep])), shape=(self.n, self.n))
+        matrix.data[:] = 1.0
+        return matrix
+
+    def pagerank(self, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 200) -> np.ndarray:
+        """
+        Centralité PageRank du graphe des oui (un oui reçu d'un participant central compte davantage).
+
+        La téléportation est restreinte à la vague du participant, puis les scores sont ramenés à une
+        moyenne de 1 par vague pour rester comparables entre vagues de tailles différentes.
+
+        Returns:
+            np.ndarray: Score par participant (ordre de `participants`).
+        """
+        out_degree = np.asarray(self.decisions.sum(axis=1)).ravel()
+        # Matrice de transition (colonne-stochastique) : P[j, i] = 1 / out_degree(i) si i dit oui à j
+        inverse = np.divide(1.0, out_degree, out=np.zeros(self.n), where=out_degree > 0)
+        transition = (sparse.diags(inverse) @ self.decisions).T.tocsr()
+        wave_codes = pd.factorize(pd.Series(self.waves))[0]
+        wave_codes = np.where(wave_codes < 0, wave_codes.max() + 1, wave_codes)
+        wave_sizes = np.bincount(wave_codes)
+        teleport = 1.0 / wave_sizes[wave_codes]
+        dangling = out_degree == 0
+
+        rank = teleport / len(wave_sizes)
+        for _ in range(max_iter):
+            # La masse des participants sans oui est redistribuée dans leur vague
+            dangling_mass = np.bincount(wave_codes, weights=rank * dangling, minlength=len(wave_sizes))[wave_codes]
+            wave_mass = np.bincount(wave_codes, weights=rank, minlength=len(wave_sizes))[wave_codes]
+            updated = damping * (transition @ rank + dangling_mass * teleport) + (1 - damping) * wave_mass * teleport
+            if np.abs(updated - rank).sum() < tol:
+                rank = updated
+                break
+            rank = updated
+        wave_total = np.bincount(wave_codes, weights=rank, minlength=len(wave_sizes))[wave_codes]
+        return rank / wave_total * wave_sizes[wave_codes]
+
+    def participant_metrics(self) -> pd.DataFrame:
+        """
+        Métriques de chaque participant.
+
+        Returns:
+            pd.DataFrame: Indexé par identifiant : wave, n_dates, yes_given (degré sortant), yes_received
+                (degré entrant), matches, selectivity (part de non donnés), popularity (part de oui reçus),
+                reciprocity (part des oui donnés qui sont réciproques) et pagerank.
+        """
+        n_dates = np.asarray(self.dates.sum(axis=1)).ravel()
+        yes_given = np.asarray(self.decisions.sum(axis=1)).ravel()
+        yes_received = np.asarray(self.decisions.sum(axis=0)).ravel()
+        mutual = np.asarray(self._mutual.sum(axis=1)).ravel()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics = pd.DataFrame({
+                "wave": self.waves,
+                "n_dates": n_dates,
+                "yes_given": yes_given,
+                "yes_received": yes_received,
+                "matches": np.asarray(self.matches.sum(axis=1)).ravel(),
+                "selectivity": np.where(n_dates > 0, 1 - yes_given / n_dates, np.nan),
+                "popularity": np.where(n_dates > 0, yes_received / n_dates, np.nan),
+                "reciprocity": np.where(yes_given > 0, mutual / yes_given, np.nan),
+                "pagerank": self.pagerank(),
+            }, index=pd.Index(self.participants, name=self.id_col))
+        return metrics
+
+    def wave_summary(self) -> pd.DataFrame:
+        """
+        Métriques globales par vague.
+
+        Returns:
+            pd.DataFrame: Indexé par vague : n_participants, n_yes, reciprocity (part des oui réciproques)
+                et assortativity (corrélation, sur les oui, entre la popularité de celui qui dit oui
+                et celle de celui qui le reçoit).
+        """
+        yes = self.decisions.tocoo()
+        popularity = np.asarray(self.decisions.sum(axis=0)).ravel()
+        x, y = popularity[yes.row], popularity[yes.col]
+        edge_wave = self.waves[yes.row]
+        wave_index = pd.Index(np.unique(self.waves[~np.isnan(self.waves)]), name="wave")
+        codes = wave_index.get_indexer(edge_wave)
+        valid = codes >= 0
+        codes, x, y = codes[valid], x[valid], y[valid]
+        size = len(wave_index)
+
+        # Corrélation de Pearson par vague à partir des sommes par segment
+        count = np.bincount(codes, minlength=size).astype(float)
+        sx, sy = np.bincount(codes, x, size), np.bincount(codes, y, size)
+        sxx, syy, sxy = np.bincount(codes, x * x, size), np.bincount(codes, y * y, size), np.bincount(codes, x * y, size)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sxy - sx * sy / count
+            assortativity = cov / np.sqrt((sxx - sx ** 2 / count) * (syy - sy ** 2 / count))
+            mutual = np.bincount(wave_index.get_indexer(self.waves[self._mutual.tocoo().row]).clip(0), minlength=size)
+            reciprocity = mutual / count
+        n_participants = np.bincount(wave_index.get_indexer(self.waves[~np.isnan(self.waves)]), minlength=size)
+        return pd.DataFrame({"n_participants": n_participants, "n_yes": count.astype(int), "reciprocity": reciprocity,
+                             "assortativity": assortativity}, index=wave_index)
+
+
+def add_network_features(df: pd.DataFrame, metrics: pd.DataFrame = None, id_col: str = "iid",
+                         prefix: str = NETWORK_PREFIX) -> pd.DataFrame:
+    """
+    Ajoute les métriques de réseau de chaque participant à ses lignes (jointure alignée sur l'identifiant).
+
+    Les métriques sont calculées sur toutes les rencontres, y compris celle de la ligne : elles sont
+    descriptives et ne doivent pas servir de features pour prédire dec ou match (fuite de la cible).
+
+    Args:
+        df (pd.DataFrame): Données (une ligne par rendez-vous).
+        metrics (pd.DataFrame, optional): Résultat de `MatchNetwork.participant_metrics` (calculé sinon).
+        id_col (str): Identifiant du participant.
+        prefix (str): Préfixe des nouvelles colonnes.
+
+    Returns:
+        pd.DataFrame: DataFrame avec les colonnes `{prefix}{métrique}`.
+    """
+    if metrics is None:
+        metrics = MatchNetwork(df, id_col=id_col).participant_metrics()
+    features = metrics.drop(columns="wave").add_prefix(prefix)
+    return df.join(features, on=id_col)
@@ -0,0 +1,182 @@
+"""
+Module pour la détection des valeurs aberrantes.
+Contient un score multi-méthodes (bornes IQR, z-scores robustes MAD, isolation forest) calculé
+pour toutes les colonnes numériques à la fois : les quartiles et la médiane sont obtenus en un
+seul appel vectorisé par bloc de colonnes, ou par des sketches KLL en mode flux (`partial_fit`).
+"""
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+from typing import List
+
+from src.analysis.sketches import KLLSketch
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+METHODS = ["iqr", "mad", "isolation_forest"]
+# Constante de cohérence entre MAD et écart-type pour une loi normale
+MAD_SCALE = 1.4826
+# Écart interquartile d'une loi normale centrée réduite
+NORMAL_IQR = 1.349
+
+
+class OutlierScorer:
+    """
+    Score et signale les valeurs aberrantes de chaque cellule d'un bloc de colonnes numériques.
+
+    Méthodes :
+        - "iqr" : en dehors de [Q1 - whis * IQR, Q3 + whis * IQR] ;
+        - "mad" : |x - médiane| / (1.4826 * MAD) > threshold ;
+        - "isolation_forest" : lignes isolées par une forêt (les cellules observées de ces lignes sont signalées).
+
+    Les statistiques apprises (quartiles, MAD, bornes) sont conservées et réutilisées par les
+    graphiques, sans recalcul.
+
+    Args:
+        method (str): "iqr", "mad" ou "isolation_forest".
+        whis (float): Multiple de l'IQR pour les bornes.
+        threshold (float): Seuil du z-score robuste.
+        contamination: Proportion d'aberrants de l'isolation forest ("auto" ou float).
+        sketch_k (int): Précision des sketches KLL en mode flux.
+        random_state (int, optional): Graine.
+    """
+
+    def __init__(self, method: str = "iqr", whis: float = 1.5, threshold: float = 3.5, contamination="auto",
+                 sketch_k: int = 200, random_state: int = None):
+        if method not in METHODS:
+            raise ValueError(f"Méthode non supportée: {method}")
+        self.method = method
+        self.whis = whis
+        self.threshold = threshold
+        self.contamination = contamination
+        self.sketch_k = sketch_k
+        self.random_state = random_state
+        self.columns: List[str] = None
+        self.quantiles_: pd.DataFrame = None
+        self.mad_: pd.Series = None
+        self.sketches_ = None
+        self.forest_ = None
+
+    @staticmethod
+    def _block(X: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
+        if columns is None:
+            columns = list(X.select_dtypes(include=['float', 'int', 'bool']).columns)
+        return X[columns].apply(pd.to_numeric, errors="coerce").astype(float)
+
+    def fit(self, X: pd.DataFrame) -> "OutlierScorer":
+        """
+        Apprend les statistiques exactes sur toutes les colonnes numériques.
+
+        Args:
+            X (pd.DataFrame): Données.
+
+        Returns:
+            OutlierScorer: Le score ajusté.
+        """
+        block = self._block(X)
+        self.columns = list(block.columns)
+        values = block.to_numpy()
+        quartiles = np.nanquantile(values, [0.25, 0.5, 0.75], axis=0) if values.size else np.empty((3, 0))
+        self.quantiles_ = pd.DataFrame(quartiles, index=[0.25, 0.5, 0.75], columns=self.columns)
+        if self.method == "mad":
+            self.mad_ = pd.Series(np.nanmedian(np.abs(values - quartiles[1]), axis=0), index=self.columns)
+        if self.method == "isolation_forest":
+            filled = np.where(np.isnan(values), quartiles[1], values)
+            self.forest_ = IsolationForest(contamination=self.contamination, random_state=self.random_state).fit(filled)
+        return self
+
+    def partial_fit(self, X: pd.DataFrame) -> "OutlierScorer":
+        """
+        Met à jour les sketches de quantiles avec un morceau de données (mode flux).
+
+        En mode flux, la MAD est approchée par IQR / 1.349 / 1.4826 (cohérente pour une loi normale)
+        et l'isolation forest n'est pas disponible.
+
+        Args:
+            X (pd.DataFrame): Morceau de données (mêmes colonnes d'un appel à l'autre).
+
+        Returns:
+            OutlierScorer: Le score mis à jour.
+        """
+        if self.method == "isolation_forest":
+            raise ValueError("L'isolation forest n'est pas disponible en mode flux.")
+        block = self._block(X, self.columns)
+        if self.sketches_ is None:
+            self.columns = list(block.columns)
+            seeds = np.random.SeedSequence(self.random_state).spawn(len(self.columns))
+            self.sketches_ = {col: KLLSketch(self.sketch_k, seed) for col, seed in zip(self.columns, seeds)}
+        for col in self.columns:
+            self.sketches_[col].update(block[col].to_numpy())
+        quartiles = np.column_stack([self.sketches_[col].quantile([0.25, 0.5, 0.75]) for col in self.columns]) \
+            if self.columns else np.empty((3, 0))
+        self.quantiles_ = pd.DataFrame(quartiles, index=[0.25, 0.5, 0.75], columns=self.columns)
+        self.mad_ = (self.quantiles_.loc[0.75] - self.quantiles_.loc[0.25]) / NORMAL_IQR / MAD_SCALE
+        return self
+
+    @property
+    def fences(self) -> pd.DataFrame:
+        """Bornes basse et haute de chaque colonne (index "lower", "upper")."""
+        if self.quantiles_ is None:
+            raise ValueError("Le score doit être ajusté avant utilisation.")
+        q1, med, q3 = (self.quantiles_.loc[q] for q in (0.25, 0.5, 0.75))
+        if self.method == "mad":
+            spread = self.threshold * MAD_SCALE * self.mad_
+            return pd.DataFrame({"lower": med - spread, "upper": med + spread}).T
+        iqr = q3 - q1
+        return pd.DataFrame({"lower": q1 - self.whis * iqr, "upper": q3 + self.whis * iqr}).T
+
+    def scores(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Scores par cellule : distance à la borne la plus proche en unités d'IQR ("iqr", 0 à l'intérieur),
+        z-score robuste absolu ("mad") ou score d'anomalie de la ligne ("isolation_forest", plus grand = plus isolé).
+        """
+        block = self._block(X, self.columns).to_numpy()
+        if self.method == "isolation_forest":
+            filled = np.where(np.isnan(block), self.quantiles_.loc[0.5].to_numpy(), block)
+            row_scores = -self.forest_.score_samples(filled)
+            scores = np.where(np.isnan(block), np.nan, row_scores[:, None])
+        elif self.method == "mad":
+            mad = self.mad_.to_numpy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = np.abs(block - self.quantiles_.loc[0.5].to_numpy()) / (MAD_SCALE * np.where(mad > 0, mad, np.nan))
+        else:
+            lower, upper = self.fences.to_numpy()
+            iqr = (self.quantiles_.loc[0.75] - self.quantiles_.loc[0.25]).to_numpy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = np.maximum(np.maximum(lower - block, block - upper), 0) / np.where(iqr > 0, iqr, np.nan)
+        return pd.DataFrame(scores, index=X.index, columns=self.columns)
+
+    def flags(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Matrice booléenne lignes × colonnes des valeurs aberrantes (les valeurs manquantes ne sont jamais signalées).
+        """
+        block = self._block(X, self.columns).to_numpy()
+        if self.method == "isolation_forest":
+            filled = np.where(np.isnan(block), self.quantiles_.loc[0.5].to_numpy(), block)
+            outlier_rows = self.forest_.predict(filled) == -1
+            flags = outlier_rows[:, None] & ~np.isnan(block)
+        else:
+            lower, upper = self.fences.to_numpy()
+            flags = (block < lower) | (block > upper)
+        return pd.DataFrame(flags, index=X.index, columns=self.columns)
+
+
+def detect_outliers(X: pd.DataFrame, method: str = "iqr", **kwargs) -> pd.DataFrame:
+    """
+    Signale les valeurs aberrantes de toutes les colonnes numériques.
+
+    Args:
+        X (pd.DataFrame): Données.
+        method (str): "iqr", "mad" ou "isolation_forest".
+        **kwargs: Paramètres de `OutlierScorer`.
+
+    Returns:
+        pd.DataFrame: Matrice booléenne lignes × colonnes.
+    """
+    flags = OutlierScorer(method, **kwargs).fit(X).flags(X)
+    logger.info(f"{int(flags.to_numpy().sum())} valeurs aberrantes ({method}) sur {flags.shape[1]} colonnes")
+    return flags
@@ -0,0 +1,112 @@
+"""
+Module pour les tests de permutation.
+Contient un moteur qui teste simultanément plusieurs variables contre une colonne binaire
+(ex. "dec"), en permutant les étiquettes par blocs vectorisés, éventuellement à l'intérieur
+de strates (participant, vague) et en parallèle sur plusieurs processus.
+"""
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from statsmodels.stats.multitest import multipletests
+from typing import List
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def _group_differences(L: np.ndarray, values: np.ndarray, mask: np.ndarray, totals: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Différences de moyennes (groupe 1 - groupe 0) pour chaque ligne d'étiquettes de L."""
+    sum_1 = L @ values
+    count_1 = L @ mask
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sum_1 / count_1 - (totals - sum_1) / (counts - count_1)
+
+
+def _permutation_block(values: np.ndarray, mask: np.ndarray, labels: np.ndarray, strata: np.ndarray,
+                       observed: np.ndarray, n_permutations: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Compte, pour un bloc de permutations, les statistiques au moins aussi extrêmes que l'observée."""
+    rng = np.random.default_rng(seed)
+    order = np.argsort(strata, kind="stable")
+    sorted_strata = strata[order].astype(float)
+    sorted_labels = labels[order]
+    # Clé = strate + bruit uniforme : le tri permute les étiquettes à l'intérieur de chaque strate
+    keys = sorted_strata[None, :] + rng.random((n_permutations, len(labels)))
+    permuted = np.empty((n_permutations, len(labels)))
+    permuted[:, order] = sorted_labels[np.argsort(keys, axis=1)]
+    totals, counts = values.sum(axis=0), mask.sum(axis=0)
+    differences = _group_differences(permuted, values, mask, totals, counts)
+    return (np.abs(differences) >= np.abs(observed) - 1e-12).sum(axis=0)
+
+
+def permutation_test(df: pd.DataFrame, vars_list: List[str], label_col: str, n_permutations: int = 10000,
+                     strata_col: str = None, block_size: int = 500, n_jobs: int = 1, correction: str = "fdr_bh",
+                     alpha: float = 0.05, random_state: int = None) -> pd.DataFrame:
+    """
+    Teste la différence de moyennes de chaque variable entre les deux modalités d'une colonne binaire.
+
+    Args:
+        df (pd.DataFrame): DataFrame contenant les données.
+        vars_list (List[str]): Variables à tester (ex. ["attr", "sinc", "like"]).
+        label_col (str): Colonne binaire (ex. "dec").
+        n_permutations (int): Nombre de permutations.
+        strata_col (str, optional): Colonne de strates (ex. "iid" ou "wave") à l'intérieur desquelles
+            les étiquettes sont permutées.
+        block_size (int): Nombre de permutations traitées par bloc vectorisé.
+        n_jobs (int): Nombre de processus (le résultat n'en dépend pas).
+        correction (str): Méthode de correction des tests multiples de statsmodels (ex. "fdr_bh",
+            "bonferroni", "holm") ou "none".
+        alpha (float): Seuil de significativité après correction.
+        random_state (int, optional): Graine.
+
+    Returns:
+        pd.DataFrame: Une ligne par variable (effectifs, moyennes, différence, p_value, p_adjusted, reject).
+    """
+    data = df.dropna(subset=[label_col])
+    labels, levels = pd.factorize(data[label_col], sort=True)
+    if len(levels) != 2:
+        raise ValueError(f"{label_col} doit contenir exactement deux modalités.")
+    labels = labels.astype(float)
+    strata = pd.factorize(data[strata_col])[0] if strata_col is not None else np.zeros(len(data), dtype=int)
+
+    raw = data[vars_list].to_numpy(dtype=float)
+    mask = (~np.isnan(raw)).astype(float)
+    values = np.nan_to_num(raw)
+    totals, counts = values.sum(axis=0), mask.sum(axis=0)
+    observed = _group_differences(labels[None, :], values, mask, totals, counts)[0]
+
+    sizes = [min(block_size, n_permutations - start) for start in range(0, n_permutations, block_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    args = ([values] * len(sizes), [mask] * len(sizes), [labels] * len(sizes), [strata] * len(sizes),
+            [observed] * len(sizes), sizes, seeds)
+    if n_jobs == 1 or len(sizes) == 1:
+        exceed = sum(_permutation_block(*block_args) for block_args in zip(*args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            exceed = sum(executor.map(_permutation_block, *args))
+
+    p_values = (1 + exceed) / (1 + n_permutations)
+    p_values = np.where(np.isnan(observed), np.nan, p_values)
+    result = pd.DataFrame({
+        f"n_{levels[0]}": (mask * (1 - labels)[:, None]).sum(axis=0).astype(int),
+        f"n_{levels[1]}": (mask * labels[:, None]).sum(axis=0).astype(int),
+        f"mean_{levels[0]}": data.loc[labels == 0, vars_list].mean().to_numpy(),
+        f"mean_{levels[1]}": data.loc[labels == 1, vars_list].mean().to_numpy(),
+        "difference": observed,
+        "p_value": p_values,
+    }, index=pd.Index(vars_list, name="variable"))
+
+    valid = ~np.isnan(p_values)
+    result["p_adjusted"] = np.nan
+    result["reject"] = False
+    if valid.any():
+        if correction == "none":
+            adjusted = p_values[valid]
+        else:
+            adjusted = multipletests(p_values[valid], alpha=alpha, method=correction)[1]
+        result.loc[valid, "p_adjusted"] = adjusted
+        result.loc[valid, "reject"] = adjusted <= alpha
+    logger.info(f"Test de permutation sur {len(vars_list)} variables ({n_permutations} permutations)")
+    return result
@@ -0,0 +1,102 @@
+"""
+Module pour le criblage des features par rapport aux variables cibles.
+Contient le calcul vectorisé (toutes les features en une seule opération matricielle) de
+l'ANOVA F, de la corrélation de Pearson / point-bisériale, de Spearman et de l'information mutuelle.
+"""
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+from sklearn.feature_selection import f_classif, f_regression, mutual_info_classif, mutual_info_regression
+
+SCORE_COLUMNS = ["f_statistic", "f_pvalue", "pearson", "spearman", "mutual_info"]
+
+
+def _column_correlations(X: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Corrélation de Pearson entre chaque colonne de X et y, en un seul produit matriciel."""
+    Xc = X - X.mean(axis=0)
+    yc = y - y.mean()
+    denom = np.sqrt((Xc ** 2).sum(axis=0) * (yc ** 2).sum())
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = (Xc.T @ yc) / denom
+    return np.nan_to_num(corr)
+
+
+def screen_features(X: pd.DataFrame, y: pd.DataFrame, classification_threshold: int = 10,
+                    random_state: int = None) -> pd.DataFrame:
+    """
+    Calcule les scores d'association de toutes les features avec chaque variable cible.
+
+    Les valeurs manquantes des features sont remplacées par la médiane de la colonne ;
+    les lignes dont la cible est manquante sont ignorées.
+
+    Args:
+        X (pd.DataFrame): Features quantitatives.
+        y (pd.DataFrame): Variables cibles.
+        classification_threshold (int): Nombre maximal de modalités pour traiter une cible en classification.
+        random_state (int, optional): Graine de l'estimateur d'information mutuelle.
+
+    Returns:
+        pd.DataFrame: Une ligne par couple (target, feature), triée par information mutuelle décroissante
+            par cible, avec le rang de la feature.
+    """
+    features = X.apply(pd.to_numeric, errors="coerce")
+    features = features.fillna(features.median()).fillna(0.0)
+    rankings = []
+    for target_col in y.columns:
+        mask = y[target_col].notna().to_numpy()
+        target = y[target_col].to_numpy()[mask]
+        matrix = features.to_numpy(dtype=float)[mask]
+        n_samples = len(target)
+        task = 'classification' if (pd.Series(target).nunique() <= classification_threshold) else 'regression'
+        n_neighbors = max(1, min(3, n_samples - 1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if task == 'classification':
+                f_stat, f_pvalue = f_classif(matrix, target)
+                mutual_info = mutual_info_classif(matrix, target, n_neighbors=n_neighbors, random_state=random_state)
+            else:
+                f_stat, f_pvalue = f_regression(matrix, target.astype(float))
+                mutual_info = mutual_info_regression(matrix, target.astype(float), n_neighbors=n_neighbors,
+                                                     random_state=random_state)
+        target_values = pd.factorize(target, sort=True)[0].astype(float) if task == 'classification' else target.astype(float)
+        ranking = pd.DataFrame({
+            "target": target_col,
+            "feature": features.columns,
+            "task": task,
+            "f_statistic": np.nan_to_num(f_stat),
+            "f_pvalue": np.nan_to_num(f_pvalue, nan=1.0),
+            "pearson": _column_correlations(matrix, target_values),
+            "spearman": _column_correlations(rankdata(matrix, axis=0), rankdata(target_values)),
+            "mutual_info": mutual_info,
+        })
+        ranking = ranking.sort_values("mutual_info", ascending=False, kind="stable")
+        ranking["rank"] = np.arange(1, len(ranking) + 1)
+        rankings.append(ranking)
+    return pd.concat(rankings, ignore_index=True)
+
+
+def select_features(ranking: pd.DataFrame, top_k: int = None, importance_threshold: float = None,
+                    score: str = "mutual_info") -> pd.DataFrame:
+    """
+    Marque les features retenues par cible selon un top-k et/ou un seuil de score.
+
+    Args:
+        ranking (pd.DataFrame): Résultat de `screen_features`.
+        top_k (int, optional): Nombre de features à retenir par cible.
+        importance_threshold (float, optional): Score minimal (ex. `features.importance_threshold`).
+        score (str): Colonne de score utilisée pour le classement et le seuil.
+
+    Returns:
+        pd.DataFrame: Le classement avec une colonne booléenne `selected`.
+    """
+    if score not in SCORE_COLUMNS:
+        raise ValueError(f"Score non supporté: {score}")
+    ranking = ranking.copy()
+    values = ranking[score].abs() if score in ("pearson", "spearman") else ranking[score]
+    selected = pd.Series(True, index=ranking.index)
+    if top_k is not None:
+        order = values.groupby(ranking["target"]).rank(ascending=False, method="first")
+        selected &= order <= top_k
+    if importance_threshold is not None:
+        selected &= values >= importance_threshold
+    ranking["selected"] = selected
+    return ranking
@@ -0,0 +1,321 @@
+"""
+Module pour les résumés approchés et fusionnables des données.
+Contient des sketches construits morceau par morceau (ou par vague) en mémoire bornée et
+fusionnables : moments de Welford (fusion exacte), quantiles KLL (erreur de rang de l'ordre
+de 1/k), comptage de valeurs distinctes HyperLogLog (erreur relative ~1.04/sqrt(2**p)) et
+valeurs manquantes. Un résumé de DataFrame produit des sorties de type describe/info en O(colonnes).
+"""
+import copy
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from src.utils.io import save_model, load_model
+
+# Facteur de décroissance des capacités entre deux niveaux du KLL
+_CAPACITY_DECAY = 2 / 3
+
+
+class KLLSketch:
+    """
+    Sketch de quantiles KLL (Karnin, Lang, Liberty).
+
+    Chaque niveau h contient des valeurs de poids 2**h ; un niveau plein est trié puis
+    une valeur sur deux (décalage aléatoire) est promue au niveau supérieur.
+
+    Args:
+        k (int): Capacité du niveau le plus haut (précision).
+        random_state (int, optional): Graine des décalages de compaction.
+    """
+
+    def __init__(self, k: int = 200, random_state: int = None):
+        self.k = k
+        self.n = 0
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(random_state)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(int(np.ceil(self.k * _CAPACITY_DECAY ** depth)), 2)
+
+    def _compress(self) -> None:
+        while sum(len(items) for items in self.compactors) > sum(self._capacity(h) for h in range(len(self.compactors))):
+            for level, items in enumerate(self.compactors):
+                if len(items) >= self._capacity(level):
+                    if level + 1 == len(self.compactors):
+                        self.compactors.append(np.empty(0))
+                    items = np.sort(items)
+                    # Un nombre impair de valeurs laisse la plus grande au niveau courant
+                    paired = len(items) - len(items) % 2
+                    promoted = items[self._rng.integers(2):paired:2]
+                    self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+                    self.compactors[level] = items[paired:]
+                    break
+
+    def update(self, values) -> "KLLSketch":
+        """Ajoute des valeurs (les valeurs manquantes sont ignorées)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.compactors[0] = np.concatenate([self.compactors[0], values])
+            self.n += len(values)
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fusionne un autre sketch dans celui-ci (niveau par niveau)."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted_items(self):
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.compactors)])
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Quantiles approchés.
+
+        Args:
+            q (float or array-like): Niveaux dans [0, 1].
+
+        Returns:
+            np.ndarray: Quantiles (NaN si le sketch est vide).
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        if self.n == 0:
+            return np.full(len(q), np.nan)
+        values, weights = self._weighted_items()
+        ranks = np.cumsum(weights) - weights / 2
+        return np.interp(q * weights.sum(), ranks, values)
+
+    def rank(self, value: float) -> float:
+        """Proportion approchée des valeurs inférieures ou égales à value."""
+        if self.n == 0:
+            return np.nan
+        values, weights = self._weighted_items()
+        return float(weights[values <= value].sum() / weights.sum())
+
+
+class MomentSketch:
+    """Effectif, moyenne, somme des carrés des écarts (Welford/Chan), minimum et maximum ; fusion exacte."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _combine(self, n: int, mean: float, m2: float, minimum: float, maximum: float) -> None:
+        if n == 0:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.n = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    def update(self, values) -> "MomentSketch":
+        """Ajoute des valeurs (les valeurs manquantes sont ignorées)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = values.mean()
+            self._combine(len(values), mean, float(((values - mean) ** 2).sum()), values.min(), values.max())
+        return self
+
+    def merge(self, other: "MomentSketch") -> "MomentSketch":
+        self._combine(other.n, other.mean, other.m2, other.min, other.max)
+        return self
+
+    @property
+    def var(self) -> float:
+        """Variance corrigée (ddof=1), comme pandas."""
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.var))
+
+
+class HyperLogLog:
+    """
+    Comptage approché des valeurs distinctes.
+
+    Args:
+        p (int): Nombre de bits d'adressage (2**p registres).
+    """
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.registers = np.zeros(2 ** p, dtype=np.uint8)
+
+    def update(self, values) -> "HyperLogLog":
+        """Ajoute des valeurs (les valeurs manquantes sont ignorées)."""
+        values = pd.Series(values).dropna()
+        if len(values):
+            hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+            index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+            remainder = hashes << np.uint64(self.p)
+            # Rang du premier bit à 1 des 64 - p bits restants (moitiés de 32 bits, exactes en flottant)
+            high = (remainder >> np.uint64(32)).astype(float)
+            low = (remainder & np.uint64(0xFFFFFFFF)).astype(float)
+            with np.errstate(divide="ignore"):
+                leading_zeros = np.where(high > 0, 31 - np.floor(np.log2(high)),
+                                         np.where(low > 0, 63 - np.floor(np.log2(low)), 64))
+            leading = np.minimum(leading_zeros + 1, 64 - self.p + 1).astype(np.uint8)
+            np.maximum.at(self.registers, index, leading)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.p != self.p:
+            raise ValueError("Les HyperLogLog à fusionner doivent avoir la même précision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """Estimation du nombre de valeurs distinctes."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m ** 2 / np.sum(2.0 ** -self.registers.astype(float))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # Correction des petites cardinalités (comptage linéaire)
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class ColumnSketch:
+    """Résumé fusionnable d'une colonne : effectifs, valeurs manquantes, distinctes et, si numérique, moments et quantiles."""
+
+    def __init__(self, dtype: str, numeric: bool, k: int = 200, p: int = 12, random_state=None):
+        self.dtype = dtype
+        self.numeric = numeric
+        self.n_rows = 0
+        self.n_null = 0
+        self.distinct = HyperLogLog(p)
+        self.moments = MomentSketch() if numeric else None
+        self.quantiles = KLLSketch(k, random_state) if numeric else None
+
+    def update(self, values: pd.Series) -> "ColumnSketch":
+        self.n_rows += len(values)
+        self.n_null += int(values.isna().sum())
+        self.distinct.update(values)
+        if self.numeric:
+            array = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+            self.moments.update(array)
+            self.quantiles.update(array)
+        return self
+
+    def merge(self, other: "ColumnSketch") -> "ColumnSketch":
+        self.n_rows += other.n_rows
+        self.n_null += other.n_null
+        self.distinct.merge(other.distinct)
+        if self.numeric and other.numeric:
+            self.moments.merge(other.moments)
+            self.quantiles.merge(other.quantiles)
+        return self
+
+
+class FrameSketch:
+    """
+    Résumé fusionnable d'un DataFrame, construit morceau par morceau.
+
+    Args:
+        k (int): Précision des sketches de quantiles.
+        p (int): Précision des HyperLogLog.
+        random_state (int, optional): Graine des sketches de quantiles.
+    """
+
+    def __init__(self, k: int = 200, p: int = 12, random_state: int = None):
+        self.k = k
+        self.p = p
+        self.columns: Dict[str, ColumnSketch] = {}
+        self._seed = np.random.SeedSequence(random_state)
+
+    @property
+    def n_rows(self) -> int:
+        return next(iter(self.columns.values())).n_rows if self.columns else 0
+
+    def update(self, df: pd.DataFrame) -> "FrameSketch":
+        """Ajoute un morceau de données (les nouvelles colonnes sont ajoutées au résumé)."""
+        for col in df.columns:
+            if col not in self.columns:
+                numeric = pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+                self.columns[col] = ColumnSketch(str(df[col].dtype), numeric, self.k, self.p, self._seed.spawn(1)[0])
+            self.columns[col].update(df[col])
+        return self
+
+    def merge(self, other: "FrameSketch") -> "FrameSketch":
+        """Fusionne un autre résumé (ex. d'une autre vague) dans celui-ci."""
+        for col, sketch in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(sketch)
+            else:
+                self.columns[col] = copy.deepcopy(sketch)
+        return self
+
+    def describe(self) -> pd.DataFrame:
+        """Statistiques de type `df.describe()` des colonnes numériques (quantiles approchés)."""
+        rows = {}
+        for col, sketch in self.columns.items():
+            if sketch.numeric:
+                q1, med, q3 = sketch.quantiles.quantile([0.25, 0.5, 0.75])
+                moments = sketch.moments
+                rows[col] = {"count": float(moments.n), "mean": moments.mean if moments.n else np.nan, "std": moments.std,
+                             "min": moments.min if moments.n else np.nan, "25%": q1, "50%": med, "75%": q3,
+                             "max": moments.max if moments.n else np.nan}
+        return pd.DataFrame(rows, index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"])
+
+    def info(self) -> pd.DataFrame:
+        """Informations de type `df.info()` : non manquants, manquants, distinctes (approché) et type par colonne."""
+        return pd.DataFrame({
+            "non_null": [sketch.n_rows - sketch.n_null for sketch in self.columns.values()],
+            "null": [sketch.n_null for sketch in self.columns.values()],
+            "distinct": [sketch.distinct.count() for sketch in self.columns.values()],
+            "dtype": [sketch.dtype for sketch in self.columns.values()],
+        }, index=list(self.columns))
+
+    def save(self, path: str) -> None:
+        save_model(self, path)
+
+    @staticmethod
+    def load(path: str) -> "FrameSketch":
+        return load_model(path)
+
+
+def build_frame_sketches(df: pd.DataFrame, by: str = None, chunk_size: int = None, **kwargs) -> Dict:
+    """
+    Construit les résumés d'un DataFrame par groupe (ex. par vague) ou par morceaux.
+
+    Args:
+        df (pd.DataFrame): Données.
+        by (str, optional): Colonne de regroupement (un résumé par modalité).
+        chunk_size (int, optional): Sans `by`, taille des morceaux (un résumé par morceau).
+        **kwargs: Paramètres de `FrameSketch`.
+
+    Returns:
+        Dict: Résumés indexés par modalité, ou par numéro de morceau.
+    """
+    if by is not None:
+        return {key: FrameSketch(**kwargs).update(group) for key, group in df.groupby(by, sort=True)}
+    chunk_size = chunk_size or max(len(df), 1)
+    return {i: FrameSketch(**kwargs).update(df.iloc[start:start + chunk_size])
+            for i, start in enumerate(range(0, len(df), chunk_size))}
+
+
+def merge_sketches(sketches) -> FrameSketch:
+    """Fusionne des résumés (ex. valeurs de `build_frame_sketches`) en un seul."""
+    merged = None
+    for sketch in sketches:
+        merged = copy.deepcopy(sketch) if merged is None else merged.merge(sketch)
+    return merged if merged is not None else FrameSketch()
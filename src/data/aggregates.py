@@ -0,0 +1,112 @@
+"""
+Module pour la maintenance incrémentale d'agrégats par clé (ex. par iid ou pid).
+Les effectifs, sommes et sommes des carrés centrées sont mis à jour à chaque nouveau lot
+(nouvelle vague) en O(taille du lot), puis rediffusés sur les lignes.
+"""
+import numpy as np
+import pandas as pd
+
+SUPPORTED_FUNCS = ["sum", "count", "size", "mean", "var", "std"]
+
+
+class RunningAggregate:
+    """
+    Agrégats glissants d'une colonne par clé de regroupement.
+
+    Les résultats sont identiques (aux erreurs d'arrondi près) à
+    `df.groupby(key)[value].transform(func)` recalculé sur l'ensemble des lots reçus.
+    """
+
+    def __init__(self, key: str, value: str):
+        self.key = key
+        self.value = value
+        self.stats = pd.DataFrame({"size": pd.Series(dtype="int64"), "count": pd.Series(dtype="int64"),
+                                   "sum": pd.Series(dtype="float64"), "m2": pd.Series(dtype="float64")})
+        self._integer = None
+
+    def _batch_stats(self, batch: pd.DataFrame) -> pd.DataFrame:
+        grouped = batch.groupby(self.key)[self.value]
+        return pd.DataFrame({
+            "size": grouped.size(),
+            "count": grouped.count(),
+            "sum": grouped.sum().astype("float64"),
+            "m2": (grouped.var(ddof=0) * grouped.count()).fillna(0.0),
+        })
+
+    def update(self, batch: pd.DataFrame) -> "RunningAggregate":
+        """
+        Intègre un nouveau lot de lignes.
+
+        Args:
+            batch (pd.DataFrame): Lignes contenant la clé et la colonne agrégée.
+
+        Returns:
+            RunningAggregate: L'agrégat mis à jour.
+        """
+        if self._integer is None:
+            self._integer = pd.api.types.is_integer_dtype(batch[self.value]) or pd.api.types.is_bool_dtype(batch[self.value])
+        else:
+            self._integer &= pd.api.types.is_integer_dtype(batch[self.value]) or pd.api.types.is_bool_dtype(batch[self.value])
+        new = self._batch_stats(batch)
+        existing_keys = new.index.intersection(self.stats.index)
+        fresh_keys = new.index.difference(self.stats.index)
+
+        if len(existing_keys):
+            old = self.stats.loc[existing_keys]
+            add = new.loc[existing_keys]
+            n = old["count"] + add["count"]
+            mean_old = old["sum"] / old["count"].where(old["count"] > 0)
+            mean_add = add["sum"] / add["count"].where(add["count"] > 0)
+            # Fusion de Chan des sommes des carrés centrées
+            delta = (mean_add - mean_old).fillna(0.0)
+            m2 = old["m2"] + add["m2"] + delta ** 2 * old["count"] * add["count"] / n.where(n > 0)
+            self.stats.loc[existing_keys, "size"] = old["size"] + add["size"]
+            self.stats.loc[existing_keys, "count"] = n
+            self.stats.loc[existing_keys, "sum"] = old["sum"] + add["sum"]
+            self.stats.loc[existing_keys, "m2"] = m2.fillna(0.0)
+        if len(fresh_keys):
+            fresh = new.loc[fresh_keys]
+            self.stats = fresh if self.stats.empty else pd.concat([self.stats, fresh])
+        return self
+
+    def result(self, agg_func: str) -> pd.Series:
+        """
+        Retourne la valeur agrégée par clé.
+
+        Args:
+            agg_func (str): "sum", "count", "size", "mean", "var" ou "std".
+
+        Returns:
+            pd.Series: Valeurs indexées par clé.
+        """
+        if agg_func not in SUPPORTED_FUNCS:
+            raise ValueError(f"Fonction d'agrégation non supportée: {agg_func}")
+        stats = self.stats
+        if agg_func in ("size", "count"):
+            return stats[agg_func].astype("int64")
+        if agg_func == "sum":
+            return stats["sum"].round().astype("int64") if self._integer else stats["sum"]
+        count = stats["count"].where(stats["count"] > 0)
+        if agg_func == "mean":
+            return stats["sum"] / count
+        var = stats["m2"] / (count - 1).where(count > 1)
+        return var if agg_func == "var" else np.sqrt(var)
+
+    def transform(self, df: pd.DataFrame, agg_func: str) -> pd.Series:
+        """
+        Rediffuse la valeur agrégée sur les lignes de `df` selon leur clé.
+
+        Args:
+            df (pd.DataFrame): Lignes à enrichir.
+            agg_func (str): Fonction d'agrégation (voir `result`).
+
+        Returns:
+            pd.Series: Série alignée sur l'index de `df`.
+        """
+        values = self.result(agg_func)
+        positions = values.index.get_indexer(df[self.key])
+        result = values.to_numpy()[positions]
+        if (positions < 0).any():
+            result = result.astype("float64")
+            result[positions < 0] = np.nan
+        return pd.Series(result, index=df.index, name=self.value)
@@ -1,7 +1,25 @@
+import numpy as np
 import pandas as pd
-from typing import Union
+from typing import Dict, List, Union
 
-def add_aggregated_column(df: pd.DataFrame, groupby_col: str, agg_col: str, agg_func: str, new_col_name: str) -> pd.DataFrame:
+from src.data.aggregates import RunningAggregate
+from src.data.validation import ALLOCATION_FAMILIES
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Familles d'allocation de préférences, y compris les relevés à mi-parcours (_s) et de suivi (_2, _3)
+PREFERENCE_FAMILIES = {
+    **ALLOCATION_FAMILIES,
+    **{f"attr1_{time}": [f"{attr}1_{time}" for attr in ["attr", "sinc", "intel", "fun", "amb", "shar"]]
+       for time in ["s", "2", "3"]},
+}
+
+def add_aggregated_column(df: pd.DataFrame, groupby_col: str, agg_col: str, agg_func: str, new_col_name: str,
+                          aggregate: RunningAggregate = None) -> pd.DataFrame:
     """
     Ajoute une colonne au DataFrame avec les valeurs agrégées d'une colonne selon une variable de regroupement.
     
@@ -11,10 +29,17 @@ def add_aggregated_column(df: pd.DataFrame, groupby_col: str, agg_col: str, agg_
         agg_col (str): Colonne à agréger (ex. "match").
         agg_func (str): Fonction d'agrégation (ex. "sum", "mean", "count").
         new_col_name (str): Nom de la nouvelle colonne à ajouter.
+        aggregate (RunningAggregate, optional): Agrégat incrémental déjà à jour ; évite de recalculer
+            le groupby sur tout le DataFrame.
     
     Returns:
         pd.DataFrame: DataFrame avec la nouvelle colonne ajoutée.
     """
+    if aggregate is not None:
+        if (aggregate.key, aggregate.value) != (groupby_col, agg_col):
+            raise ValueError(f"L'agrégat porte sur ({aggregate.key}, {aggregate.value}) et non ({groupby_col}, {agg_col}).")
+        df[new_col_name] = aggregate.transform(df, agg_func)
+        return df
     df[new_col_name] = df.groupby(groupby_col)[agg_col].transform(agg_func)
     return df
 
@@ -108,4 +133,62 @@ def convert_types(df: pd.DataFrame, type_dict: dict) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame avec les types convertis.
     """
-    return df.astype(type_dict)
\ No newline at end of file
+    return df.astype(type_dict)
+
+def harmonize_allocation_scales(df: pd.DataFrame, families: Dict[str, List[str]] = None, wave_col: str = "wave",
+                                max_rating: float = 10, total: float = 100, flag_col: str = "scale_harmonized") -> pd.DataFrame:
+    """
+    Ramène sur une allocation de `total` points les familles de préférences relevées sur une échelle de 1 à 10.
+
+    Une famille est considérée notée de 1 à `max_rating` dans une vague si aucune de ses valeurs n'y
+    dépasse `max_rating`. La détection et la renormalisation sont faites pour toutes les vagues et
+    toutes les familles à la fois (codes de vague factorisés, sommes par segment de colonnes et par vague).
+
+    Args:
+        df (pd.DataFrame): DataFrame d'origine.
+        families (Dict[str, List[str]], optional): Familles de colonnes (par défaut PREFERENCE_FAMILIES).
+        wave_col (str): Colonne de la vague.
+        max_rating (float): Valeur maximale de l'échelle de notation.
+        total (float): Total d'une allocation.
+        flag_col (str): Colonne booléenne indiquant les lignes transformées.
+
+    Returns:
+        pd.DataFrame: DataFrame avec les familles harmonisées et la colonne flag_col.
+    """
+    families = PREFERENCE_FAMILIES if families is None else families
+    segments = [[col for col in columns if col in df.columns] for columns in families.values()]
+    segments = [columns for columns in segments if columns]
+    df[flag_col] = False
+    if not segments:
+        return df
+    columns = [col for segment in segments for col in segment]
+    widths = np.array([len(segment) for segment in segments])
+    starts = np.concatenate([[0], np.cumsum(widths)[:-1]])
+
+    block = df[columns].to_numpy(dtype=float)
+    observed = ~np.isnan(block)
+    filled = np.where(observed, block, 0.0)
+    codes, waves = pd.factorize(df[wave_col])
+    valid = codes >= 0
+
+    # Par (vague, famille) : nombre de valeurs observées et de valeurs hors de l'échelle de notation
+    n_observed = np.add.reduceat(observed, starts, axis=1)
+    n_above = np.add.reduceat(observed & (filled > max_rating), starts, axis=1)
+    observed_by_wave = np.zeros((len(waves), len(segments)))
+    above_by_wave = np.zeros((len(waves), len(segments)))
+    np.add.at(observed_by_wave, codes[valid], n_observed[valid])
+    np.add.at(above_by_wave, codes[valid], n_above[valid])
+    rating_scale = (observed_by_wave > 0) & (above_by_wave == 0)
+
+    row_sums = np.add.reduceat(filled, starts, axis=1)
+    transformed = valid[:, None] & rating_scale[np.where(valid, codes, 0)] & (row_sums > 0)
+    factors = np.where(transformed, total / np.where(row_sums > 0, row_sums, 1.0), 1.0)
+    df[columns] = block * np.repeat(factors, widths, axis=1)
+    df[flag_col] = transformed.any(axis=1)
+
+    names = [name for name, cols in families.items() if any(col in df.columns for col in cols)]
+    for j, name in enumerate(names):
+        detected = waves[rating_scale[:, j]].tolist()
+        if detected:
+            logger.info(f"Famille {name} ramenée sur {total} points pour les vagues {detected}")
+    return df
@@ -0,0 +1,298 @@
+"""
+Module pour le prétraitement des variables.
+Contient l'encodage creux (scipy.sparse CSR) des variables qualitatives à forte cardinalité :
+one-hot à vocabulaire plafonné par fréquence avec une modalité "autre", ou hashing trick
+(aucune matrice n'est densifiée), et l'imputation KNN indexée (`fill_strategy: knn`).
+"""
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.neighbors import KDTree, BallTree
+from typing import Dict, List
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+HIGH_CARDINALITY_COLUMNS = ["field", "career", "from", "zipcode", "undergra"]
+OTHER_LABEL = "__other__"
+ENCODINGS = ["onehot", "hashing"]
+_TREES = {"kd_tree": KDTree, "ball_tree": BallTree}
+
+
+def _as_strings(values: pd.Series) -> pd.Series:
+    """Valeurs normalisées en texte (espaces retirés) ; les valeurs manquantes ou vides restent manquantes."""
+    text = values.astype("string").str.strip()
+    return text.mask(text == "")
+
+
+class SparseOneHotEncoder(BaseEstimator, TransformerMixin):
+    """
+    Encodage one-hot creux à vocabulaire plafonné.
+
+    Pour chaque colonne, seules les `max_categories` modalités les plus fréquentes (et vues au moins
+    `min_frequency` fois) ont leur propre indicatrice ; les autres modalités, y compris celles
+    inconnues à l'apprentissage, tombent dans la modalité "autre". Une valeur manquante donne une ligne vide.
+
+    Args:
+        columns (List[str], optional): Colonnes encodées (par défaut HIGH_CARDINALITY_COLUMNS présentes).
+        max_categories (int): Nombre maximal de modalités conservées par colonne.
+        min_frequency (int): Effectif minimal d'une modalité conservée.
+    """
+
+    def __init__(self, columns: List[str] = None, max_categories: int = 50, min_frequency: int = 5):
+        self.columns = columns
+        self.max_categories = max_categories
+        self.min_frequency = min_frequency
+
+    def fit(self, X: pd.DataFrame, y=None) -> "SparseOneHotEncoder":
+        self.columns_ = list(self.columns) if self.columns is not None else [c for c in HIGH_CARDINALITY_COLUMNS if c in X.columns]
+        self.vocabularies_: Dict[str, pd.Index] = {}
+        for col in self.columns_:
+            counts = _as_strings(X[col]).value_counts(sort=True)
+            counts = counts[counts >= self.min_frequency]
+            self.vocabularies_[col] = pd.Index(counts.index[:self.max_categories])
+        # Chaque colonne occupe len(vocabulaire) + 1 indices (la dernière pour "autre")
+        widths = np.array([len(self.vocabularies_[col]) + 1 for col in self.columns_])
+        self.offsets_ = np.concatenate([[0], np.cumsum(widths)[:-1]]).astype(np.int64)
+        self.n_features_out_ = int(widths.sum())
+        return self
+
+    def transform(self, X: pd.DataFrame) -> sparse.csr_matrix:
+        """
+        Encode X en matrice CSR (une indicatrice par modalité conservée, plus "autre" par colonne).
+
+        Returns:
+            sparse.csr_matrix: Matrice creuse (n_lignes, n_features_out_) en float32.
+        """
+        rows, cols = [], []
+        row_index = np.arange(len(X), dtype=np.int64)
+        for col, offset in zip(self.columns_, self.offsets_):
+            values = _as_strings(X[col])
+            vocabulary = self.vocabularies_[col]
+            codes = vocabulary.get_indexer(values)
+            observed = values.notna().to_numpy()
+            codes = np.where(codes < 0, len(vocabulary), codes)
+            rows.append(row_index[observed])
+            cols.append(offset + codes[observed])
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        data = np.ones(len(rows), dtype=np.float32)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(X), self.n_features_out_))
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        names = []
+        for col in self.columns_:
+            names += [f"{col}={value}" for value in self.vocabularies_[col]] + [f"{col}={OTHER_LABEL}"]
+        return np.asarray(names, dtype=object)
+
+
+class SparseHashingEncoder(BaseEstimator, TransformerMixin):
+    """
+    Encodage par hashing trick : chaque couple "colonne=valeur" est haché vers l'un des
+    `n_features` indices, avec un signe haché pour compenser les collisions. Sans apprentissage
+    ni vocabulaire : les nouvelles modalités (nouvelles vagues) sont encodées sans réajustement.
+
+    Args:
+        columns (List[str], optional): Colonnes encodées (par défaut HIGH_CARDINALITY_COLUMNS présentes).
+        n_features (int): Dimension de l'espace haché.
+        alternate_sign (bool): Si True, signe haché (+1/-1) pour réduire le biais des collisions.
+    """
+
+    def __init__(self, columns: List[str] = None, n_features: int = 2 ** 12, alternate_sign: bool = True):
+        self.columns = columns
+        self.n_features = n_features
+        self.alternate_sign = alternate_sign
+
+    def fit(self, X: pd.DataFrame, y=None) -> "SparseHashingEncoder":
+        self.columns_ = list(self.columns) if self.columns is not None else [c for c in HIGH_CARDINALITY_COLUMNS if c in X.columns]
+        self.n_features_out_ = self.n_features
+        return self
+
+    def transform(self, X: pd.DataFrame) -> sparse.csr_matrix:
+        """Encode X en matrice CSR (n_lignes, n_features) ; les collisions s'additionnent."""
+        rows, cols, signs = [], [], []
+        row_index = np.arange(len(X), dtype=np.int64)
+        for col in self.columns_:
+            values = _as_strings(X[col])
+            observed = values.notna().to_numpy()
+            hashes = pd.util.hash_pandas_object(col + "=" + values[observed], index=False).to_numpy()
+            rows.append(row_index[observed])
+            cols.append((hashes % np.uint64(self.n_features)).astype(np.int64))
+            signs.append(np.where(hashes >> np.uint64(63), -1.0, 1.0) if self.alternate_sign else np.ones(len(hashes)))
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        data = np.concatenate(signs).astype(np.float32) if signs else np.empty(0, dtype=np.float32)
+        # Les doublons (collisions sur une même ligne) sont sommés par la conversion COO -> CSR
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(X), self.n_features))
+
+
+def make_categorical_encoder(encoding: str = "onehot", columns: List[str] = None, **kwargs):
+    """
+    Construit l'encodeur creux correspondant à `preprocessing.categorical_encoding`.
+
+    Args:
+        encoding (str): "onehot" ou "hashing".
+        columns (List[str], optional): Colonnes encodées.
+        **kwargs: Paramètres de l'encodeur (max_categories, min_frequency ou n_features, alternate_sign).
+
+    Returns:
+        SparseOneHotEncoder ou SparseHashingEncoder.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Encodage non supporté: {encoding}")
+    if encoding == "hashing":
+        return SparseHashingEncoder(columns, **kwargs)
+    return SparseOneHotEncoder(columns, **kwargs)
+
+
+def build_sparse_design_matrix(df: pd.DataFrame, numeric_cols: List[str], encoder) -> sparse.csr_matrix:
+    """
+    Assemble les variables numériques et l'encodage creux des variables qualitatives en une seule matrice CSR.
+
+    Les variables numériques doivent être déjà imputées ; elles sont converties en CSR sans passer
+    par une matrice dense qualitative.
+
+    Args:
+        df (pd.DataFrame): Données.
+        numeric_cols (List[str]): Variables numériques.
+        encoder: Encodeur déjà ajusté (voir `make_categorical_encoder`).
+
+    Returns:
+        sparse.csr_matrix: Matrice (n_lignes, len(numeric_cols) + encoder.n_features_out_) en float32.
+    """
+    numeric = sparse.csr_matrix(df[numeric_cols].to_numpy(dtype=np.float32))
+    categorical = encoder.transform(df)
+    logger.info(f"Matrice creuse: {categorical.shape[1]} colonnes encodées, densité {categorical.nnz / max(np.prod(categorical.shape), 1):.4f}")
+    return sparse.hstack([numeric, categorical], format="csr")
+
+
+class IndexedKNNImputer(BaseEstimator, TransformerMixin):
+    """
+    Imputation par les k plus proches voisins, accélérée par un index KD-tree/ball tree.
+
+    Les voisins sont cherchés parmi les lignes de référence (complètes sur les colonnes KNN) dans
+    un index unique construit à l'apprentissage sur toutes les colonnes KNN : chaque ligne
+    incomplète l'interroge, ses valeurs manquantes remplacées par la moyenne de référence, pour
+    obtenir `candidate_factor * n_neighbors` candidats, reclassés selon la distance euclidienne sur
+    ses seules colonnes observées (comme `nan_euclidean_distances`). Les requêtes sont groupées par
+    lots de lignes, traités en parallèle. Les colonnes hors `columns` ou trop souvent manquantes
+    (`max_missing_rate`) sont imputées par la médiane, de même que toutes les colonnes s'il y a
+    moins de `n_neighbors` lignes de référence.
+
+    Args:
+        n_neighbors (int): Nombre de voisins.
+        weights (str): "uniform" ou "distance".
+        algorithm (str): "kd_tree" ou "ball_tree".
+        leaf_size (int): Taille des feuilles de l'index.
+        columns (List[int], optional): Positions des colonnes imputées par KNN (par défaut toutes).
+        max_missing_rate (float): Taux maximal de valeurs manquantes d'une colonne traitée par KNN.
+        max_reference_rows (int, optional): Nombre maximal de lignes de référence (tirage aléatoire).
+        candidate_factor (int): Nombre de candidats extraits de l'index par voisin demandé.
+        batch_size (int): Nombre de lignes par requête groupée.
+        n_jobs (int): Nombre de lots traités en parallèle (threads).
+        random_state (int, optional): Graine du tirage des lignes de référence.
+    """
+
+    def __init__(self, n_neighbors: int = 5, weights: str = "uniform", algorithm: str = "kd_tree", leaf_size: int = 40,
+                 columns: List[int] = None, max_missing_rate: float = 0.5, max_reference_rows: int = None,
+                 candidate_factor: int = 4, batch_size: int = 10000, n_jobs: int = 1, random_state: int = None):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.columns = columns
+        self.max_missing_rate = max_missing_rate
+        self.max_reference_rows = max_reference_rows
+        self.candidate_factor = candidate_factor
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def fit(self, X, y=None) -> "IndexedKNNImputer":
+        if self.weights not in ("uniform", "distance"):
+            raise ValueError(f"Pondération non supportée: {self.weights}")
+        if self.algorithm not in _TREES:
+            raise ValueError(f"Algorithme non supporté: {self.algorithm}")
+        values = np.asarray(X, dtype=float)
+        missing = np.isnan(values)
+        medians = pd.DataFrame(values).median().to_numpy()
+        self.medians_ = np.where(np.isnan(medians), 0.0, medians)
+        candidates = np.arange(values.shape[1]) if self.columns is None else np.asarray(self.columns, dtype=int)
+        if len(values):
+            candidates = candidates[missing[:, candidates].mean(axis=0) <= self.max_missing_rate]
+        self.knn_columns_ = candidates if len(values) else np.empty(0, dtype=int)
+
+        reference = values[~missing[:, self.knn_columns_].any(axis=1)][:, self.knn_columns_]
+        if len(self.knn_columns_) and len(reference) < self.n_neighbors:
+            logger.warning(f"{len(reference)} lignes complètes sur les colonnes KNN pour {self.n_neighbors} voisins : "
+                           f"imputation par la médiane")
+            self.knn_columns_ = np.empty(0, dtype=int)
+            reference = reference[:, :0]
+        if self.max_reference_rows is not None and len(reference) > self.max_reference_rows:
+            rng = np.random.default_rng(self.random_state)
+            reference = reference[np.sort(rng.choice(len(reference), self.max_reference_rows, replace=False))]
+        self.reference_ = reference
+        # Distances calculées sur les colonnes centrées réduites
+        self.center_ = reference.mean(axis=0) if len(reference) else np.zeros(reference.shape[1])
+        self.scale_ = reference.std(axis=0) if len(reference) else np.ones(reference.shape[1])
+        self.scale_[self.scale_ == 0] = 1.0
+        self.tree_ = None
+        if len(self.knn_columns_):
+            self.tree_ = _TREES[self.algorithm]((reference - self.center_) / self.scale_, leaf_size=self.leaf_size)
+        return self
+
+    def _neighbors(self, observed: np.ndarray, filled: np.ndarray):
+        """Plus proches voisins parmi les candidats de l'index, selon la distance sur les colonnes observées."""
+        k = min(self.n_neighbors * self.candidate_factor, len(self.reference_))
+        _, candidates = self.tree_.query(filled, k=k)
+        # Distance remise à l'échelle du nombre de colonnes observées, comme nan_euclidean_distances
+        differences = ((self.reference_[candidates] - self.center_) / self.scale_ - filled[:, None, :]) ** 2
+        distances = (differences * observed[:, None, :]).sum(axis=2)
+        distances = np.sqrt(distances * observed.shape[1] / np.maximum(observed.sum(axis=1), 1)[:, None])
+        nearest = np.argsort(distances, axis=1, kind="stable")[:, :self.n_neighbors]
+        return np.take_along_axis(distances, nearest, axis=1), self.reference_[np.take_along_axis(candidates, nearest, axis=1)]
+
+    def _impute_batch(self, queries: np.ndarray) -> np.ndarray:
+        """Moyenne des voisins de chaque ligne (toutes colonnes KNN) ; seules les cellules manquantes sont utilisées."""
+        scaled = (queries - self.center_) / self.scale_
+        observed = ~np.isnan(scaled)
+        # Première requête : valeurs manquantes à la moyenne ; seconde : à l'estimation des premiers voisins
+        _, neighbors = self._neighbors(observed, np.where(observed, scaled, 0.0))
+        estimate = (neighbors.mean(axis=1) - self.center_) / self.scale_
+        distances, neighbors = self._neighbors(observed, np.where(observed, scaled, estimate))
+        if self.weights == "distance":
+            weights = 1.0 / np.maximum(distances, 1e-12)
+            return (neighbors * weights[:, :, None]).sum(axis=1) / weights.sum(axis=1)[:, None]
+        return neighbors.mean(axis=1)
+
+    def transform(self, X) -> np.ndarray:
+        """
+        Impute les valeurs manquantes de X (tableau numérique de mêmes colonnes qu'à l'apprentissage).
+
+        Returns:
+            np.ndarray: Données imputées.
+        """
+        values = np.array(X, dtype=float)
+        if self.tree_ is not None:
+            block = values[:, self.knn_columns_]
+            missing = np.isnan(block)
+            # Aucune colonne observée : moyenne des lignes de référence
+            empty = missing.all(axis=1)
+            block[empty] = self.center_
+            incomplete = np.flatnonzero(missing.any(axis=1) & ~empty)
+            batches = [incomplete[start:start + self.batch_size] for start in range(0, len(incomplete), self.batch_size)]
+            results = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                delayed(self._impute_batch)(block[rows]) for rows in batches
+            )
+            for rows, imputed in zip(batches, results):
+                block[rows] = np.where(missing[rows], imputed, block[rows])
+            values[:, self.knn_columns_] = block
+        # Colonnes hors KNN : médiane
+        remaining = np.isnan(values)
+        values[remaining] = np.broadcast_to(self.medians_, values.shape)[remaining]
+        return values
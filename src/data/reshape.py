@@ -0,0 +1,146 @@
+"""
+Module pour le passage au format long des variables mesurées à plusieurs temps.
+Contient la détection des familles de colonnes `{var_base}{time}` (ex. attr1_1, attr1_2, attr1_3, attr1_s)
+et une vue longue mise en cache, construite sans `melt` (une seule extraction du bloc de valeurs et
+codes temporels entiers).
+"""
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+TIME_COLUMN_PATTERN = re.compile(r"^(?P<base>[A-Za-z][A-Za-z0-9]*_(?:[A-Za-z0-9]+_)*)(?P<time>\d+|s)$")
+
+
+def _time_order(time: str):
+    """Les temps numériques d'abord, dans l'ordre, puis les suffixes textuels (ex. "s")."""
+    return (0, int(time), "") if time.isdigit() else (1, 0, time)
+
+
+def discover_time_families(columns, min_times: int = 2) -> Dict[str, List[str]]:
+    """
+    Détecte les familles de colonnes mesurées à plusieurs temps.
+
+    Args:
+        columns: Noms de colonnes (ex. `df.columns`).
+        min_times (int): Nombre minimal de temps pour former une famille.
+
+    Returns:
+        Dict[str, List[str]]: Pour chaque nom de base (ex. "attr1_"), la liste ordonnée des temps (ex. ["1", "2", "3", "s"]).
+    """
+    families: Dict[str, List[str]] = {}
+    for col in columns:
+        match = TIME_COLUMN_PATTERN.match(str(col))
+        if match:
+            families.setdefault(match.group("base"), []).append(match.group("time"))
+    return {base: sorted(times, key=_time_order) for base, times in families.items() if len(times) >= min_times}
+
+
+def long_format(df: pd.DataFrame, value_vars: List[str], id_vars: List[str] = None, var_name: str = "variable",
+                value_name: str = "value", labels: List[str] = None) -> pd.DataFrame:
+    """
+    Construit le format long de plusieurs colonnes (équivalent de `melt`).
+
+    Les valeurs sont extraites en un seul bloc (une copie, sauf si les colonnes partagent déjà un
+    bloc contigu) puis aplaties colonne par colonne ; les id_vars sont répétées (une copie par
+    variable empilée). La variable d'origine est un Categorical dont les codes sont des entiers.
+
+    Args:
+        df (pd.DataFrame): DataFrame au format large.
+        value_vars (List[str]): Colonnes à empiler.
+        id_vars (List[str], optional): Colonnes répétées pour chaque valeur empilée.
+        var_name (str): Nom de la colonne identifiant la variable d'origine.
+        value_name (str): Nom de la colonne des valeurs.
+        labels (List[str], optional): Libellés des modalités de var_name (par défaut value_vars).
+
+    Returns:
+        pd.DataFrame: Colonnes `row` (position de la ligne d'origine), id_vars, var_name et value_name.
+    """
+    id_vars = list(id_vars or [])
+    n_rows, n_vars = len(df), len(value_vars)
+    block = df[value_vars].to_numpy()
+    # Ordre colonne par colonne : vue directe si le bloc est déjà stocké en Fortran
+    values = block.ravel(order="F")
+    codes = np.repeat(np.arange(n_vars, dtype=np.int16), n_rows)
+    data = {"row": np.tile(np.arange(n_rows), n_vars)}
+    for col in id_vars:
+        data[col] = np.tile(df[col].to_numpy(), n_vars)
+    data[var_name] = pd.Categorical.from_codes(codes, categories=labels if labels is not None else value_vars)
+    data[value_name] = values
+    return pd.DataFrame(data, copy=False)
+
+
+class TimeFamilies:
+    """
+    Familles de colonnes temporelles d'un DataFrame, avec vues longues mises en cache.
+
+    Le schéma est analysé une seule fois ; chaque vue longue est construite à la première
+    demande puis réutilisée par les statistiques et les graphiques longitudinaux.
+    """
+
+    def __init__(self, df: pd.DataFrame, min_times: int = 2):
+        self.df = df
+        self.families = discover_time_families(df.columns, min_times)
+        self._views: Dict[tuple, pd.DataFrame] = {}
+
+    def times(self, var_base: str, times: List[str] = None) -> List[str]:
+        """Temps disponibles pour une variable, dans l'ordre de `times` s'il est fourni."""
+        if times is None:
+            return self.families.get(var_base, [])
+        return [str(t) for t in times if f"{var_base}{t}" in self.df.columns]
+
+    def long(self, var_base: str, id_vars: List[str] = None, times: List[str] = None) -> pd.DataFrame:
+        """
+        Vue longue (mise en cache) d'une famille temporelle.
+
+        Args:
+            var_base (str): Nom de base (ex. "attr1_").
+            id_vars (List[str], optional): Colonnes à conserver (ex. ["gender"]).
+            times (List[str], optional): Sous-ensemble de temps (par défaut tous).
+
+        Returns:
+            pd.DataFrame: Colonnes `row`, id_vars, `time` (Categorical) et `value`.
+        """
+        selected = self.times(var_base, times)
+        key = (var_base, tuple(selected), tuple(id_vars or []))
+        if key not in self._views:
+            if not selected:
+                raise KeyError(f"Aucune colonne temporelle pour {var_base}")
+            self._views[key] = long_format(self.df, [f"{var_base}{t}" for t in selected], id_vars,
+                                           var_name="time", value_name="value", labels=selected)
+        return self._views[key]
+
+    def stack(self, value_vars: List[str], id_vars: List[str] = None, var_name: str = "variable",
+              value_name: str = "value") -> pd.DataFrame:
+        """
+        Vue longue (mise en cache) de colonnes quelconques, hors famille temporelle (voir `long_format`).
+
+        Args:
+            value_vars (List[str]): Colonnes à empiler (ex. ["attr3_1", "attr_o"]).
+            id_vars (List[str], optional): Colonnes à conserver.
+            var_name (str): Nom de la colonne identifiant la variable d'origine.
+            value_name (str): Nom de la colonne des valeurs.
+
+        Returns:
+            pd.DataFrame: Colonnes `row`, id_vars, var_name et value_name.
+        """
+        key = ("__stack__", tuple(value_vars), tuple(id_vars or []), var_name, value_name)
+        if key not in self._views:
+            self._views[key] = long_format(self.df, list(value_vars), id_vars, var_name=var_name, value_name=value_name)
+        return self._views[key]
+
+    def summary(self, var_base: str, by: str = None, times: List[str] = None) -> pd.DataFrame:
+        """
+        Statistiques longitudinales (effectif, moyenne, écart-type, médiane) par temps et, optionnellement, par groupe.
+
+        Args:
+            var_base (str): Nom de base (ex. "attr1_").
+            by (str, optional): Colonne de regroupement (ex. "gender").
+            times (List[str], optional): Sous-ensemble de temps.
+
+        Returns:
+            pd.DataFrame: Une ligne par temps (et groupe).
+        """
+        view = self.long(var_base, [by] if by else None, times)
+        keys = ["time", by] if by else ["time"]
+        return view.groupby(keys, observed=True)["value"].agg(["count", "mean", "std", "median"])
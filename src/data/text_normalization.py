@@ -0,0 +1,260 @@
+"""
+Module pour la normalisation des champs texte libres.
+Contient un regroupement des variantes orthographiques (ex. "Law", "law ", "LAW.", "Pariss") en
+deux temps : les chaînes de même clé normalisée (casse, accents, ponctuation, ordre des mots) sont
+d'abord fusionnées ; une faute de frappe n'est ensuite rattachée qu'à une forme canonique nettement
+plus fréquente, à une seule modification près, et jamais par transitivité (« Colombia » et
+« Columbia », « Australia » et « Austria » restent distincts). Les comparaisons sont limitées aux
+chaînes partageant une clé de bloc (préfixe, suffixe, clé phonétique). La correspondance est
+conservée dans un cache JSON versionné et modifiable à la main : les exécutions suivantes et les
+nouvelles vagues ne traitent que les chaînes encore inconnues.
+"""
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.utils.io import save_json, load_json
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+FREE_TEXT_COLUMNS = ["field", "career", "from", "undergra"]
+# Version des règles de regroupement : un cache construit avec d'autres règles est reconstruit
+CACHE_VERSION = 2
+
+_SOUNDEX_CODES = {**dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+                  "l": "4", **dict.fromkeys("mn", "5"), "r": "6"}
+
+
+def normalize_key(text: str) -> str:
+    """Clé de comparaison : minuscules, sans accents, ponctuation remplacée par des espaces, espaces réduits."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+
+def exact_key(text: str) -> str:
+    """Clé de fusion exacte : clé normalisée aux mots triés (ex. "Business/MBA" et "MBA business")."""
+    return " ".join(sorted(normalize_key(text).split()))
+
+
+def soundex(word: str) -> str:
+    """Code phonétique Soundex d'un mot (ex. "robert" -> "r163")."""
+    if not word:
+        return ""
+    digits = [_SOUNDEX_CODES.get(char, "") for char in word]
+    code, previous = [], digits[0]
+    for char, digit in zip(word[1:], digits[1:]):
+        if digit and digit != previous:
+            code.append(digit)
+        if char not in "hw":
+            previous = digit
+    return (word[0] + "".join(code) + "000")[:4]
+
+
+def blocking_keys(key: str, prefix_length: int = 4) -> Set[str]:
+    """Clés de bloc d'une chaîne normalisée : préfixe, suffixe, Soundex du premier mot et mots triés."""
+    compact = key.replace(" ", "")
+    tokens = key.split()
+    keys = {f"pre:{compact[:prefix_length]}", f"suf:{compact[-prefix_length:]}", f"tok:{' '.join(sorted(tokens))}"}
+    if tokens and tokens[0].isalpha():
+        keys.add(f"snd:{soundex(tokens[0])}")
+    return keys
+
+
+def edit_distance(a: str, b: str, max_distance: int = None) -> int:
+    """
+    Distance d'édition (insertion, suppression, substitution, transposition de deux caractères voisins).
+
+    Args:
+        a (str): Première chaîne.
+        b (str): Seconde chaîne.
+        max_distance (int, optional): Arrêt anticipé : une distance supérieure est renvoyée comme max_distance + 1.
+    """
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if before is not None and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class TextNormalizer:
+    """
+    Normalisation des variantes d'un champ texte, avec cache persistant.
+
+    Règles :
+        - les chaînes de même `exact_key` forment un groupe, représenté par sa variante la plus fréquente ;
+        - un groupe est rattaché directement à une forme canonique (jamais à une autre variante) si
+          leurs clés font au moins `min_length` caractères, diffèrent d'au plus `max_edits`
+          modifications, et si la forme canonique est au moins `dominance` fois plus fréquente ;
+        - les correspondances existantes (y compris corrigées à la main) ne sont jamais modifiées.
+
+    Args:
+        max_edits (int): Nombre maximal de modifications d'une faute de frappe.
+        min_length (int): Longueur minimale des clés comparées approximativement (les clés plus
+            courtes, ex. "ma" et "mba", ne sont fusionnées qu'à l'identique).
+        dominance (float): Rapport minimal d'effectif entre la forme canonique et la variante.
+        max_block_size (int): Les blocs plus grands sont ignorés (clés trop peu discriminantes).
+        mapping (Dict[str, str], optional): Correspondances déjà résolues (valeur brute -> forme canonique).
+        counts (Dict[str, int], optional): Effectifs déjà observés de chaque forme canonique.
+    """
+
+    def __init__(self, max_edits: int = 1, min_length: int = 5, dominance: float = 2.0, max_block_size: int = 200,
+                 mapping: Dict[str, str] = None, counts: Dict[str, int] = None):
+        self.max_edits = max_edits
+        self.min_length = min_length
+        self.dominance = dominance
+        self.max_block_size = max_block_size
+        self.mapping: Dict[str, str] = dict(mapping or {})
+        self.counts: Dict[str, int] = dict(counts or {})
+
+    def _long_enough(self, key: str) -> bool:
+        return len(key.replace(" ", "")) >= self.min_length
+
+    def _typo_of(self, key: str, support: int, blocks: Dict[str, List[str]], anchor_keys: Dict[str, str],
+                 anchor_support: Counter) -> Optional[str]:
+        """Forme canonique dont la clé `key` est une faute de frappe, ou None."""
+        if not self._long_enough(key):
+            return None
+        candidates = set()
+        for block_key in blocking_keys(key):
+            members = blocks.get(block_key, [])
+            if len(members) <= self.max_block_size:
+                candidates.update(members)
+        best = None
+        for canonical in candidates:
+            other = anchor_keys[canonical]
+            if not self._long_enough(other) or anchor_support[canonical] < self.dominance * support:
+                continue
+            distance = edit_distance(key, other, self.max_edits)
+            if distance <= self.max_edits:
+                rank = (distance, -anchor_support[canonical], canonical)
+                best = rank if best is None else min(best, rank)
+        return best[2] if best is not None else None
+
+    def update(self, values: Iterable) -> int:
+        """
+        Résout les chaînes encore inconnues et les ajoute à la correspondance.
+
+        Args:
+            values: Valeurs brutes (ex. une colonne) ; les valeurs manquantes sont ignorées.
+
+        Returns:
+            int: Nombre de chaînes nouvellement résolues.
+        """
+        counts = Counter(str(v) for v in pd.Series(list(values), dtype=object).dropna())
+        unseen = [value for value in counts if value not in self.mapping]
+
+        # Formes canoniques existantes, indexées par clé exacte et par clé de bloc
+        anchor_support = Counter(self.counts)
+        for value, count in counts.items():
+            if value in self.mapping:
+                anchor_support[self.mapping[value]] += count
+        by_key = {exact_key(raw): canonical for raw, canonical in self.mapping.items()}
+        anchor_keys = {canonical: exact_key(canonical) for canonical in set(self.mapping.values())}
+        by_key.update({key: canonical for canonical, key in anchor_keys.items()})
+        blocks: Dict[str, List[str]] = defaultdict(list)
+        for canonical, key in anchor_keys.items():
+            for block_key in blocking_keys(key):
+                blocks[block_key].append(canonical)
+
+        # 1. Fusion exacte des chaînes de même clé (à effectif égal, la variante apparue en premier représente le groupe)
+        order = {value: i for i, value in enumerate(counts)}
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for value in unseen:
+            groups[exact_key(value)].append(value)
+        pending = []
+        for key, members in groups.items():
+            support = sum(counts[value] for value in members)
+            if key in by_key:
+                canonical = by_key[key]
+                anchor_support[canonical] += support
+                self.mapping.update(dict.fromkeys(members, canonical))
+            else:
+                representative = max(members, key=lambda value: (counts[value], -order[value]))
+                pending.append((key, members, representative, support))
+
+        # 2. Fautes de frappe : groupes les plus fréquents d'abord, rattachés directement à une forme canonique
+        for key, members, representative, support in sorted(pending, key=lambda group: -group[3]):
+            canonical = self._typo_of(key, support, blocks, anchor_keys, anchor_support)
+            if canonical is None:
+                canonical = representative
+                anchor_keys[canonical] = key
+                for block_key in blocking_keys(key):
+                    blocks[block_key].append(canonical)
+            anchor_support[canonical] += support
+            self.mapping.update(dict.fromkeys(members, canonical))
+
+        self.counts = {canonical: int(anchor_support[canonical]) for canonical in set(self.mapping.values())}
+        if unseen:
+            logger.info(f"{len(unseen)} chaînes résolues en {len({self.mapping[v] for v in unseen})} formes canoniques")
+        return len(unseen)
+
+    def transform(self, values: pd.Series) -> pd.Series:
+        """Remplace chaque valeur par sa forme canonique (les valeurs inconnues sont laissées telles quelles)."""
+        return values.map(lambda value: self.mapping.get(str(value), value) if pd.notna(value) else value)
+
+
+def load_text_mapping(cache_path: str) -> Dict[str, dict]:
+    """
+    Relit le cache des correspondances.
+
+    Format : {"version": CACHE_VERSION, "columns": {colonne: {"mapping": {brut: canonique},
+    "counts": {canonique: effectif}}}}. Les correspondances peuvent être corrigées à la main dans
+    le fichier ; un cache construit avec une version antérieure des règles est ignoré (puis reconstruit).
+
+    Args:
+        cache_path (str): Fichier JSON du cache.
+
+    Returns:
+        Dict[str, dict]: État par colonne (vide si le cache est absent ou obsolète).
+    """
+    if cache_path is None or not os.path.exists(cache_path):
+        return {}
+    cache = load_json(cache_path)
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        logger.warning(f"Cache {cache_path} construit avec d'autres règles de regroupement : ignoré et reconstruit")
+        return {}
+    return cache["columns"]
+
+
+def normalize_text_columns(df: pd.DataFrame, columns: List[str] = None, cache_path: str = None,
+                           **kwargs) -> pd.DataFrame:
+    """
+    Normalise les variantes orthographiques des colonnes texte libres.
+
+    Args:
+        df (pd.DataFrame): DataFrame d'origine.
+        columns (List[str], optional): Colonnes à normaliser (par défaut FREE_TEXT_COLUMNS présentes).
+        cache_path (str, optional): Fichier JSON des correspondances (voir `load_text_mapping`),
+            relu puis enrichi des seules chaînes inconnues.
+        **kwargs: Paramètres de `TextNormalizer` (max_edits, min_length, dominance).
+
+    Returns:
+        pd.DataFrame: DataFrame avec les colonnes normalisées.
+    """
+    columns = columns if columns is not None else [col for col in FREE_TEXT_COLUMNS if col in df.columns]
+    cache = load_text_mapping(cache_path)
+    n_new = 0
+    for col in columns:
+        state = cache.get(col, {})
+        normalizer = TextNormalizer(mapping=state.get("mapping"), counts=state.get("counts"), **kwargs)
+        n_new += normalizer.update(df[col])
+        df[col] = normalizer.transform(df[col])
+        cache[col] = {"mapping": normalizer.mapping, "counts": normalizer.counts}
+    if cache_path is not None and n_new:
+        save_json({"version": CACHE_VERSION, "columns": cache}, cache_path)
+    return df
@@ -0,0 +1,237 @@
+"""
+Module pour la validation de la qualité des données.
+Contient des règles déclaratives (plage de valeurs, somme par famille d'allocation, intégrité
+référentielle iid/pid, type) compilées en une seule passe vectorisée : toutes les colonnes
+numériques contrôlées sont extraites en un seul bloc, puis chaque règle est évaluée par
+réduction sur ses segments de colonnes.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+RATING_COLUMNS = ["attr", "sinc", "intel", "fun", "amb", "shar", "like", "prob",
+                  "attr_o", "sinc_o", "intel_o", "fun_o", "amb_o", "shar_o", "like_o", "prob_o"]
+SELF_RATING_COLUMNS = ["attr3_1", "sinc3_1", "intel3_1", "fun3_1", "amb3_1"]
+# Familles d'allocation de 100 points (ce que l'on recherche, ce que l'autre sexe recherche, préférences du partenaire)
+ALLOCATION_FAMILIES = {
+    "attr1_1": ["attr1_1", "sinc1_1", "intel1_1", "fun1_1", "amb1_1", "shar1_1"],
+    "attr2_1": ["attr2_1", "sinc2_1", "intel2_1", "fun2_1", "amb2_1", "shar2_1"],
+    "pf_o": ["pf_o_att", "pf_o_sin", "pf_o_int", "pf_o_fun", "pf_o_amb", "pf_o_sha"],
+}
+DTYPE_KINDS = ["numeric", "integer", "string"]
+
+
+class RangeRule:
+    """Les valeurs non manquantes des colonnes doivent être comprises entre min_value et max_value."""
+
+    def __init__(self, name: str, columns: List[str], min_value: float = None, max_value: float = None):
+        self.name = name
+        self.columns = list(columns)
+        self.min_value = -np.inf if min_value is None else min_value
+        self.max_value = np.inf if max_value is None else max_value
+
+
+class SumRule:
+    """Les colonnes d'une famille doivent totaliser `total` (à `tolerance` près) ; les lignes entièrement manquantes sont ignorées."""
+
+    def __init__(self, name: str, columns: List[str], total: float = 100, tolerance: float = 1.0):
+        self.name = name
+        self.columns = list(columns)
+        self.total = total
+        self.tolerance = tolerance
+
+
+class ReferenceRule:
+    """
+    Chaque `ref_col` doit exister comme `id_col` (dans le même groupe, ex. la vague) et,
+    si `reciprocal`, la ligne réciproque (ref_col, id_col) doit exister.
+    """
+
+    def __init__(self, name: str, id_col: str = "iid", ref_col: str = "pid", group_col: str = "wave", reciprocal: bool = True):
+        self.name = name
+        self.id_col = id_col
+        self.ref_col = ref_col
+        self.group_col = group_col
+        self.reciprocal = reciprocal
+
+    @property
+    def columns(self) -> List[str]:
+        return [col for col in (self.group_col, self.id_col, self.ref_col) if col is not None]
+
+
+class DtypeRule:
+    """Les valeurs non manquantes doivent être du type attendu ("numeric", "integer" ou "string")."""
+
+    def __init__(self, name: str, columns: List[str], kind: str = "numeric"):
+        if kind not in DTYPE_KINDS:
+            raise ValueError(f"Type non supporté: {kind}")
+        self.name = name
+        self.columns = list(columns)
+        self.kind = kind
+
+
+def default_rules() -> list:
+    """Règles connues des données Speed Dating."""
+    rules = [
+        RangeRule("rating_range", RATING_COLUMNS + SELF_RATING_COLUMNS, 1, 10),
+        ReferenceRule("iid_pid_reciprocal", "iid", "pid", "wave", reciprocal=True),
+        DtypeRule("integer_ids", ["iid", "pid", "wave", "dec", "match"], "integer"),
+    ]
+    rules += [SumRule(f"{family}_sum", columns) for family, columns in ALLOCATION_FAMILIES.items()]
+    return rules
+
+
+class ValidationReport:
+    """
+    Résultat d'une validation.
+
+    Attributes:
+        summary: Une ligne par règle (rule, kind, n_checked_columns, n_violations).
+        violations: Pour chaque règle, les index des lignes en infraction.
+    """
+
+    def __init__(self, summary: pd.DataFrame, violations: Dict[str, pd.Index]):
+        self.summary = summary
+        self.violations = violations
+
+    @property
+    def is_valid(self) -> bool:
+        return bool((self.summary["n_violations"] == 0).all())
+
+    def __getitem__(self, rule_name: str) -> pd.Index:
+        return self.violations[rule_name]
+
+
+class DataQualityValidator:
+    """
+    Validateur compilé : la liste des règles est analysée une seule fois, puis `validate`
+    évalue toutes les règles numériques sur un seul bloc extrait du DataFrame.
+    """
+
+    def __init__(self, rules: list = None):
+        self.rules = default_rules() if rules is None else list(rules)
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Les noms de règles doivent être uniques.")
+        self._block_rules = [rule for rule in self.rules if isinstance(rule, (RangeRule, SumRule))]
+
+    def _block_masks(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Évalue les règles de plage et de somme en une seule passe sur un bloc de colonnes."""
+        segments, columns = [], []
+        for rule in self._block_rules:
+            present = [col for col in rule.columns if col in df.columns]
+            if present:
+                segments.append((rule, len(columns), len(present)))
+                columns.extend(present)
+        if not columns:
+            return {}
+        block = df[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        missing = np.isnan(block)
+        starts = np.array([start for _, start, _ in segments])
+
+        # Bornes colonne par colonne (±inf pour les colonnes des règles de somme)
+        lower = np.full(len(columns), -np.inf)
+        upper = np.full(len(columns), np.inf)
+        for rule, start, width in segments:
+            if isinstance(rule, RangeRule):
+                lower[start:start + width] = rule.min_value
+                upper[start:start + width] = rule.max_value
+        out_of_range = np.logical_or.reduceat((block < lower) | (block > upper), starts, axis=1)
+        sums = np.add.reduceat(np.where(missing, 0.0, block), starts, axis=1)
+        observed = np.add.reduceat(~missing, starts, axis=1) > 0
+
+        masks = {}
+        for j, (rule, _, _) in enumerate(segments):
+            if isinstance(rule, RangeRule):
+                masks[rule.name] = out_of_range[:, j]
+            else:
+                masks[rule.name] = observed[:, j] & (np.abs(sums[:, j] - rule.total) > rule.tolerance)
+        return masks
+
+    @staticmethod
+    def _reference_mask(df: pd.DataFrame, rule: ReferenceRule) -> np.ndarray:
+        """Lignes dont la référence n'existe pas, ou sans ligne réciproque, via des clés entières composites."""
+        ids, refs = df[rule.id_col].to_numpy(), df[rule.ref_col].to_numpy()
+        codes, uniques = pd.factorize(np.concatenate([ids, refs]))
+        id_codes, ref_codes = codes[:len(df)].astype(np.int64), codes[len(df):].astype(np.int64)
+        n_ids = max(len(uniques), 1)
+        if rule.group_col is not None:
+            groups = pd.factorize(df[rule.group_col])[0].astype(np.int64)
+        else:
+            groups = np.zeros(len(df), dtype=np.int64)
+
+        has_ref = ref_codes >= 0
+        known = groups * n_ids + id_codes
+        invalid = has_ref & ~np.isin(groups * n_ids + ref_codes, known[id_codes >= 0])
+        if rule.reciprocal:
+            pairs = (groups * n_ids + id_codes) * n_ids + ref_codes
+            reverse = (groups * n_ids + ref_codes) * n_ids + id_codes
+            invalid |= has_ref & (id_codes >= 0) & ~np.isin(reverse, pairs[has_ref])
+        return invalid
+
+    @staticmethod
+    def _dtype_mask(df: pd.DataFrame, rule: DtypeRule) -> np.ndarray:
+        present = [col for col in rule.columns if col in df.columns]
+        if not present:
+            return np.zeros(len(df), dtype=bool)
+        data = df[present]
+        observed = data.notna().to_numpy()
+        if rule.kind == "string":
+            is_string = data.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+            return (observed & ~is_string).any(axis=1)
+        numeric = data.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        invalid = observed & np.isnan(numeric)
+        if rule.kind == "integer":
+            invalid |= observed & ~np.isnan(numeric) & (numeric != np.round(numeric))
+        return invalid.any(axis=1)
+
+    def validate(self, df: pd.DataFrame) -> ValidationReport:
+        """
+        Évalue toutes les règles sur le DataFrame.
+
+        Les colonnes absentes sont ignorées (une règle sans aucune colonne présente n'a aucune infraction).
+
+        Args:
+            df (pd.DataFrame): Données à valider.
+
+        Returns:
+            ValidationReport: Nombre d'infractions et index des lignes concernées, par règle.
+        """
+        masks = self._block_masks(df)
+        rows, violations = [], {}
+        for rule in self.rules:
+            n_checked = sum(col in df.columns for col in rule.columns)
+            if isinstance(rule, ReferenceRule):
+                mask = self._reference_mask(df, rule) if n_checked == len(rule.columns) else np.zeros(len(df), dtype=bool)
+            elif isinstance(rule, DtypeRule):
+                mask = self._dtype_mask(df, rule)
+            else:
+                mask = masks.get(rule.name, np.zeros(len(df), dtype=bool))
+            violations[rule.name] = df.index[mask]
+            rows.append({"rule": rule.name, "kind": type(rule).__name__, "n_checked_columns": n_checked,
+                         "n_violations": int(mask.sum())})
+        report = ValidationReport(pd.DataFrame(rows), violations)
+        for row in rows:
+            if row["n_violations"]:
+                logger.warning(f"Règle {row['rule']} : {row['n_violations']} lignes en infraction")
+        return report
+
+
+def validate_data(df: pd.DataFrame, rules: list = None) -> ValidationReport:
+    """
+    Valide un DataFrame avec les règles fournies (par défaut `default_rules()`).
+
+    Args:
+        df (pd.DataFrame): Données à valider.
+        rules (list, optional): Règles (RangeRule, SumRule, ReferenceRule, DtypeRule).
+
+    Returns:
+        ValidationReport: Rapport de validation.
+    """
+    return DataQualityValidator(rules).validate(df)
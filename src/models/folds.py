@@ -0,0 +1,311 @@
+"""
+Module pour le stockage des plis de validation croisée.
+Contient un magasin qui matérialise une seule fois, pour chaque pli, les matrices
+d'entraînement et de validation prétraitées (imputation, mise à l'échelle et encodage creux des
+variables qualitatives appris sur l'entraînement seul), groupées par vague (ou composante connexe
+iid–pid), en float32 mappés en mémoire (ou CSR si des variables qualitatives sont encodées).
+"""
+import os
+import glob
+import shutil
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sklearn.impute import SimpleImputer
+from sklearn.model_selection import GroupKFold
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
+from typing import Any, Dict, Iterator, List
+
+from src.data.preprocess import IndexedKNNImputer, HIGH_CARDINALITY_COLUMNS, make_categorical_encoder
+from src.data.validation import RATING_COLUMNS
+from src.analysis.network import NETWORK_PREFIX
+from src.utils.io import save_json, load_json, save_model, load_model
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+# Groupe calculé : composante connexe du graphe des rencontres iid–pid
+COMPONENT_GROUP = "component"
+ARRAYS = ["X_train", "y_train", "X_val", "y_val", "train_index", "val_index"]
+# Colonnes connues seulement après la décision (match = dec & dec_o, identifiant du partenaire,
+# questionnaires de suivi) : exclues des features par défaut
+POST_DECISION_COLUMNS = {"dec", "dec_o", "match", "pid", "partner", "you_call", "them_cal", "date_3", "match_es",
+                         "length", "numdat_2", "numdat_3", "num_in_3"}
+# Questionnaires du lendemain (*_2) et de suivi (*_3), ex. attr1_2, satis_2, attr3_3
+POST_DECISION_SUFFIXES = ("_2", "_3")
+# Métriques de réseau, calculées à partir de dec, dec_o et match (voir `add_network_features`)
+POST_DECISION_PREFIXES = (NETWORK_PREFIX,)
+
+
+def is_post_decision(col: str) -> bool:
+    """True si la colonne n'est connue qu'après la décision (elle contient ou reflète la cible)."""
+    return col in POST_DECISION_COLUMNS or col.endswith(POST_DECISION_SUFFIXES) or col.startswith(POST_DECISION_PREFIXES)
+
+_SCALERS = {"standard": StandardScaler, "minmax": MinMaxScaler, "robust": RobustScaler}
+
+
+def _make_preprocessor(fill_strategy: str, scaling: str, imputer_params: Dict[str, Any] = None):
+    if fill_strategy == "knn":
+        steps = [IndexedKNNImputer(**(imputer_params or {}))]
+    else:
+        steps = [SimpleImputer(strategy=fill_strategy, keep_empty_features=True)]
+    if scaling is not None and scaling != "none":
+        if scaling not in _SCALERS:
+            raise ValueError(f"Mise à l'échelle non supportée: {scaling}")
+        steps.append(_SCALERS[scaling]())
+    return make_pipeline(*steps)
+
+
+def _build_fold(fold_dir: str, X: np.ndarray, y: np.ndarray, train_index: np.ndarray, val_index: np.ndarray,
+                fill_strategy: str, scaling: str, categorical: pd.DataFrame = None, encoding: str = "onehot",
+                encoder_params: Dict[str, Any] = None, imputer_params: Dict[str, Any] = None) -> Dict[str, list]:
+    """Prétraite et écrit un pli ; retourne les dimensions des tableaux écrits."""
+    os.makedirs(fold_dir, exist_ok=True)
+    preprocessor = _make_preprocessor(fill_strategy, scaling, imputer_params)
+    arrays = {
+        "X_train": preprocessor.fit_transform(X[train_index]).astype(np.float32),
+        "X_val": preprocessor.transform(X[val_index]).astype(np.float32),
+        "y_train": y[train_index],
+        "y_val": y[val_index],
+        "train_index": train_index,
+        "val_index": val_index,
+    }
+    if categorical is not None:
+        # Vocabulaire appris sur l'entraînement seul ; les matrices restent creuses (CSR)
+        encoder = make_categorical_encoder(encoding, list(categorical.columns), **(encoder_params or {}))
+        encoder.fit(categorical.iloc[train_index])
+        for name, index in (("X_train", train_index), ("X_val", val_index)):
+            encoded = encoder.transform(categorical.iloc[index])
+            arrays[name] = sparse.hstack([sparse.csr_matrix(arrays[name]), encoded], format="csr", dtype=np.float32)
+            sparse.save_npz(os.path.join(fold_dir, f"{name}.npz"), arrays[name])
+        save_model(encoder, os.path.join(fold_dir, "encoder.pkl"))
+    for name, array in arrays.items():
+        if not sparse.issparse(array):
+            np.save(os.path.join(fold_dir, f"{name}.npy"), np.ascontiguousarray(array))
+    save_model(preprocessor, os.path.join(fold_dir, "preprocessor.pkl"))
+    return {name: list(array.shape) for name, array in arrays.items()}
+
+
+def date_components(df: pd.DataFrame, id_col: str = "iid", partner_col: str = "pid") -> np.ndarray:
+    """
+    Composante connexe du graphe des rencontres de chaque ligne.
+
+    Chaque rendez-vous est stocké deux fois, (iid, pid) et (pid, iid), avec une cible `match`
+    symétrique : les deux lignes d'une même rencontre doivent tomber dans le même pli.
+
+    Args:
+        df (pd.DataFrame): Données (une ligne par rendez-vous).
+        id_col (str): Identifiant du participant.
+        partner_col (str): Identifiant du partenaire (les valeurs manquantes forment un groupe isolé).
+
+    Returns:
+        np.ndarray: Numéro de composante de chaque ligne.
+    """
+    ids = df[id_col].to_numpy()
+    partners = df[partner_col].to_numpy()
+    partners = np.where(pd.isna(partners), ids, partners)
+    codes, _ = pd.factorize(np.concatenate([ids, partners]))
+    n_rows, n_nodes = len(df), codes.max() + 1 if len(codes) else 0
+    graph = sparse.coo_matrix((np.ones(n_rows), (codes[:n_rows], codes[n_rows:])), shape=(n_nodes, n_nodes))
+    _, labels = connected_components(graph, directed=False)
+    return labels[codes[:n_rows]]
+
+
+class FoldStore:
+    """
+    Plis de validation croisée prétraités, partagés entre algorithmes et essais d'hyperparamètres.
+
+    Les tableaux sont relus avec `np.load(mmap_mode="r")` : chaque lecture est sans copie. Si des
+    variables qualitatives sont encodées, X_train et X_val sont des matrices CSR (variables
+    numériques prétraitées puis indicatrices ou hashing, voir `make_categorical_encoder`).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @property
+    def manifest(self) -> dict:
+        return load_json(os.path.join(self.root, MANIFEST_FILE))
+
+    @property
+    def n_folds(self) -> int:
+        return self.manifest["n_folds"]
+
+    @property
+    def feature_names(self) -> List[str]:
+        return self.manifest["feature_names"]
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.root, MANIFEST_FILE))
+
+    def _clear(self, n_folds: int, feature_cols: List[str]) -> None:
+        """Supprime les plis d'une construction précédente (ils pourraient ne plus correspondre au manifeste)."""
+        if self.exists():
+            previous = self.manifest
+            if previous["n_folds"] != n_folds or previous["feature_names"] != feature_cols:
+                logger.info(f"Plis existants de {self.root} obsolètes ({previous['n_folds']} plis, "
+                            f"{len(previous['feature_names'])} features) : suppression")
+            os.remove(os.path.join(self.root, MANIFEST_FILE))
+        for fold_dir in glob.glob(os.path.join(self.root, "fold_*")):
+            shutil.rmtree(fold_dir)
+
+    def build(self, df: pd.DataFrame, target_col: str, group_col: str = "wave", n_folds: int = 5,
+              feature_cols: List[str] = None, drop_columns: List[str] = None, fill_strategy: str = "median",
+              scaling: str = "standard", categorical_cols: List[str] = None, categorical_encoding: str = "onehot",
+              encoder_params: Dict[str, Any] = None, knn_columns: List[str] = None,
+              imputer_params: Dict[str, Any] = None, n_jobs: int = 1) -> "FoldStore":
+        """
+        Matérialise les plis sur disque.
+
+        Args:
+            df (pd.DataFrame): Données (une ligne par rendez-vous).
+            target_col (str): Variable cible (ex. "match").
+            group_col (str): Colonne de regroupement des plis (ex. "wave"), ou "component" pour la
+                composante connexe iid–pid (voir `date_components`) : un groupe n'apparaît jamais à la
+                fois en entraînement et en validation. Un regroupement par "iid" sépare les deux lignes
+                d'une même rencontre et laisse fuir la cible.
+            n_folds (int): Nombre de plis (ex. `models.cross_validation_folds`).
+            feature_cols (List[str], optional): Features (par défaut toutes les colonnes numériques
+                hors cible, groupe, drop_columns et colonnes postérieures à la décision, voir
+                `is_post_decision` : dec, dec_o, suivis *_2/*_3, métriques de réseau `net_*`...).
+            drop_columns (List[str], optional): Colonnes exclues (ex. `preprocessing.drop_columns`).
+            fill_strategy (str): Stratégie d'imputation (ex. `preprocessing.fill_strategy`) : "mean",
+                "median", "most_frequent" ou "knn" (voir `IndexedKNNImputer`).
+            scaling (str): "standard", "minmax", "robust" ou "none" (ex. `preprocessing.scaling`).
+            categorical_cols (List[str], optional): Variables qualitatives encodées en creux (aucune par défaut).
+            categorical_encoding (str): "onehot" ou "hashing" (ex. `preprocessing.categorical_encoding`).
+            encoder_params (Dict[str, Any], optional): Paramètres de l'encodeur (max_categories,
+                min_frequency ou n_features).
+            knn_columns (List[str], optional): Features imputées par KNN si fill_strategy vaut "knn"
+                (par défaut les notes liées RATING_COLUMNS présentes ; les autres par la médiane).
+            imputer_params (Dict[str, Any], optional): Paramètres de `IndexedKNNImputer` (n_neighbors,
+                max_reference_rows, n_jobs...).
+            n_jobs (int): Nombre de plis construits en parallèle.
+
+        Returns:
+            FoldStore: Le magasin construit.
+        """
+        if group_col == COMPONENT_GROUP:
+            data = df.dropna(subset=[target_col])
+            groups = date_components(data)
+        else:
+            data = df.dropna(subset=[target_col, group_col])
+            groups = data[group_col].to_numpy()
+        if feature_cols is None:
+            excluded = {target_col, group_col, *(drop_columns or []), *(categorical_cols or [])}
+            feature_cols = [col for col in data.select_dtypes(include=['float', 'int', 'bool']).columns
+                            if col not in excluded and not is_post_decision(col)]
+        X = data[feature_cols].to_numpy(dtype=float)
+        y = data[target_col].to_numpy()
+        categorical = data[list(categorical_cols)] if categorical_cols else None
+        if fill_strategy == "knn":
+            knn_columns = [col for col in (RATING_COLUMNS if knn_columns is None else knn_columns) if col in feature_cols]
+            imputer_params = {**(imputer_params or {}), "columns": [feature_cols.index(col) for col in knn_columns]}
+
+        self._clear(n_folds, feature_cols)
+
+        splits = list(GroupKFold(n_splits=n_folds).split(X, y, groups))
+        shapes = Parallel(n_jobs=n_jobs)(
+            delayed(_build_fold)(os.path.join(self.root, f"fold_{k}"), X, y, train_index, val_index, fill_strategy, scaling,
+                                 categorical, categorical_encoding, encoder_params, imputer_params)
+            for k, (train_index, val_index) in enumerate(splits)
+        )
+        save_json({
+            "n_folds": n_folds,
+            "target": target_col,
+            "group_col": group_col,
+            "feature_names": feature_cols,
+            "fill_strategy": fill_strategy,
+            "scaling": scaling,
+            "knn_columns": knn_columns if fill_strategy == "knn" else None,
+            "categorical_cols": list(categorical_cols or []),
+            "categorical_encoding": categorical_encoding if categorical_cols else None,
+            "row_index": data.index.tolist(),
+            "shapes": shapes,
+        }, os.path.join(self.root, MANIFEST_FILE))
+        logger.info(f"{n_folds} plis matérialisés dans {self.root} ({X.shape[0]} lignes, {X.shape[1]} features)")
+        return self
+
+    def load_fold(self, k: int) -> Dict[str, np.ndarray]:
+        """
+        Ouvre un pli en lecture seule, mappé en mémoire.
+
+        Args:
+            k (int): Numéro du pli.
+
+        Returns:
+            Dict[str, np.ndarray]: X_train, y_train, X_val, y_val, train_index et val_index
+                (X_train et X_val en CSR si des variables qualitatives sont encodées).
+        """
+        fold_dir = os.path.join(self.root, f"fold_{k}")
+        if not os.path.isdir(fold_dir) or (self.exists() and k >= self.n_folds):
+            raise FileNotFoundError(f"Pli {k} non trouvé dans {self.root}.")
+        fold = {}
+        for name in ARRAYS:
+            sparse_path = os.path.join(fold_dir, f"{name}.npz")
+            if os.path.exists(sparse_path):
+                fold[name] = sparse.load_npz(sparse_path)
+            else:
+                fold[name] = np.load(os.path.join(fold_dir, f"{name}.npy"), mmap_mode="r")
+        return fold
+
+    def load_preprocessor(self, k: int):
+        """Retourne le prétraitement (imputation + mise à l'échelle) appris sur l'entraînement du pli k."""
+        return load_model(os.path.join(self.root, f"fold_{k}", "preprocessor.pkl"))
+
+    def load_encoder(self, k: int):
+        """Retourne l'encodeur des variables qualitatives appris sur l'entraînement du pli k."""
+        return load_model(os.path.join(self.root, f"fold_{k}", "encoder.pkl"))
+
+    def __iter__(self) -> Iterator[Dict[str, np.ndarray]]:
+        for k in range(self.n_folds):
+            yield self.load_fold(k)
+
+
+def build_fold_store(df: pd.DataFrame, config: Dict[str, Any], root: str, **kwargs) -> FoldStore:
+    """
+    Construit le magasin de plis à partir des sections `preprocessing` et `models` de la configuration.
+
+    Les variables qualitatives à forte cardinalité présentes (HIGH_CARDINALITY_COLUMNS hors
+    `drop_columns`) sont encodées selon `categorical_encoding` : vocabulaire plafonné par
+    `max_categories` et `min_frequency`, ou `hashing_features` indices hachés. Avec
+    `fill_strategy: knn`, l'imputation est paramétrée par la sous-section `knn_imputation`.
+
+    Args:
+        df (pd.DataFrame): Données (une ligne par rendez-vous).
+        config (Dict[str, Any]): Configuration (voir `load_config`).
+        root (str): Dossier du magasin.
+        **kwargs: Paramètres de `FoldStore.build` prioritaires sur la configuration.
+
+    Returns:
+        FoldStore: Le magasin construit.
+    """
+    preprocessing = config.get("preprocessing", {})
+    models = config.get("models", {})
+    drop_columns = preprocessing.get("drop_columns", [])
+    encoding = preprocessing.get("categorical_encoding", "onehot")
+    if encoding == "hashing":
+        encoder_params = {"n_features": preprocessing.get("hashing_features", 4096)}
+    else:
+        encoder_params = {"max_categories": preprocessing.get("max_categories", 50),
+                          "min_frequency": preprocessing.get("min_frequency", 5)}
+    params = {
+        "target_col": models.get("target_variable", "match"),
+        "n_folds": models.get("cross_validation_folds", 5),
+        "drop_columns": drop_columns,
+        "fill_strategy": preprocessing.get("fill_strategy", "median"),
+        "scaling": preprocessing.get("scaling", "standard"),
+        "categorical_cols": [col for col in HIGH_CARDINALITY_COLUMNS if col in df.columns and col not in drop_columns],
+        "categorical_encoding": encoding,
+        "encoder_params": encoder_params,
+        "imputer_params": {"random_state": models.get("random_state"), **preprocessing.get("knn_imputation", {})},
+    }
+    params.update(kwargs)
+    return FoldStore(root).build(df, **params)
@@ -0,0 +1,170 @@
+"""
+Module pour l'importance des features par permutation.
+Contient un calcul où les copies permutées d'une feature sont évaluées par appels `predict`
+groupés (lots bornés en lignes × features), parallélisé sur les features, avec une approximation
+rapide par sous-échantillonnage des lignes et une sélection par `features.importance_threshold`.
+"""
+import json
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import is_classifier
+from sklearn.metrics import accuracy_score, balanced_accuracy_score, f1_score, roc_auc_score, r2_score, mean_squared_error
+from typing import Any, Dict, List, Tuple
+
+from src.utils.io import load_model, save_metrics
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Nombre maximal d'éléments (lignes × features) des copies empilées d'un lot, par thread
+MAX_BATCH_ELEMENTS = 5_000_000
+
+# Métrique -> (fonction, utilise predict_proba)
+SCORERS = {
+    "accuracy": (accuracy_score, False),
+    "balanced_accuracy": (balanced_accuracy_score, False),
+    "f1": (f1_score, False),
+    "roc_auc": (roc_auc_score, True),
+    "r2": (r2_score, False),
+    "neg_mean_squared_error": (lambda y_true, y_pred: -mean_squared_error(y_true, y_pred), False),
+}
+
+
+def _predict(model: Any, X: np.ndarray, use_proba: bool) -> np.ndarray:
+    if hasattr(model, "feature_names_in_"):
+        # Modèle entraîné sur un DataFrame : on conserve les noms de colonnes sans copier les données
+        X = pd.DataFrame(X, columns=model.feature_names_in_, copy=False)
+    return model.predict_proba(X)[:, 1] if use_proba else model.predict(X)
+
+
+def _feature_scores(model: Any, X: np.ndarray, y: np.ndarray, column: int, n_repeats: int, scoring: str,
+                    seed: np.random.SeedSequence) -> np.ndarray:
+    """Scores du modèle pour n_repeats permutations d'une feature, évaluées par lots de copies empilées."""
+    metric, use_proba = SCORERS[scoring]
+    rng = np.random.default_rng(seed)
+    n_rows, n_cols = X.shape
+    repeats_per_batch = max(1, min(n_repeats, MAX_BATCH_ELEMENTS // max(n_rows * n_cols, 1)))
+    # Copies empilées allouées une seule fois : seule la colonne permutée est réécrite d'un lot à l'autre
+    buffer = np.tile(X, (repeats_per_batch, 1))
+    scores = []
+    for start in range(0, n_repeats, repeats_per_batch):
+        n_batch = min(repeats_per_batch, n_repeats - start)
+        stacked = buffer[:n_batch * n_rows]
+        permutations = rng.permuted(np.tile(np.arange(n_rows), (n_batch, 1)), axis=1)
+        stacked[:, column] = X[permutations.ravel(), column]
+        predictions = _predict(model, stacked, use_proba).reshape(n_batch, n_rows)
+        scores.extend(metric(y, pred) for pred in predictions)
+    return np.asarray(scores)
+
+
+def permutation_importance_batched(model: Any, X: pd.DataFrame, y, scoring: str = None, n_repeats: int = 5,
+                                   max_samples=None, n_jobs: int = 1, random_state: int = None) -> pd.DataFrame:
+    """
+    Calcule l'importance par permutation de chaque feature.
+
+    Args:
+        model: Modèle entraîné (interface scikit-learn).
+        X (pd.DataFrame): Features d'évaluation (réordonnées selon `model.feature_names_in_` si présent).
+        y: Cible d'évaluation.
+        scoring (str, optional): Métrique (clé de SCORERS) ; par défaut "accuracy" en classification, "r2" sinon.
+        n_repeats (int): Nombre de permutations par feature.
+        max_samples (int or float, optional): Approximation rapide : nombre (ou proportion) de lignes tirées.
+        n_jobs (int): Nombre de features traitées en parallèle (threads, le modèle est partagé).
+        random_state (int, optional): Graine.
+
+    Returns:
+        pd.DataFrame: Une ligne par feature, triée par importance décroissante (importance_mean,
+            importance_std, importance_share, rank).
+    """
+    if scoring is None:
+        scoring = "accuracy" if is_classifier(model) else "r2"
+    if scoring not in SCORERS:
+        raise ValueError(f"Métrique non supportée: {scoring}")
+    if hasattr(model, "feature_names_in_"):
+        # Les tableaux sont ré-étiquetés avec les noms d'apprentissage : même ordre de colonnes obligatoire
+        missing = [name for name in model.feature_names_in_ if name not in X.columns]
+        if missing:
+            raise ValueError(f"Features d'apprentissage absentes de X: {missing}")
+        X = X[list(model.feature_names_in_)]
+    features = list(X.columns)
+    values = X.to_numpy(dtype=float)
+    target = np.asarray(y)
+    rng = np.random.default_rng(random_state)
+    if max_samples is not None:
+        n_samples = int(max_samples * len(values)) if isinstance(max_samples, float) else int(max_samples)
+        if n_samples < len(values):
+            rows = rng.choice(len(values), size=n_samples, replace=False)
+            values, target = values[rows], target[rows]
+
+    metric, use_proba = SCORERS[scoring]
+    baseline = metric(target, _predict(model, values, use_proba))
+    seeds = np.random.SeedSequence(random_state).spawn(len(features))
+    scores = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_feature_scores)(model, values, target, j, n_repeats, scoring, seeds[j]) for j in range(len(features))
+    )
+    drops = baseline - np.vstack(scores)
+    importances = pd.DataFrame({
+        "feature": features,
+        "importance_mean": drops.mean(axis=1),
+        "importance_std": drops.std(axis=1),
+    })
+    positive = importances["importance_mean"].clip(lower=0)
+    importances["importance_share"] = positive / positive.sum() if positive.sum() > 0 else 0.0
+    importances = importances.sort_values("importance_mean", ascending=False, kind="stable").reset_index(drop=True)
+    importances["rank"] = np.arange(1, len(importances) + 1)
+    logger.info(f"Importance par permutation ({scoring}, score de référence {baseline:.4f}) sur {len(features)} features")
+    return importances
+
+
+def select_important_features(importances: pd.DataFrame, importance_threshold: float = 0.05,
+                              on: str = "importance_mean") -> List[str]:
+    """
+    Retourne les features dont l'importance atteint le seuil, par ordre d'importance.
+
+    Args:
+        importances (pd.DataFrame): Résultat de `permutation_importance_batched`.
+        importance_threshold (float): Seuil (ex. `features.importance_threshold`).
+        on (str): "importance_mean" (baisse de score) ou "importance_share" (part de l'importance totale).
+
+    Returns:
+        List[str]: Features retenues.
+    """
+    return importances.loc[importances[on] >= importance_threshold, "feature"].tolist()
+
+
+def compute_model_importance(model_path: str, X: pd.DataFrame, y, importance_threshold: float = 0.05,
+                             output_path: str = None, on: str = "importance_mean",
+                             **kwargs) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Calcule l'importance des features d'un modèle sauvegardé avec `save_model`.
+
+    Args:
+        model_path (str): Chemin du modèle.
+        X (pd.DataFrame): Features d'évaluation.
+        y: Cible d'évaluation.
+        importance_threshold (float): Seuil de sélection.
+        output_path (str, optional): Fichier JSON où écrire le classement et les features retenues.
+        on (str): Colonne sur laquelle le seuil est appliqué.
+        **kwargs: Paramètres de `permutation_importance_batched`.
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: Classement complet et features retenues.
+    """
+    model = load_model(model_path)
+    importances = permutation_importance_batched(model, X, y, **kwargs)
+    selected = select_important_features(importances, importance_threshold, on)
+    if output_path is not None:
+        report: Dict[str, Any] = {
+            "model_path": model_path,
+            "importance_threshold": importance_threshold,
+            "threshold_on": on,
+            "selected_features": selected,
+            "importances": json.loads(importances.to_json(orient="records")),
+        }
+        save_metrics(report, output_path)
+    logger.info(f"{len(selected)} features retenues sur {len(importances)}")
+    return importances, selected
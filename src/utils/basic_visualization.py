@@ -1,7 +1,10 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import missingno as msno
-from pathlib import Path
+
+from src.utils.rendering import save_figure, renderable, resolve_figsize
+from src.analysis.sketches import FrameSketch
+from src.utils.memory import sample_to_budget
 
 def display_head(df: pd.DataFrame, n: int = 5) -> None:
     """
@@ -13,41 +16,47 @@ def display_head(df: pd.DataFrame, n: int = 5) -> None:
     """
     print(df.head(n))
 
-def display_info(df: pd.DataFrame) -> None:
+def display_info(df: pd.DataFrame = None, sketch: FrameSketch = None) -> None:
     """
     Affiche les informations structurelles du DataFrame.
     
     Args:
-        df (pd.DataFrame): Le DataFrame à analyser.
-    """
+        df (pd.DataFrame, optional): Le DataFrame à analyser.
+        sketch (FrameSketch, optional): Résumé fusionnable utilisé à la place du DataFrame
+            (non manquants, manquants, distinctes approchées et type par colonne).
+    """
+    if sketch is not None:
+        print(f"{sketch.n_rows} entries, {len(sketch.columns)} columns")
+        print(sketch.info())
+        return
     print(df.info())
 
-def display_description(df: pd.DataFrame) -> None:
+def display_description(df: pd.DataFrame = None, sketch: FrameSketch = None) -> None:
     """
     Affiche les statistiques descriptives du DataFrame.
     
     Args:
-        df (pd.DataFrame): Le DataFrame à analyser.
+        df (pd.DataFrame, optional): Le DataFrame à analyser.
+        sketch (FrameSketch, optional): Résumé fusionnable utilisé à la place du DataFrame (quantiles approchés).
     """
-    print(df.describe())
+    print(sketch.describe() if sketch is not None else df.describe())
 
-def plot_missing_values(df: pd.DataFrame, figures_path: str, figsize: tuple = (10, 6)) -> None:
+@renderable
+def plot_missing_values(df: pd.DataFrame, figures_path: str = None, figsize: tuple = None) -> None:
     """
     Affiche un heatmap des valeurs manquantes.
     
     Args:
         df (pd.DataFrame): Le DataFrame à analyser.
-        figsize (tuple): Taille de la figure (par défaut (10, 6)).
-    """
-    plt.figure(figsize=figsize)
-    msno.matrix(df)
-    plt.title("Matrice des valeurs manquantes")
-    plt.savefig(Path(figures_path)/f"Matrix_missing_values.png")
-    plt.clf()
-    plt.close()
+        figures_path (str, optional): Dossier de sauvegarde des figures (voir `save_figure`).
+        figsize (tuple, optional): Taille de la figure (par défaut celle du profil de rendu, sinon (10, 6)).
+            Au-delà du budget mémoire actif, les graphiques sont tracés sur un échantillon de lignes.
+    """
+    df = sample_to_budget(df, "Graphiques des valeurs manquantes", overhead=2.0)
+    ax = msno.matrix(df, figsize=resolve_figsize(figsize, (10, 6)))
+    ax.set_title("Matrice des valeurs manquantes")
+    save_figure(figures_path, f"Matrix_missing_values.png", fig=ax.get_figure())
 
-    msno.heatmap(df)
-    plt.title("Heatmap des valeurs manquantes")
-    plt.savefig(Path(figures_path)/f"Heatmap_missing_values.png")
-    plt.clf()
-    plt.close()
\ No newline at end of file
+    ax = msno.heatmap(df, figsize=resolve_figsize(figsize, (10, 6)))
+    ax.set_title("Heatmap des valeurs manquantes")
+    save_figure(figures_path, f"Heatmap_missing_values.png", fig=ax.get_figure())
@@ -3,17 +3,31 @@ Module pour la gestion des entrées/sorties du projet.
 Contient des fonctions pour charger et sauvegarder des données et des modèles.
 """
 import os
+import glob
 import yaml
 import json
 import pickle
+import operator
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 import logging
 
+from src.utils.memory import get_memory_budget, estimate_csv_bytes, track_peak, MB
+
 # Configuration globale du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SCHEMA_FILE = "_schema.json"
+NULL_PARTITION = "__NULL__"
+
+_FILTER_OPERATORS = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge,
+}
+
 def load_config(config_path: str = "../config.yaml") -> Dict[str, Any]:
     """
     Charge le fichier de configuration YAML.
@@ -36,46 +50,265 @@ def load_config(config_path: str = "../config.yaml") -> Dict[str, Any]:
         logger.error(f"Fichier de configuration {config_path} non trouvé.")
         raise FileNotFoundError(f"Fichier de configuration {config_path} non trouvé.")
 
-def load_data(file_path: str, encoding: str = "utf-8") -> pd.DataFrame:
+def _filter_mask(values: pd.Series, op: str, value: Any) -> pd.Series:
+    """Évalue un filtre (colonne, opérateur, valeur) sur une série."""
+    if op == "in":
+        return values.isin(value)
+    if op == "not in":
+        return ~values.isin(value)
+    if op not in _FILTER_OPERATORS:
+        raise ValueError(f"Opérateur de filtre non supporté: {op}")
+    return _FILTER_OPERATORS[op](values, value)
+
+def _apply_filters(df: pd.DataFrame, filters: List[Tuple[str, str, Any]]) -> pd.DataFrame:
+    """Applique une liste de filtres (combinés par ET) aux lignes d'un DataFrame."""
+    if not filters:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        mask &= _filter_mask(df[column], op, value)
+    return df[mask]
+
+def _parse_partition_value(raw: str, dtype: str) -> Any:
+    """Convertit la valeur lue dans le nom d'un dossier de partition vers le type du schéma."""
+    if raw == NULL_PARTITION:
+        return None
+    if dtype.startswith("int"):
+        return int(raw)
+    if dtype.startswith("float"):
+        return float(raw)
+    return raw
+
+def _load_partitioned(dir_path: str, encoding: str, columns: List[str] = None,
+                      filters: List[Tuple[str, str, Any]] = None, allow_sampling: bool = False) -> pd.DataFrame:
+    """
+    Charge un jeu de données partitionné en ne lisant que les partitions et colonnes utiles.
+
+    L'empreinte des partitions retenues est estimée à partir de la première (octets en mémoire par
+    octet de fichier) et de la taille des fichiers ; au-delà du budget mémoire actif, elles sont lues
+    par morceaux comme un CSV (voir `_collect_chunks`).
+    """
+    with open(os.path.join(dir_path, SCHEMA_FILE), 'r') as f:
+        schema = json.load(f)
+    partition_col = schema["partition_by"]
+    all_columns = schema["columns"]
+    filters = filters or []
+    columns = list(columns) if columns is not None else all_columns
+    unknown = set(columns) - set(all_columns)
+    if unknown:
+        raise KeyError(f"Colonnes inconnues: {sorted(unknown)}")
+
+    partition_filters = [flt for flt in filters if flt[0] == partition_col]
+    row_filters = [flt for flt in filters if flt[0] != partition_col]
+    needed = [col for col in all_columns
+              if col != partition_col and (col in columns or col in {flt[0] for flt in row_filters})]
+    object_dtypes = {col: object for col in needed if schema["dtypes"][col] == "object"}
+
+    partitions = []
+    for part_dir in sorted(glob.glob(os.path.join(dir_path, f"{partition_col}=*"))):
+        value = _parse_partition_value(part_dir.split("=", 1)[1], schema["dtypes"][partition_col])
+        if not all(_filter_mask(pd.Series([value]), op, val).iloc[0] for _, op, val in partition_filters):
+            continue
+        partitions.append((value, part_dir))
+    files = [(value, part_file) for value, part_dir in sorted(partitions, key=lambda item: (item[0] is None, item[0]))
+             for part_file in sorted(glob.glob(os.path.join(part_dir, "part-*.csv")))]
+
+    budget = get_memory_budget()
+    estimate = 0
+    if budget.active and files:
+        first = files[0][1]
+        per_byte = estimate_csv_bytes(first, encoding, needed).sum() / max(os.path.getsize(first), 1)
+        estimate = per_byte * sum(os.path.getsize(part_file) for _, part_file in files)
+
+    def read_parts(chunksize: int = None):
+        for value, part_file in files:
+            parts = pd.read_csv(part_file, encoding=encoding, usecols=needed, dtype=object_dtypes, chunksize=chunksize)
+            for part in (parts if chunksize else [parts]):
+                part[partition_col] = value
+                yield part
+
+    with track_peak(f"Chargement de {dir_path}"):
+        if budget.fits(f"Chargement de {dir_path}", estimate):
+            frames = [_apply_filters(part, row_filters) for part in read_parts()]
+        else:
+            frames = _collect_chunks(dir_path, read_parts(budget.chunk_rows), columns, row_filters, estimate, budget,
+                                     allow_sampling)
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(frames, ignore_index=True)
+    if schema["dtypes"][partition_col].startswith("int") and df[partition_col].notna().all():
+        df[partition_col] = df[partition_col].astype(schema["dtypes"][partition_col])
+    logger.info(f"{len(partitions)} partitions lues sur {partition_col}")
+    return df[columns]
+
+def _collect_chunks(source: str, chunks, columns: List[str], filters: List[Tuple[str, str, Any]], estimate: float,
+                    budget, allow_sampling: bool = False) -> List[pd.DataFrame]:
+    """
+    Filtre et projette des morceaux de lignes d'une source trop volumineuse pour le budget mémoire.
+    Si le résultat ne tient toujours pas dans le budget, lève une MemoryError, ou échantillonne les
+    lignes si `allow_sampling`.
+    """
+    rng = np.random.default_rng(budget.random_state)
+    fraction = None
+    kept_bytes = 0
+    frames = []
+    for chunk in chunks:
+        kept = _apply_filters(chunk, filters)
+        if columns is not None:
+            kept = kept[list(columns)]
+        if fraction is None:
+            # La sélectivité des filtres est estimée sur le premier morceau
+            selectivity = len(kept) / max(len(chunk), 1)
+            fraction = min(1.0, budget.limit_bytes / max(estimate * selectivity, 1)) if allow_sampling else 1.0
+            if fraction < 1.0:
+                logger.warning(f"Chargement de {source} : échantillon de {fraction:.1%} des lignes "
+                               f"(les rendez-vous (iid, pid) ne sont plus tous appariés)")
+            logger.info(f"Chargement de {source} par morceaux ({budget.chunk_rows} lignes par morceau)")
+        if fraction < 1.0:
+            kept = kept[rng.random(len(kept)) < fraction]
+        kept_bytes += kept.memory_usage(index=False, deep=True).sum()
+        if not allow_sampling and kept_bytes > budget.limit_bytes:
+            raise MemoryError(f"Chargement de {source} : plus de {kept_bytes / MB:.1f} Mo après projection et "
+                              f"filtrage, au-delà du budget de {budget.limit_bytes / MB:.1f} Mo. Restreindre "
+                              f"`columns` ou `filters`, ou accepter un échantillon (allow_sampling=True).")
+        frames.append(kept)
+    return frames
+
+def _load_csv_chunked(file_path: str, encoding: str, usecols: List[str], columns: List[str],
+                      filters: List[Tuple[str, str, Any]], estimate: float, budget,
+                      allow_sampling: bool = False) -> pd.DataFrame:
+    """Lit par morceaux un CSV trop volumineux pour le budget mémoire (voir `_collect_chunks`)."""
+    chunks = pd.read_csv(file_path, encoding=encoding, usecols=usecols, chunksize=budget.chunk_rows)
+    frames = _collect_chunks(file_path, chunks, columns, filters, estimate, budget, allow_sampling)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=usecols)
+
+def load_data(file_path: str, encoding: str = "utf-8", columns: List[str] = None,
+              filters: List[Tuple[str, str, Any]] = None, allow_sampling: bool = False) -> pd.DataFrame:
     """
-    Charge les données depuis un fichier CSV.
+    Charge les données depuis un fichier CSV ou un dossier partitionné (voir `save_data`).
     
     Args:
-        file_path: Chemin vers le fichier CSV.
+        file_path: Chemin vers le fichier CSV ou le dossier partitionné.
+        encoding: Encodage du fichier.
+        columns: Colonnes à charger (toutes par défaut).
+        filters: Filtres (colonne, opérateur, valeur) combinés par ET, ex. [("wave", "in", [1, 2])].
+            Opérateurs : ==, !=, <, <=, >, >=, in, not in. Sur un dossier partitionné, les filtres
+            portant sur la colonne de partition évitent la lecture des partitions exclues.
+            Si l'empreinte estimée d'un CSV ou des partitions retenues dépasse le budget mémoire actif
+            (voir `src.utils.memory`), les fichiers sont lus par morceaux, filtrés et projetés au fil de l'eau.
+        allow_sampling: Si le résultat filtré et projeté dépasse encore le budget, retourne un
+            échantillon aléatoire de lignes au lieu de lever une MemoryError (l'échantillon sépare
+            les deux lignes (iid, pid) et (pid, iid) d'une même rencontre).
         
     Returns:
         DataFrame contenant les données.
         
     Raises:
         FileNotFoundError: Si le fichier n'existe pas.
+        MemoryError: Si les données filtrées et projetées dépassent le budget mémoire et que allow_sampling est False.
     """
     if not os.path.exists(file_path):
         logger.error(f"Fichier de données {file_path} non trouvé.")
         raise FileNotFoundError(f"Fichier de données {file_path} non trouvé.")
+
+    if os.path.isdir(file_path):
+        if not os.path.exists(os.path.join(file_path, SCHEMA_FILE)):
+            logger.error(f"Dossier {file_path} sans schéma de partitionnement.")
+            raise ValueError(f"Dossier {file_path} sans schéma de partitionnement.")
+        df = _load_partitioned(file_path, encoding, columns, filters, allow_sampling)
+        logger.info(f"Données chargées depuis {file_path}: {df.shape[0]} lignes, {df.shape[1]} colonnes")
+        return df
     
     # Déterminer l'extension du fichier
     _, ext = os.path.splitext(file_path)
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys(list(columns) + [flt[0] for flt in filters or []]))
     
     if ext.lower() == '.csv':
-        df = pd.read_csv(file_path, encoding=encoding)
+        budget = get_memory_budget()
+        estimate = estimate_csv_bytes(file_path, encoding, usecols).sum() if budget.active else 0
+        with track_peak(f"Chargement de {file_path}"):
+            if budget.fits(f"Chargement de {file_path}", estimate):
+                df = pd.read_csv(file_path, encoding=encoding, usecols=usecols)
+            else:
+                df = _load_csv_chunked(file_path, encoding, usecols, columns, filters, estimate, budget, allow_sampling)
+                filters = None
     elif ext.lower() in ['.xls', '.xlsx']:
-        df = pd.read_excel(file_path)
+        df = pd.read_excel(file_path, usecols=usecols)
     else:
         logger.error(f"Format de fichier non supporté: {ext}")
         raise ValueError(f"Format de fichier non supporté: {ext}")
+
+    if filters:
+        df = _apply_filters(df, filters).reset_index(drop=True)
+    if columns is not None:
+        df = df[list(columns)]
     
     logger.info(f"Données chargées depuis {file_path}: {df.shape[0]} lignes, {df.shape[1]} colonnes")
     return df
 
-def save_data(df: pd.DataFrame, file_path: str, index: bool = False) -> None:
+def _save_partitioned(df: pd.DataFrame, dir_path: str, partition_by: str, mode: str) -> None:
+    """Écrit un DataFrame en un fichier CSV par partition, sans toucher aux autres partitions."""
+    if mode not in ("overwrite", "append"):
+        raise ValueError(f"Mode d'écriture non supporté: {mode}")
+    os.makedirs(dir_path, exist_ok=True)
+    schema_path = os.path.join(dir_path, SCHEMA_FILE)
+    schema = {
+        "partition_by": partition_by,
+        "columns": list(df.columns),
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+    }
+    if os.path.exists(schema_path):
+        with open(schema_path, 'r') as f:
+            existing = json.load(f)
+        if existing["partition_by"] != partition_by or existing["columns"] != schema["columns"]:
+            logger.error(f"Schéma incompatible avec le dossier partitionné {dir_path}")
+            raise ValueError(f"Schéma incompatible avec le dossier partitionné {dir_path}")
+        schema = existing
+    with open(schema_path, 'w') as f:
+        json.dump(schema, f, indent=4)
+
+    for value, part in df.groupby(partition_by, dropna=False, sort=True):
+        raw = NULL_PARTITION if pd.isna(value) else str(value)
+        part_dir = os.path.join(dir_path, f"{partition_by}={raw}")
+        os.makedirs(part_dir, exist_ok=True)
+        existing_parts = sorted(glob.glob(os.path.join(part_dir, "part-*.csv")))
+        if mode == "overwrite":
+            for part_file in existing_parts:
+                os.remove(part_file)
+            existing_parts = []
+        part_file = os.path.join(part_dir, f"part-{len(existing_parts):05d}.csv")
+        part.drop(columns=partition_by).to_csv(part_file, index=False)
+
+def save_data(df: pd.DataFrame, file_path: str, index: bool = False, partition_by: str = None,
+              mode: str = "overwrite") -> None:
     """
-    Sauvegarde un DataFrame dans un fichier CSV.
+    Sauvegarde un DataFrame dans un fichier CSV, ou dans un dossier partitionné.
+    
+    Avec `partition_by` (ex. "wave"), `file_path` est un dossier contenant un sous-dossier
+    `<colonne>=<valeur>` par partition. Seules les partitions présentes dans `df` sont écrites :
+    ajouter une nouvelle vague ne réécrit pas les vagues existantes.
     
     Args:
         df: DataFrame à sauvegarder.
-        file_path: Chemin pour sauvegarder le fichier.
-        index: Si True, sauvegarde les index.
+        file_path: Chemin pour sauvegarder le fichier (ou le dossier partitionné).
+        index: Si True, sauvegarde les index (non supporté avec `partition_by`).
+        partition_by: Colonne de partitionnement (optionnelle).
+        mode: "overwrite" remplace les partitions écrites, "append" leur ajoute un fichier.
+
+    Raises:
+        ValueError: Si `index` est demandé avec `partition_by`.
     """
+    if partition_by is not None:
+        if index:
+            logger.error("L'index n'est pas sauvegardé dans un dossier partitionné.")
+            raise ValueError("L'index n'est pas sauvegardé dans un dossier partitionné : utiliser df.reset_index().")
+        _save_partitioned(df, file_path, partition_by, mode)
+        logger.info(f"Données sauvegardées dans {file_path} (partitionnées par {partition_by})")
+        return
+
     # Créer le répertoire si nécessaire
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     
@@ -147,6 +380,45 @@ def save_metrics(metrics: Dict[str, Any], metrics_path: str) -> None:
     
     logger.info(f"Métriques sauvegardées dans {metrics_path}")
 
+def save_json(data: Any, json_path: str) -> None:
+    """
+    Sauvegarde un objet sérialisable au format JSON.
+    
+    Args:
+        data: Objet à sauvegarder (dict, liste...).
+        json_path: Chemin du fichier JSON.
+    """
+    # Créer le répertoire si nécessaire
+    os.makedirs(os.path.dirname(json_path), exist_ok=True)
+    
+    with open(json_path, 'w') as f:
+        json.dump(data, f, indent=4)
+    
+    logger.info(f"JSON sauvegardé dans {json_path}")
+
+def load_json(json_path: str) -> Any:
+    """
+    Charge un fichier JSON.
+    
+    Args:
+        json_path: Chemin du fichier JSON.
+        
+    Returns:
+        L'objet chargé.
+        
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas.
+    """
+    if not os.path.exists(json_path):
+        logger.error(f"Fichier JSON {json_path} non trouvé.")
+        raise FileNotFoundError(f"Fichier JSON {json_path} non trouvé.")
+    
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    
+    logger.info(f"JSON chargé depuis {json_path}")
+    return data
+
 def ensure_dir(directory: str) -> None:
     """
     Crée un répertoire s'il n'existe pas.
@@ -0,0 +1,200 @@
+"""
+Module pour le mode « budget mémoire ».
+Contient le budget actif (lu depuis la section `memory` de la configuration), l'estimation de
+l'empreinte des colonnes à partir des types et du nombre de lignes, et la mesure du pic mémoire
+d'une étape. Les fonctions d'entrées/sorties et d'analyse consultent le budget avant une étape
+coûteuse et basculent, si elle ne tient pas, vers la projection des colonnes, un calcul par
+morceaux ou un échantillonnage ; la décision et le pic mesuré sont journalisés.
+"""
+import os
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List
+import numpy as np
+import pandas as pd
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MB = 1024 ** 2
+# Taille moyenne supposée d'une valeur texte (objet Python + pointeur) quand aucun échantillon n'est disponible
+DEFAULT_OBJECT_BYTES = 64
+
+
+class MemoryBudget:
+    """
+    Budget mémoire des étapes coûteuses.
+
+    Attributes:
+        limit_mb: Mémoire disponible pour une étape, en Mo (None : pas de limite).
+        chunk_rows: Nombre de lignes par morceau pour les calculs par morceaux.
+        random_state: Graine des échantillonnages.
+    """
+
+    def __init__(self, limit_mb: float = None, chunk_rows: int = 100000, random_state: int = None):
+        self.limit_mb = limit_mb
+        self.chunk_rows = chunk_rows
+        self.random_state = random_state
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "MemoryBudget":
+        """
+        Construit le budget depuis la configuration du projet.
+
+        Args:
+            config (Dict[str, Any]): Configuration (voir `load_config`).
+
+        Returns:
+            MemoryBudget: Le budget.
+        """
+        memory = config.get("memory") or {}
+        return cls(limit_mb=memory.get("limit_mb"), chunk_rows=memory.get("chunk_rows", 100000),
+                   random_state=memory.get("random_state"))
+
+    @property
+    def limit_bytes(self) -> float:
+        return np.inf if self.limit_mb is None else self.limit_mb * MB
+
+    @property
+    def active(self) -> bool:
+        return self.limit_mb is not None
+
+    def fits(self, step: str, required_bytes: float) -> bool:
+        """Indique si une étape tient dans le budget, et journalise la décision si elle ne tient pas."""
+        if required_bytes <= self.limit_bytes:
+            return True
+        logger.info(f"{step}: {required_bytes / MB:.1f} Mo estimés pour un budget de {self.limit_mb:.1f} Mo")
+        return False
+
+
+_ACTIVE_BUDGET: ContextVar[MemoryBudget] = ContextVar("memory_budget", default=MemoryBudget())
+
+
+def get_memory_budget() -> MemoryBudget:
+    """Retourne le budget mémoire actif."""
+    return _ACTIVE_BUDGET.get()
+
+
+def set_memory_budget(budget: MemoryBudget) -> None:
+    """Définit le budget mémoire actif (ex. `MemoryBudget.from_config(config)`)."""
+    _ACTIVE_BUDGET.set(budget)
+
+
+@contextmanager
+def memory_budget(budget: MemoryBudget) -> Iterator[MemoryBudget]:
+    """Active un budget mémoire le temps d'un bloc."""
+    token = _ACTIVE_BUDGET.set(budget)
+    try:
+        yield budget
+    finally:
+        _ACTIVE_BUDGET.reset(token)
+
+
+def _value_bytes(dtype, sample: pd.Series = None) -> float:
+    """Taille d'une valeur d'un type (mesurée sur un échantillon pour les colonnes texte)."""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return dtype.categories.dtype.itemsize if dtype.categories.dtype != object else 8
+    if dtype == object or pd.api.types.is_string_dtype(dtype):
+        if sample is not None and len(sample):
+            return sample.memory_usage(deep=True, index=False) / len(sample)
+        return DEFAULT_OBJECT_BYTES
+    return np.dtype(dtype).itemsize
+
+
+def estimate_column_bytes(df: pd.DataFrame, n_rows: int = None, sample_rows: int = 1000) -> pd.Series:
+    """
+    Estime l'empreinte de chaque colonne : taille du type × nombre de lignes, la taille des
+    valeurs texte étant mesurée sur les premières lignes.
+
+    Args:
+        df (pd.DataFrame): Données (ou échantillon de lignes).
+        n_rows (int, optional): Nombre de lignes à considérer (par défaut celui de `df`).
+        sample_rows (int): Taille de l'échantillon des colonnes texte.
+
+    Returns:
+        pd.Series: Octets estimés par colonne.
+    """
+    n_rows = len(df) if n_rows is None else n_rows
+    head = df.head(sample_rows)
+    return pd.Series({col: _value_bytes(df[col].dtype, head[col]) * n_rows for col in df.columns}, dtype=float)
+
+
+def estimate_csv_bytes(file_path: str, encoding: str = "utf-8", usecols: List[str] = None,
+                       sample_rows: int = 1000) -> pd.Series:
+    """
+    Estime l'empreinte en mémoire d'un fichier CSV sans le charger, à partir de ses premières
+    lignes (types, taille des textes) et du nombre de lignes extrapolé de la taille du fichier.
+
+    Args:
+        file_path (str): Chemin du fichier CSV.
+        encoding (str): Encodage du fichier.
+        usecols (List[str], optional): Colonnes qui seront chargées.
+        sample_rows (int): Nombre de lignes lues.
+
+    Returns:
+        pd.Series: Octets estimés par colonne.
+    """
+    sample = pd.read_csv(file_path, encoding=encoding, usecols=usecols, nrows=sample_rows)
+    with open(file_path, "rb") as f:
+        lines = [f.readline() for _ in range(sample_rows + 1)]
+    sample_size = sum(len(line) for line in lines[1:])
+    n_lines = sum(1 for line in lines[1:] if line)
+    if n_lines < sample_rows:
+        n_rows = len(sample)
+    else:
+        n_rows = int((os.path.getsize(file_path) - len(lines[0])) / max(sample_size / n_lines, 1))
+    return estimate_column_bytes(sample, n_rows=n_rows)
+
+
+def sample_to_budget(df: pd.DataFrame, step: str, overhead: float = 1.0, budget: MemoryBudget = None) -> pd.DataFrame:
+    """
+    Échantillonne les lignes d'un DataFrame si l'étape (ex. un graphique) dépasse le budget.
+
+    Args:
+        df (pd.DataFrame): Données.
+        step (str): Nom de l'étape (journalisation).
+        overhead (float): Mémoire de l'étape rapportée à l'empreinte de `df`.
+        budget (MemoryBudget, optional): Budget (par défaut le budget actif).
+
+    Returns:
+        pd.DataFrame: `df` lui-même, ou un échantillon qui tient dans le budget.
+    """
+    budget = budget if budget is not None else get_memory_budget()
+    required = estimate_column_bytes(df).sum() * overhead
+    if budget.fits(step, required):
+        return df
+    n_rows = max(int(len(df) * budget.limit_bytes / required), 1)
+    logger.info(f"{step}: échantillonnage de {n_rows} lignes sur {len(df)}")
+    return df.sample(n=n_rows, random_state=budget.random_state)
+
+
+@contextmanager
+def track_peak(step: str) -> Iterator[Dict[str, float]]:
+    """
+    Mesure le pic mémoire (allocations Python et numpy) d'une étape et le journalise.
+
+    La mesure n'est faite que si un budget est actif ; dans un bloc déjà mesuré, le pic
+    rapporté est celui du bloc englobant depuis son début.
+
+    Yields:
+        Dict[str, float]: Renseigné en sortie avec "peak_mb".
+    """
+    measure = {"peak_mb": np.nan}
+    if not get_memory_budget().active:
+        yield measure
+        return
+    owner = not tracemalloc.is_tracing()
+    if owner:
+        tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    try:
+        yield measure
+    finally:
+        measure["peak_mb"] = (tracemalloc.get_traced_memory()[1] - start) / MB
+        if owner:
+            tracemalloc.stop()
+        logger.info(f"{step}: pic mémoire mesuré {measure['peak_mb']:.1f} Mo")
@@ -0,0 +1,298 @@
+"""
+Module pour la sortie des figures.
+Contient l'abstraction commune utilisée par toutes les fonctions de visualisation : par défaut
+les figures sont écrites sur disque ; dans un bloc `capture_figures`, elles sont capturées en
+mémoire (octets encodés ou objets Figure) sans aucune écriture.
+Le profil de rendu (dpi, format, taille, mode vignette) est lu depuis la section `visualization`
+de la configuration.
+"""
+import io
+import functools
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+OUTPUT_MODES = ["bytes", "figure"]
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".svg", ".svgz", ".pdf", ".eps", ".ps", ".tif", ".tiff", ".webp"}
+
+
+class RenderProfile:
+    """
+    Paramètres de rendu partagés par toutes les fonctions de visualisation.
+
+    Attributes:
+        dpi: Résolution des images (None : valeur par défaut de matplotlib).
+        figsize: Taille des figures à un seul graphique (None : taille propre à chaque fonction).
+        save_format: Format des images (ex. "png").
+        vector_format: Format utilisé pour les graphiques à base de courbes (ex. "svgz"), ou None.
+        thumbnail: Si True, rendu rapide en basse résolution ; les entrées des graphiques sont
+            conservées pour un rendu pleine résolution à la demande (`render_full_resolution`).
+        thumbnail_dpi: Résolution des vignettes.
+    """
+
+    def __init__(self, dpi: int = None, figsize: Tuple[float, float] = None, save_format: str = "png",
+                 vector_format: str = None, thumbnail: bool = False, thumbnail_dpi: int = 40):
+        self.dpi = dpi
+        self.figsize = tuple(figsize) if figsize is not None else None
+        self.save_format = save_format
+        self.vector_format = vector_format
+        self.thumbnail = thumbnail
+        self.thumbnail_dpi = thumbnail_dpi
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], thumbnail: bool = False) -> "RenderProfile":
+        """
+        Construit le profil depuis la configuration du projet.
+
+        Args:
+            config (Dict[str, Any]): Configuration (voir `load_config`).
+            thumbnail (bool): Active le mode vignette.
+
+        Returns:
+            RenderProfile: Le profil de rendu.
+        """
+        visualization = config.get("visualization", {})
+        return cls(dpi=visualization.get("dpi"), figsize=visualization.get("figsize"),
+                   save_format=visualization.get("save_format", "png"),
+                   vector_format=visualization.get("vector_format"), thumbnail=thumbnail,
+                   thumbnail_dpi=visualization.get("thumbnail_dpi", 40))
+
+    def full_resolution(self) -> "RenderProfile":
+        """Copie du profil avec le mode vignette désactivé."""
+        return RenderProfile(self.dpi, self.figsize, self.save_format, self.vector_format, False, self.thumbnail_dpi)
+
+    def format_for(self, kind: str) -> str:
+        """Format de sortie d'un graphique ("line" pour les graphiques à base de courbes)."""
+        return self.vector_format if kind == "line" and self.vector_format else self.save_format
+
+    @property
+    def output_dpi(self) -> Optional[int]:
+        return self.thumbnail_dpi if self.thumbnail else self.dpi
+
+
+_ACTIVE_PROFILE: ContextVar[RenderProfile] = ContextVar("render_profile", default=RenderProfile())
+_CURRENT_CALL: ContextVar[Optional[tuple]] = ContextVar("current_plot_call", default=None)
+# Nombre maximal de graphiques conservés pour le rendu pleine résolution (les moins récents sont oubliés)
+RENDER_CACHE_SIZE = 64
+# (dossier, nom de fichier) -> (fonction, args, kwargs) des graphiques rendus en mode vignette (LRU)
+_RENDER_CACHE: "OrderedDict[Tuple[Optional[str], str], tuple]" = OrderedDict()
+
+
+def get_render_profile() -> RenderProfile:
+    """Retourne le profil de rendu actif."""
+    return _ACTIVE_PROFILE.get()
+
+
+def set_render_profile(profile: RenderProfile) -> None:
+    """Définit le profil de rendu actif (ex. `RenderProfile.from_config(config)`)."""
+    _ACTIVE_PROFILE.set(profile)
+
+
+@contextmanager
+def render_profile(profile: RenderProfile) -> Iterator[RenderProfile]:
+    """Active un profil de rendu le temps d'un bloc."""
+    token = _ACTIVE_PROFILE.set(profile)
+    try:
+        yield profile
+    finally:
+        _ACTIVE_PROFILE.reset(token)
+
+
+def resolve_figsize(figsize: Optional[Tuple[float, float]], default: Tuple[float, float]) -> Tuple[float, float]:
+    """Taille explicite, sinon celle du profil actif, sinon la taille propre à la fonction."""
+    if figsize is not None:
+        return figsize
+    return get_render_profile().figsize or default
+
+
+def renderable(func: Callable) -> Callable:
+    """
+    Décorateur des fonctions de visualisation : en mode vignette, leurs entrées sont conservées
+    afin de pouvoir re-rendre chaque figure en pleine résolution à la demande.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _CURRENT_CALL.set((func, args, kwargs))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _CURRENT_CALL.reset(token)
+    return wrapper
+
+
+class FigureSink:
+    """
+    Collecteur des figures produites dans un bloc `capture_figures`.
+
+    Les figures sont indexées par le nom de fichier qu'elles auraient eu sur disque
+    (ex. "Heatmap_correlation.png").
+    """
+
+    def __init__(self, mode: str = "bytes", fmt: str = None, **savefig_kwargs):
+        if mode not in OUTPUT_MODES:
+            raise ValueError(f"Mode de sortie non supporté: {mode}")
+        self.mode = mode
+        self.fmt = fmt
+        self.savefig_kwargs = savefig_kwargs
+        self.figures: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        return self.figures[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.figures
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.figures)
+
+    def __len__(self) -> int:
+        return len(self.figures)
+
+    def add(self, name: str, fig: Figure, fmt: str, **savefig_kwargs) -> None:
+        """Encode (mode "bytes") ou conserve (mode "figure") une figure."""
+        if self.mode == "figure":
+            self.figures[name] = fig
+            return
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, **{**savefig_kwargs, **self.savefig_kwargs})
+        self.figures[name] = buffer.getvalue()
+
+
+_ACTIVE_SINK: ContextVar[Optional[FigureSink]] = ContextVar("figure_sink", default=None)
+
+
+@contextmanager
+def capture_figures(mode: str = "bytes", fmt: str = None, **savefig_kwargs) -> Iterator[FigureSink]:
+    """
+    Capture en mémoire les figures produites dans le bloc au lieu de les écrire sur disque.
+
+    Args:
+        mode (str): "bytes" (image encodée) ou "figure" (objet Figure, sans encodage).
+        fmt (str, optional): Format d'encodage en mode "bytes" (par défaut celui du profil de rendu).
+        **savefig_kwargs: Paramètres supplémentaires de `Figure.savefig`.
+
+    Yields:
+        FigureSink: Les figures capturées, indexées par nom de fichier.
+    """
+    sink = FigureSink(mode, fmt, **savefig_kwargs)
+    token = _ACTIVE_SINK.set(sink)
+    try:
+        yield sink
+    finally:
+        _ACTIVE_SINK.reset(token)
+
+
+def _file_name(file_name: str, fmt: str) -> str:
+    """Nom de fichier avec l'extension du format (ajoutée si absente, remplacée sinon)."""
+    path = Path(file_name)
+    stem = path.stem if path.suffix.lower() in IMAGE_SUFFIXES else path.name
+    return f"{stem}.{fmt}"
+
+
+def save_figure(directory: Optional[str], file_name: str, fig: Figure = None, kind: str = "raster", **savefig_kwargs) -> None:
+    """
+    Sort une figure selon le mode et le profil de rendu actifs, puis la ferme.
+
+    Hors d'un bloc `capture_figures`, la figure est écrite dans `directory / file_name` ;
+    sans dossier, elle est simplement fermée.
+
+    Args:
+        directory (str, optional): Dossier de sauvegarde.
+        file_name (str): Nom du fichier (l'extension suit le format du profil).
+        fig (Figure, optional): Figure à sortir (par défaut la figure courante).
+        kind (str): "line" pour les graphiques à base de courbes (format vectoriel du profil), "raster" sinon.
+        **savefig_kwargs: Paramètres de `Figure.savefig` (ex. bbox_inches).
+    """
+    fig = fig if fig is not None else plt.gcf()
+    profile = get_render_profile()
+    sink = _ACTIVE_SINK.get()
+    fmt = sink.fmt if sink is not None and sink.fmt else profile.format_for(kind)
+    name = _file_name(file_name, fmt)
+    if profile.output_dpi is not None:
+        savefig_kwargs.setdefault("dpi", profile.output_dpi)
+    call = _CURRENT_CALL.get()
+    if profile.thumbnail and call is not None:
+        key = (str(directory) if directory is not None else None, name)
+        _RENDER_CACHE[key] = call
+        _RENDER_CACHE.move_to_end(key)
+        while len(_RENDER_CACHE) > RENDER_CACHE_SIZE:
+            _RENDER_CACHE.popitem(last=False)
+
+    if sink is not None:
+        sink.add(name, fig, fmt, **savefig_kwargs)
+    elif directory is None:
+        logger.warning(f"Aucun dossier de sauvegarde pour {file_name}, figure ignorée.")
+    else:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        fig.savefig(Path(directory) / name, format=fmt, **savefig_kwargs)
+    # La fermeture retire la figure de pyplot ; l'objet Figure capturé reste utilisable
+    plt.close(fig)
+
+
+def _cache_key(file_name: str, figures_path: Optional[str]) -> Tuple[Optional[str], str]:
+    """Clé du graphique conservé : dossier explicite, sinon l'unique vignette de ce nom."""
+    if figures_path is not None:
+        return str(figures_path), file_name
+    keys = [key for key in _RENDER_CACHE if key[1] == file_name]
+    if len(keys) > 1:
+        raise KeyError(f"Plusieurs vignettes {file_name} rendues ({[key[0] for key in keys]}) : préciser figures_path")
+    return keys[0] if keys else (None, file_name)
+
+
+def render_full_resolution(file_name: str, directory: str = None, figures_path: str = None) -> bytes:
+    """
+    Re-rend en pleine résolution une figure produite en mode vignette, à partir de ses entrées conservées.
+
+    Seuls les RENDER_CACHE_SIZE derniers graphiques sont conservés ; `clear_render_cache` libère
+    les données qu'ils référencent.
+
+    Args:
+        file_name (str): Nom du fichier de la vignette (ex. "Heatmap_correlation.png").
+        directory (str, optional): Si fourni, la figure pleine résolution y est aussi écrite.
+        figures_path (str, optional): Dossier dans lequel la vignette a été rendue (nécessaire si
+            plusieurs vignettes portent ce nom).
+
+    Returns:
+        bytes: L'image encodée en pleine résolution.
+
+    Raises:
+        KeyError: Si aucune vignette de ce nom n'est conservée.
+    """
+    key = _cache_key(file_name, figures_path)
+    if key not in _RENDER_CACHE:
+        raise KeyError(f"Aucune vignette rendue sous le nom {file_name}")
+    _RENDER_CACHE.move_to_end(key)
+    func, args, kwargs = _RENDER_CACHE[key]
+    fmt = Path(file_name).suffix.lstrip(".")
+    with render_profile(get_render_profile().full_resolution()):
+        with capture_figures(fmt=fmt) as sink:
+            func(*args, **kwargs)
+    image = sink[file_name]
+    if directory is not None:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        (Path(directory) / file_name).write_bytes(image)
+    return image
+
+
+def clear_render_cache(figures_path: str = None) -> None:
+    """
+    Oublie les entrées conservées des graphiques rendus en mode vignette.
+
+    Args:
+        figures_path (str, optional): Ne retire que les graphiques rendus dans ce dossier.
+    """
+    if figures_path is None:
+        _RENDER_CACHE.clear()
+        return
+    for key in [key for key in _RENDER_CACHE if key[0] == str(figures_path)]:
+        del _RENDER_CACHE[key]
@@ -0,0 +1,296 @@
+"""
+Module pour le tableau de bord interactif local.
+Contient le précalcul (une seule fois, avec cache disque) des agrégats servis au tableau de bord
+— histogrammes, matrice de corrélation, tableaux croisés — et un petit serveur HTTP local qui
+les transmet à plotly. Aucune ligne brute n'est envoyée au navigateur.
+"""
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from itertools import combinations
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, List
+
+from src.analysis.contingency import ContingencyEngine
+from src.analysis.correlation import correlation_matrix
+from src.utils.io import save_model, load_model, save_json, load_json
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+_PAGE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>Speed Dating - tableau de bord</title>
+<script src="/plotly.min.js"></script>
+<style>body { font-family: sans-serif; margin: 20px; } .panel { margin-bottom: 30px; }</style>
+</head>
+<body>
+<h1>Speed Dating - tableau de bord</h1>
+<div class="panel">
+  <label>Histogramme : <select id="hist-col"></select></label>
+  <div id="hist"></div>
+</div>
+<div class="panel">
+  <label>Tableau croisé : <select id="ct-col1"></select> <select id="ct-col2"></select></label>
+  <div id="crosstab"></div>
+</div>
+<div class="panel">
+  <label>Corrélations : <select id="corr-cols" multiple size="8"></select></label>
+  <div id="corr"></div>
+</div>
+<script>
+function draw(div, url) {
+  fetch(url).then(r => r.json()).then(fig => Plotly.react(div, fig.data, fig.layout));
+}
+function fill(select, values) {
+  values.forEach(v => { const o = document.createElement("option"); o.value = o.text = v; select.add(o); });
+}
+fetch("/api/meta").then(r => r.json()).then(meta => {
+  const hist = document.getElementById("hist-col");
+  const ct1 = document.getElementById("ct-col1"), ct2 = document.getElementById("ct-col2");
+  const corr = document.getElementById("corr-cols");
+  fill(hist, meta.numeric); fill(ct1, meta.categorical); fill(ct2, meta.categorical); fill(corr, meta.numeric);
+  if (meta.categorical.length > 1) ct2.selectedIndex = 1;
+  Array.from(corr.options).slice(0, 10).forEach(o => o.selected = true);
+  const drawHist = () => draw("hist", "/api/histogram?column=" + encodeURIComponent(hist.value));
+  const drawCt = () => draw("crosstab", "/api/crosstab?col1=" + encodeURIComponent(ct1.value) + "&col2=" + encodeURIComponent(ct2.value));
+  const drawCorr = () => draw("corr", "/api/correlation?columns=" + Array.from(corr.selectedOptions).map(o => encodeURIComponent(o.value)).join(","));
+  hist.onchange = drawHist; ct1.onchange = drawCt; ct2.onchange = drawCt; corr.onchange = drawCorr;
+  if (meta.numeric.length) { drawHist(); drawCorr(); }
+  if (meta.categorical.length > 1) drawCt();
+});
+</script>
+</body>
+</html>
+"""
+
+
+class DashboardAggregates:
+    """
+    Agrégats précalculés servis au tableau de bord.
+
+    Attributes:
+        histograms: Pour chaque colonne numérique, effectifs et bornes des classes.
+        correlation: Matrice de corrélation des colonnes numériques.
+        crosstabs: Tableaux croisés de chaque couple de colonnes qualitatives.
+        n_rows: Nombre de lignes agrégées.
+    """
+
+    def __init__(self, histograms: Dict[str, tuple], correlation: pd.DataFrame, crosstabs: Dict[tuple, pd.DataFrame], n_rows: int):
+        self.histograms = histograms
+        self.correlation = correlation
+        self.crosstabs = crosstabs
+        self.n_rows = n_rows
+
+    @property
+    def numeric_columns(self) -> List[str]:
+        return list(self.histograms)
+
+    @property
+    def categorical_columns(self) -> List[str]:
+        return sorted({col for pair in self.crosstabs for col in pair})
+
+
+def compute_dashboard_aggregates(df: pd.DataFrame, numeric_cols: List[str] = None, categorical_cols: List[str] = None,
+                                 bins: int = 30, max_categories: int = 30) -> DashboardAggregates:
+    """
+    Calcule les agrégats du tableau de bord en une seule passe par type d'agrégat.
+
+    Args:
+        df (pd.DataFrame): Données brutes.
+        numeric_cols (List[str], optional): Colonnes numériques (par défaut toutes).
+        categorical_cols (List[str], optional): Colonnes qualitatives (par défaut object/category,
+            et numériques à au plus 10 modalités).
+        bins (int): Nombre de classes des histogrammes.
+        max_categories (int): Nombre maximal de modalités conservées par colonne dans les tableaux croisés.
+
+    Returns:
+        DashboardAggregates: Agrégats prêts à être servis.
+    """
+    if numeric_cols is None:
+        numeric_cols = list(df.select_dtypes(include=['float', 'int']).columns)
+    if categorical_cols is None:
+        categorical_cols = list(df.select_dtypes(include=['object', 'category']).columns)
+        categorical_cols += [col for col in numeric_cols if df[col].nunique() <= 10]
+
+    histograms = {}
+    for col in numeric_cols:
+        values = df[col].dropna().to_numpy(dtype=float)
+        if len(values):
+            histograms[col] = np.histogram(values, bins=bins)
+    # Calcul direct ou par morceaux selon le budget mémoire actif
+    correlation = correlation_matrix(df, list(histograms))
+
+    engine = ContingencyEngine(df)
+    crosstabs = {}
+    for col1, col2 in combinations(categorical_cols, 2):
+        table = engine.table(col1, col2)
+        top_rows = engine.counts(col1).index[:max_categories]
+        top_cols = engine.counts(col2).index[:max_categories]
+        crosstabs[(col1, col2)] = table.loc[table.index.isin(top_rows), table.columns.isin(top_cols)]
+    logger.info(f"Agrégats du tableau de bord: {len(histograms)} histogrammes, {len(crosstabs)} tableaux croisés")
+    return DashboardAggregates(histograms, correlation, crosstabs, len(df))
+
+
+def dashboard_fingerprint(df: pd.DataFrame, **kwargs) -> Dict[str, object]:
+    """Empreinte des données (dimensions, colonnes, hachage des valeurs) et des paramètres d'un calcul d'agrégats."""
+    return {
+        "shape": list(df.shape),
+        "columns": [str(col) for col in df.columns],
+        "hash": str(int(pd.util.hash_pandas_object(df, index=True).to_numpy().sum(dtype=np.uint64))),
+        "params": {key: repr(value) for key, value in sorted(kwargs.items())},
+    }
+
+
+def build_dashboard_aggregates(df: pd.DataFrame, cache_path: str = None, refresh: bool = False, **kwargs) -> DashboardAggregates:
+    """
+    Charge les agrégats depuis le cache disque, ou les calcule et les met en cache.
+
+    Le cache n'est réutilisé que si son empreinte (enregistrée à côté, `<cache_path>.fingerprint.json`)
+    correspond aux données et aux paramètres courants ; sinon les agrégats sont recalculés.
+
+    Args:
+        df (pd.DataFrame): Données brutes.
+        cache_path (str, optional): Fichier de cache des agrégats.
+        refresh (bool): Si True, recalcule même si le cache est à jour.
+        **kwargs: Paramètres de `compute_dashboard_aggregates`.
+
+    Returns:
+        DashboardAggregates: Agrégats prêts à être servis.
+    """
+    fingerprint = dashboard_fingerprint(df, **kwargs)
+    fingerprint_path = f"{cache_path}.fingerprint.json"
+    if cache_path is not None and os.path.exists(cache_path) and os.path.exists(fingerprint_path) and not refresh:
+        if load_json(fingerprint_path) == fingerprint:
+            return load_model(cache_path)
+        logger.info(f"Cache {cache_path} obsolète (données ou paramètres modifiés), recalcul des agrégats")
+    aggregates = compute_dashboard_aggregates(df, **kwargs)
+    if cache_path is not None:
+        save_model(aggregates, cache_path)
+        save_json(fingerprint, fingerprint_path)
+    return aggregates
+
+
+def histogram_figure(aggregates: DashboardAggregates, column: str) -> go.Figure:
+    """Figure plotly de l'histogramme précalculé d'une colonne."""
+    counts, edges = aggregates.histograms[column]
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), marker_color="skyblue"))
+    fig.update_layout(title=f"Distribution de {column}", xaxis_title=column, yaxis_title="Fréquence", bargap=0)
+    return fig
+
+
+def correlation_figure(aggregates: DashboardAggregates, columns: List[str]) -> go.Figure:
+    """Figure plotly d'un bloc de la matrice de corrélation précalculée."""
+    block = aggregates.correlation.loc[columns, columns]
+    fig = go.Figure(go.Heatmap(z=block.to_numpy(), x=columns, y=columns, colorscale="RdBu", zmin=-1, zmax=1, reversescale=True))
+    fig.update_layout(title="Matrice de corrélation")
+    return fig
+
+
+def crosstab_figure(aggregates: DashboardAggregates, col1: str, col2: str) -> go.Figure:
+    """Figure plotly d'un tableau croisé précalculé."""
+    if (col1, col2) in aggregates.crosstabs:
+        table = aggregates.crosstabs[(col1, col2)]
+    else:
+        table = aggregates.crosstabs[(col2, col1)].T
+    fig = go.Figure(go.Heatmap(z=table.to_numpy(), x=[str(c) for c in table.columns], y=[str(i) for i in table.index],
+                               colorscale="YlGnBu", texttemplate="%{z}"))
+    fig.update_layout(title=f"Tableau de contingence entre {col1} et {col2}", xaxis_title=col2, yaxis_title=col1)
+    return fig
+
+
+def _make_handler(aggregates: DashboardAggregates):
+    figure_cache: Dict[tuple, bytes] = {}
+    cache_lock = threading.Lock()
+
+    class DashboardHandler(BaseHTTPRequestHandler):
+        def _send(self, body: bytes, content_type: str, status: int = 200) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _figure(self, key: tuple, build) -> None:
+            with cache_lock:
+                body = figure_cache.get(key)
+            if body is None:
+                body = build().to_json().encode("utf-8")
+                with cache_lock:
+                    figure_cache[key] = body
+            self._send(body, "application/json")
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            try:
+                if url.path == "/":
+                    self._send(_PAGE.encode("utf-8"), "text/html; charset=utf-8")
+                elif url.path == "/plotly.min.js":
+                    self._send(get_plotlyjs().encode("utf-8"), "application/javascript")
+                elif url.path == "/api/meta":
+                    meta = {"numeric": aggregates.numeric_columns, "categorical": aggregates.categorical_columns,
+                            "n_rows": aggregates.n_rows}
+                    self._send(json.dumps(meta).encode("utf-8"), "application/json")
+                elif url.path == "/api/histogram":
+                    column = params["column"]
+                    self._figure(("histogram", column), lambda: histogram_figure(aggregates, column))
+                elif url.path == "/api/correlation":
+                    columns = tuple(c for c in params.get("columns", "").split(",") if c)
+                    self._figure(("correlation", columns), lambda: correlation_figure(aggregates, list(columns)))
+                elif url.path == "/api/crosstab":
+                    col1, col2 = params["col1"], params["col2"]
+                    self._figure(("crosstab", col1, col2), lambda: crosstab_figure(aggregates, col1, col2))
+                else:
+                    self._send(b"Not found", "text/plain", 404)
+            except KeyError as e:
+                self._send(json.dumps({"error": f"Agrégat inconnu: {e}"}).encode("utf-8"), "application/json", 400)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return DashboardHandler
+
+
+def create_dashboard_server(aggregates: DashboardAggregates, host: str = "127.0.0.1", port: int = 8050) -> ThreadingHTTPServer:
+    """
+    Crée le serveur HTTP local du tableau de bord (sans le démarrer).
+
+    Args:
+        aggregates (DashboardAggregates): Agrégats à servir.
+        host (str): Adresse d'écoute (locale par défaut).
+        port (int): Port d'écoute (0 pour un port libre).
+
+    Returns:
+        ThreadingHTTPServer: Le serveur.
+    """
+    return ThreadingHTTPServer((host, port), _make_handler(aggregates))
+
+
+def serve_dashboard(aggregates: DashboardAggregates, host: str = "127.0.0.1", port: int = 8050) -> None:
+    """
+    Démarre le tableau de bord local jusqu'à interruption (Ctrl+C).
+
+    Args:
+        aggregates (DashboardAggregates): Agrégats à servir.
+        host (str): Adresse d'écoute.
+        port (int): Port d'écoute.
+    """
+    server = create_dashboard_server(aggregates, host, port)
+    logger.info(f"Tableau de bord disponible sur http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
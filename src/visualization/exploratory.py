@@ -1,9 +1,18 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from src.visualization.quantitative import plot_correlation_matrix, plot_feature_distributions, plot_boxplots
 from src.visualization.qualitative import plot_bar_chart, plot_pie_chart, plot_contingency_heatmap
-from pathlib import Path
+from src.analysis.contingency import ContingencyEngine
+from src.utils.rendering import save_figure, renderable
+from typing import Dict, List
+
+import logging
+
+# Configuration globale du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 def explore_quantitative_data(df: pd.DataFrame, figures_path: str) -> None:
     """Explore les données quantitatives."""
@@ -22,24 +31,95 @@ def explore_qualitative_data(df: pd.DataFrame, figures_path: str) -> None:
     if object_cols.empty:
         print("Aucune donnée qualitative à explorer.")
         return
+    engine = ContingencyEngine(df)
     for col in object_cols:
-        plot_bar_chart(df, col, figures_path)
-        plot_pie_chart(df, col, figures_path)
+        plot_bar_chart(df, col, figures_path, counts=engine.counts(col))
+        plot_pie_chart(df, col, figures_path, counts=engine.counts(col))
     if len(object_cols) >= 2:
-        plot_contingency_heatmap(df, object_cols[0], object_cols[1], figures_path)
+        plot_contingency_heatmap(df, object_cols[0], object_cols[1], figures_path,
+                                 table=engine.table(object_cols[0], object_cols[1]))
+
+def grouped_box_stats(df: pd.DataFrame, numeric_cols: List[str], group_col: str, max_categories: int = 20,
+                      whis: float = 1.5) -> Dict[str, List[dict]]:
+    """
+    Calcule les statistiques de boîtes à moustaches de toutes les colonnes numériques par modalité.
+
+    La colonne de regroupement est factorisée une seule fois et les quartiles sont calculés
+    en un seul groupby pour toutes les colonnes numériques.
+
+    Args:
+        df (pd.DataFrame): DataFrame d'origine.
+        numeric_cols (List[str]): Colonnes quantitatives.
+        group_col (str): Colonne qualitative de regroupement.
+        max_categories (int): Nombre maximal de modalités conservées (les plus fréquentes).
+        whis (float): Longueur des moustaches en multiples de l'écart interquartile.
+
+    Returns:
+        Dict[str, List[dict]]: Pour chaque colonne numérique, la liste des statistiques au format `Axes.bxp`.
+    """
+    codes, uniques = pd.factorize(df[group_col], sort=True)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    kept = np.sort(np.argsort(-counts, kind="stable")[:max_categories])
+    if len(uniques) > max_categories:
+        logger.info(f"{group_col}: {max_categories} modalités affichées sur {len(uniques)}")
+    mask = np.isin(codes, kept)
+    values = df.loc[mask, numeric_cols].apply(pd.to_numeric, errors="coerce")
+    group = codes[mask]
 
-def explore_mixed_data(df: pd.DataFrame, figures_path: str) -> None:
-    """Analyse exploratoire mixte pour données quantitatives et qualitatives."""
+    grouped = values.groupby(group)
+    quartiles = grouped.quantile([0.25, 0.5, 0.75])
+    q1 = quartiles.xs(0.25, level=1)
+    med = quartiles.xs(0.5, level=1)
+    q3 = quartiles.xs(0.75, level=1)
+    iqr = q3 - q1
+    # Moustaches : valeurs extrêmes situées à l'intérieur des bornes, par groupe et par colonne
+    lower = (q1 - whis * iqr).reindex(group).to_numpy()
+    upper = (q3 + whis * iqr).reindex(group).to_numpy()
+    inside = values.where((values.to_numpy() >= lower) & (values.to_numpy() <= upper))
+    whislo = inside.groupby(group).min()
+    whishi = inside.groupby(group).max()
+    mean = grouped.mean()
+
+    stats = {}
+    for col in numeric_cols:
+        stats[col] = [
+            {"label": str(uniques[code]), "med": med.at[code, col], "q1": q1.at[code, col], "q3": q3.at[code, col],
+             "whislo": whislo.at[code, col], "whishi": whishi.at[code, col], "mean": mean.at[code, col]}
+            for code in med.index if not np.isnan(med.at[code, col])
+        ]
+    return stats
+
+
+@renderable
+def explore_mixed_data(df: pd.DataFrame, figures_path: str, max_categories: int = 20, max_panels: int = 12,
+                       ncols: int = 3) -> None:
+    """
+    Analyse exploratoire mixte pour données quantitatives et qualitatives.
+
+    Une grille de boîtes à moustaches (une case par colonne numérique) est tracée par colonne
+    qualitative, à partir des statistiques précalculées par `grouped_box_stats`.
+    """
     numeric_cols = df.select_dtypes(include=['float', 'int']).columns
     object_cols = df.select_dtypes(include=['object', 'category']).columns
-    if not numeric_cols.empty and not object_cols.empty:
-        for num_col in numeric_cols:
-            for obj_col in object_cols:
-                plt.figure(figsize=(10, 6))
-                sns.boxplot(x=obj_col, y=num_col, data=df, palette="Set3")
-                plt.title(f"Distribution de {num_col} par {obj_col}")
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                plt.savefig(Path(figures_path) / f"boxplot_{num_col}_by_{obj_col}.png")
-                plt.clf()
-                plt.close()
\ No newline at end of file
+    if numeric_cols.empty or object_cols.empty:
+        return
+    for obj_col in object_cols:
+        stats = grouped_box_stats(df, list(numeric_cols), obj_col, max_categories)
+        n_pages = int(np.ceil(len(numeric_cols) / max_panels))
+        for page in range(n_pages):
+            page_cols = numeric_cols[page * max_panels:(page + 1) * max_panels]
+            nrows = int(np.ceil(len(page_cols) / ncols))
+            fig, axes = plt.subplots(nrows, min(ncols, len(page_cols)), figsize=(5 * min(ncols, len(page_cols)), 4 * nrows),
+                                     squeeze=False)
+            for ax, num_col in zip(axes.flat, page_cols):
+                boxes = ax.bxp(stats[num_col], showfliers=False, patch_artist=True) if stats[num_col] else None
+                if boxes is not None:
+                    for patch, color in zip(boxes["boxes"], sns.color_palette("Set3", len(stats[num_col]))):
+                        patch.set_facecolor(color)
+                ax.set_title(f"Distribution de {num_col} par {obj_col}")
+                ax.tick_params(axis="x", labelrotation=45)
+            for ax in list(axes.flat)[len(page_cols):]:
+                ax.set_visible(False)
+            plt.tight_layout()
+            suffix = f"_{page + 1}" if n_pages > 1 else ""
+            save_figure(figures_path, f"boxplots_by_{obj_col}{suffix}.png")
@@ -7,7 +7,14 @@ import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 from scipy import stats
-from pathlib import Path
+
+from src.analysis.screening import screen_features, select_features
+from src.analysis.bootstrap import bootstrap_group_ci
+from src.analysis.outliers import OutlierScorer
+from src.data.reshape import TimeFamilies
+from src.analysis.correlation import correlation_matrix
+from src.utils.memory import sample_to_budget
+from src.utils.rendering import save_figure, renderable, resolve_figsize
 
 import logging
 
@@ -15,28 +22,28 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+@renderable
 def plot_correlation_matrix(df: pd.DataFrame, figures_path: str) -> pd.DataFrame:
-    """Trace la matrice de corrélation."""
-    corr_matrix = df.corr()
-    plt.figure(figsize=(12, 8))
+    """Trace la matrice de corrélation (calculée par morceaux si elle dépasse le budget mémoire)."""
+    corr_matrix = correlation_matrix(df)
+    plt.figure(figsize=resolve_figsize(None, (12, 8)))
     mask = np.triu(np.ones_like(corr_matrix, dtype=bool), k=1)
     sns.heatmap(corr_matrix, mask=mask, annot=True, cmap='coolwarm', fmt=".2f", 
                 annot_kws={"size": 8}, cbar_kws={"shrink": 0.8})
     plt.title("Matrice de corrélation", pad=20)
     plt.xticks(rotation=45)
     plt.tight_layout()
-    plt.savefig(Path(figures_path)/f"correlation_matrix.png")
-    plt.clf()
-    plt.close()
+    save_figure(figures_path, f"correlation_matrix.png")
 
     return corr_matrix
 
 
-def plot_feature_distributions(X: pd.DataFrame, figures_path: str) -> None:
-    """Trace les distributions des features."""
+@renderable
+def plot_feature_distributions(X: pd.DataFrame, figures_path: str, figsize: tuple = None) -> None:
+    """Trace les distributions des features (taille par défaut celle du profil de rendu, sinon (12, 4))."""
     for col in X.columns:
         # Double visualisation
-        fig, axs = plt.subplots(1, 2, figsize=(12, 4))
+        fig, axs = plt.subplots(1, 2, figsize=resolve_figsize(figsize, (12, 4)))
         
         # Histogramme + KDE
         sns.histplot(X[col], kde=True, ax=axs[0], color='skyblue')
@@ -47,18 +54,37 @@ def plot_feature_distributions(X: pd.DataFrame, figures_path: str) -> None:
         axs[1].set_title(f"QQ-Plot de {col}")
         
         plt.tight_layout()
-        plt.savefig(Path(figures_path)/f"{col}_distribution.png", bbox_inches='tight')
-        plt.clf()
-        plt.close()
+        # Histogramme et nuage de points : image matricielle (un format vectoriel stockerait chaque point)
+        save_figure(figures_path, f"{col}_distribution", bbox_inches='tight')
 
 
-def plot_feature_target_relations(X: pd.DataFrame, y: pd.DataFrame, figures_path: str, classification_threshold: int = 10) -> None:
-    """Trace les relations features-target."""
-    for target_col in y.columns:
-        target_type = 'classification' if (y[target_col].nunique() <= classification_threshold) else 'regression'
-        
-        for feature_col in X.columns:
-            plt.figure(figsize=(10, 6))
+@renderable
+def plot_feature_target_relations(X: pd.DataFrame, y: pd.DataFrame, figures_path: str, classification_threshold: int = 10,
+                                  top_k: int = None, importance_threshold: float = None, score: str = "mutual_info") -> pd.DataFrame:
+    """
+    Trace les relations features-target pour les features retenues par le criblage.
+
+    Sans `top_k` ni `importance_threshold`, toutes les features sont tracées.
+
+    Args:
+        X (pd.DataFrame): Features quantitatives.
+        y (pd.DataFrame): Variables cibles.
+        figures_path (str): Dossier de sauvegarde des figures.
+        classification_threshold (int): Nombre maximal de modalités pour traiter une cible en classification.
+        top_k (int, optional): Nombre de features tracées par cible.
+        importance_threshold (float, optional): Score minimal (ex. `features.importance_threshold`).
+        score (str): Score de criblage utilisé pour la sélection.
+
+    Returns:
+        pd.DataFrame: Classement des features par cible (colonne `selected`).
+    """
+    ranking = select_features(screen_features(X, y, classification_threshold), top_k, importance_threshold, score)
+    selected = ranking[ranking["selected"]]
+    logger.info(f"{len(selected)} relations features-target tracées sur {len(ranking)}")
+
+    for (target_col, target_type), rows in selected.groupby(["target", "task"], sort=False):
+        for feature_col in rows["feature"]:
+            plt.figure(figsize=resolve_figsize(None, (10, 6)))
             
             if target_type == 'classification':
                 # Violin plot pour classification
@@ -73,37 +99,58 @@ def plot_feature_target_relations(X: pd.DataFrame, y: pd.DataFrame, figures_path
                 plt.title(f"Relation {feature_col} vs {target_col}")
             
             plt.tight_layout()
-            plt.savefig(Path(figures_path)/f"relation_{feature_col}_vs_{target_col}.png", dpi=120)
-            plt.clf()
-            plt.close()
+            save_figure(figures_path, f"relation_{feature_col}_vs_{target_col}.png")
+
+    return ranking
 
 
+@renderable
 def analyse_multivariee_selective(df: pd.DataFrame, y: pd.DataFrame, corr_matrix: pd.DataFrame, figures_path: str) -> None:
     if len(y.columns) == 1:  # Pour éviter les visualisations trop complexes
         target_col = y.columns[0]
         top_features = corr_matrix[target_col].abs().sort_values(ascending=False).index[1:4]
         
-        # Pairplot ciblé
-        sns.pairplot(df[top_features.tolist() + [target_col]], 
+        # Pairplot ciblé (échantillonné au-delà du budget mémoire)
+        sns.pairplot(sample_to_budget(df[top_features.tolist() + [target_col]], "Pairplot", overhead=4.0), 
                     diag_kind='kde',
                     plot_kws={'alpha':0.5, 'edgecolor':'none'},
                     diag_kws={'fill':True})
         plt.suptitle("Relations clés avec la target", y=1.02)
-        plt.savefig(Path(figures_path)/f"key_relationships.png", bbox_inches='tight')
-        plt.clf()
-        plt.close()
+        save_figure(figures_path, f"key_relationships.png", bbox_inches='tight')
 
 
-def plot_boxplots(X: pd.DataFrame, figures_path: str):
-    for col in X.columns:
-        plt.figure(figsize=(10, 4))
-        sns.boxplot(x=col, data=X)
-        plt.title(f"Distribution de {col}")
-        plt.savefig(Path(figures_path)/f"{col}_boxplot.png")
-        plt.clf()
-        plt.close()
+@renderable
+def plot_boxplots(X: pd.DataFrame, figures_path: str, scorer: OutlierScorer = None) -> None:
+    """
+    Trace un boxplot par colonne numérique, en mettant en évidence les valeurs aberrantes.
+
+    Les quartiles et les valeurs signalées proviennent du score d'aberrants (calculés une seule
+    fois pour toutes les colonnes) ; les moustaches s'arrêtent aux valeurs non signalées extrêmes.
+
+    Args:
+        X (pd.DataFrame): Features quantitatives.
+        figures_path (str): Dossier de sauvegarde des figures.
+        scorer (OutlierScorer, optional): Score déjà ajusté (par défaut bornes IQR apprises sur X).
+    """
+    scorer = scorer if scorer is not None else OutlierScorer("iqr").fit(X)
+    flags = scorer.flags(X)
+    values = X[scorer.columns].apply(pd.to_numeric, errors="coerce")
+    inside = values.where(~flags)
+    whislo, whishi = inside.min(), inside.max()
+    for col in scorer.columns:
+        if np.isnan(scorer.quantiles_.at[0.5, col]):
+            continue
+        fig, ax = plt.subplots(figsize=resolve_figsize(None, (10, 4)))
+        stats = {"label": col, "med": scorer.quantiles_.at[0.5, col], "q1": scorer.quantiles_.at[0.25, col],
+                 "q3": scorer.quantiles_.at[0.75, col], "whislo": whislo[col], "whishi": whishi[col],
+                 "fliers": values.loc[flags[col], col].to_numpy()}
+        ax.bxp([stats], orientation="horizontal", patch_artist=True, boxprops={"facecolor": "skyblue"},
+               flierprops={"marker": "o", "markerfacecolor": "crimson", "markeredgecolor": "crimson"})
+        ax.set_title(f"Distribution de {col} ({int(flags[col].sum())} valeurs aberrantes)")
+        save_figure(figures_path, f"{col}_boxplot.png", fig=fig)
 
 
+@renderable
 def diagramme_dispersion_cibles(df: pd.DataFrame, y: pd.DataFrame, corr_matrix: pd.DataFrame, figures_path: str, classification_threshold: int=10) -> None:
     for target_col in y.columns:
         try:
@@ -111,7 +158,7 @@ def diagramme_dispersion_cibles(df: pd.DataFrame, y: pd.DataFrame, corr_matrix:
             top_features = corr_matrix[target_col].abs().sort_values(ascending=False).index[1:3]
             
             if len(top_features) >= 2:
-                plt.figure(figsize=(10, 6))
+                plt.figure(figsize=resolve_figsize(None, (10, 6)))
                 
                 # Détermination du type de palette
                 unique_classes = y[target_col].nunique()
@@ -130,26 +177,41 @@ def diagramme_dispersion_cibles(df: pd.DataFrame, y: pd.DataFrame, corr_matrix:
                 plt.xlabel(top_features[0], fontweight='bold')
                 plt.ylabel(top_features[1], fontweight='bold')
                 
-                plt.savefig(Path(figures_path)/f"scatter_{target_col}.png", bbox_inches='tight', dpi=120)
-                plt.clf()
-                plt.close()
+                save_figure(figures_path, f"scatter_{target_col}.png", bbox_inches='tight')
                 
         except Exception as e:
             logging.error(f"Erreur avec la target {target_col} : {str(e)}")
             continue
 
 
-def plot_boxenplot(X: pd.DataFrame, figures_path: str) -> None:
-    plt.figure(figsize=(12, 6))
-    sns.boxenplot(data=X, palette="Set3", orient="h")
-    plt.title("Distribution des features avec détection d'outliers (boxenplot)")
+@renderable
+def plot_boxenplot(X: pd.DataFrame, figures_path: str, scorer: OutlierScorer = None) -> None:
+    """
+    Trace les boxenplots de toutes les features, avec les valeurs aberrantes signalées par le score.
+
+    Args:
+        X (pd.DataFrame): Features quantitatives.
+        figures_path (str): Dossier de sauvegarde des figures.
+        scorer (OutlierScorer, optional): Score déjà ajusté (par défaut bornes IQR apprises sur X) ;
+            ses drapeaux sont réutilisés tels quels.
+    """
+    scorer = scorer if scorer is not None else OutlierScorer("iqr").fit(X)
+    flags = scorer.flags(X)
+    plt.figure(figsize=resolve_figsize(None, (12, 6)))
+    ax = sns.boxenplot(data=X[scorer.columns], palette="Set3", orient="h", showfliers=False)
+    rows, cols = np.nonzero(flags.to_numpy())
+    if len(rows):
+        values = X[scorer.columns].apply(pd.to_numeric, errors="coerce").to_numpy()
+        ax.scatter(values[rows, cols], cols, color="crimson", s=12, zorder=3, label="Valeurs aberrantes")
+        ax.legend(loc="lower right")
+    plt.title(f"Distribution des features avec détection d'outliers ({scorer.method})")
     plt.tight_layout()
-    plt.savefig(Path(figures_path)/f"outliers_detection.png")
-    plt.clf()
-    plt.close()
+    save_figure(figures_path, f"outliers_detection.png")
 
 
-def plot_temporal_histograms(df: pd.DataFrame, var_base: str, times: list, groupby_col: str, figsize: tuple = (12, 6), save_path: str = None) -> None:
+@renderable
+def plot_temporal_histograms(df: pd.DataFrame, var_base: str, times: list, groupby_col: str, figsize: tuple = None, save_path: str = None,
+                             families: TimeFamilies = None) -> None:
     """
     Trace des histogrammes superposés pour une variable à travers plusieurs points temporels, stratifiés par une variable catégorielle.
     
@@ -158,30 +220,31 @@ def plot_temporal_histograms(df: pd.DataFrame, var_base: str, times: list, group
         var_base (str): Nom de base de la variable (ex. "attr1_" pour attr1_1, attr1_2, attr1_3).
         times (list): Liste des suffixes temporels (ex. ["1", "2", "3"]).
         groupby_col (str): Colonne de regroupement (ex. "gender").
-        figsize (tuple): Taille de la figure (largeur, hauteur).
+        figsize (tuple, optional): Taille de la figure (largeur, hauteur), par défaut celle du profil de rendu, sinon (12, 6).
         save_path (str, optional): Chemin pour sauvegarder la figure.
+        families (TimeFamilies, optional): Vues longues déjà construites pour df (réutilisées entre appels).
     """
-    plt.figure(figsize=figsize)
-    for time in times:
-        var = f"{var_base}{time}"
-        if var not in df.columns:
-            continue
+    families = families if families is not None else TimeFamilies(df)
+    selected = families.times(var_base, times)
+    view = families.long(var_base, [groupby_col], selected) if selected else None
+    plt.figure(figsize=resolve_figsize(figsize, (12, 6)))
+    for time in selected:
+        at_time = view[view["time"] == time]
         for group in df[groupby_col].unique():
-            subset = df[df[groupby_col] == group]
-            sns.histplot(subset[var].dropna(), label=f"{group} - Temps {time}", kde=True, stat="density", alpha=0.5)
+            subset = at_time[at_time[groupby_col] == group]
+            sns.histplot(subset["value"].dropna(), label=f"{group} - Temps {time}", kde=True, stat="density", alpha=0.5)
     plt.title(f"Évolution de {var_base} par {groupby_col} au fil du temps")
     plt.xlabel(var_base)
     plt.ylabel("Densité")
     plt.legend()
     
-    Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(Path(save_path)/f"Evolution_{var_base}_by_{groupby_col}")
-
-    plt.clf()
-    plt.close()
+    save_figure(save_path, f"Evolution_{var_base}_by_{groupby_col}", kind="line")
 
 
-def plot_temporal_histograms2(df: pd.DataFrame, var_base: str, times: list, groupby_col: str, figsize: tuple = (12, 6), save_path: str = None) -> None:
+@renderable
+def plot_temporal_histograms2(df: pd.DataFrame, var_base: str, times: list, groupby_col: str, figsize: tuple = None, save_path: str = None,
+                              show_ci: bool = False, n_resamples: int = 1000, confidence: float = 0.95, random_state: int = None,
+                              families: TimeFamilies = None, cluster_col: str = "iid") -> None:
     """
     Trace des histogrammes séparés pour une variable à chaque point temporel, stratifiés par une variable catégorielle.
     
@@ -190,30 +253,46 @@ def plot_temporal_histograms2(df: pd.DataFrame, var_base: str, times: list, grou
         var_base (str): Nom de base de la variable (ex. "attr1_" pour attr1_1, attr1_2, attr1_3).
         times (list): Liste des suffixes temporels (ex. ["1", "2", "3"]).
         groupby_col (str): Colonne de regroupement (ex. "gender").
-        figsize (tuple): Taille de la figure par histogramme (largeur, hauteur).
+        figsize (tuple, optional): Taille de la figure par histogramme (largeur, hauteur), par défaut celle du profil de rendu, sinon (12, 6).
         save_path (str, optional): Chemin de base pour sauvegarder les figures (une par temps).
+        show_ci (bool): Si True, superpose la moyenne de chaque groupe et son intervalle de confiance bootstrap.
+        n_resamples (int): Nombre de réplications bootstrap.
+        confidence (float): Niveau de confiance.
+        random_state (int, optional): Graine du bootstrap.
+        families (TimeFamilies, optional): Vues longues déjà construites pour df (réutilisées entre appels).
+        cluster_col (str): Participant rééchantillonné entier par le bootstrap (ses rendez-vous ne sont
+            pas indépendants) ; ignoré s'il est absent de df.
     """
-    for time in times:
-        var = f"{var_base}{time}"
-        if var not in df.columns:
-            continue
-        plt.figure(figsize=figsize)
-        for group in df[groupby_col].unique():
-            subset = df[df[groupby_col] == group]
-            sns.histplot(subset[var].dropna(), label=f"{group}", kde=True, stat="density", alpha=0.5)
+    families = families if families is not None else TimeFamilies(df)
+    selected = families.times(var_base, times)
+    cluster_col = cluster_col if cluster_col in df.columns and show_ci else None
+    id_vars = [groupby_col] + ([cluster_col] if cluster_col is not None else [])
+    view = families.long(var_base, id_vars, selected) if selected else None
+    palette = sns.color_palette()
+    for time in selected:
+        at_time = view[view["time"] == time]
+        plt.figure(figsize=resolve_figsize(figsize, (12, 6)))
+        groups = df[groupby_col].unique()
+        ci = bootstrap_group_ci(at_time, "value", groupby_col, cluster_col=cluster_col, n_resamples=n_resamples,
+                                confidence=confidence, random_state=random_state) if show_ci else None
+        for i, group in enumerate(groups):
+            color = palette[i % len(palette)]
+            subset = at_time[at_time[groupby_col] == group]
+            sns.histplot(subset["value"].dropna(), label=f"{group}", kde=True, stat="density", alpha=0.5, color=color)
+            if ci is not None and group in ci.index:
+                plt.axvline(ci.at[group, "estimate"], color=color, linestyle="--")
+                plt.axvspan(ci.at[group, "ci_low"], ci.at[group, "ci_high"], color=color, alpha=0.15,
+                            label=f"{group} - IC {confidence:.0%} moyenne")
         plt.title(f"Distribution de {var_base} au temps {time} par {groupby_col}")
         plt.xlabel(var_base)
         plt.ylabel("Densité")
         plt.legend()
         
-        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(Path(save_path)/f"temporal_histogram_{var_base}_time_{time}_by_{groupby_col}")
+        save_figure(save_path, f"temporal_histogram_{var_base}_time_{time}_by_{groupby_col}", kind="line")
 
-        plt.clf()
-        plt.close()
 
-
-def plot_scatter_comparison(df: pd.DataFrame, x_var: str, y_var: str, hue_col: str = None, figsize: tuple = (8, 6), save_path: str = None) -> None:
+@renderable
+def plot_scatter_comparison(df: pd.DataFrame, x_var: str, y_var: str, hue_col: str = None, figsize: tuple = None, save_path: str = None) -> None:
     """
     Trace un diagramme de dispersion pour comparer deux variables, avec coloration optionnelle par une variable catégorielle.
     
@@ -222,23 +301,22 @@ def plot_scatter_comparison(df: pd.DataFrame, x_var: str, y_var: str, hue_col: s
         x_var (str): Variable sur l’axe X (ex. "attr1_1").
         y_var (str): Variable sur l’axe Y (ex. "attr").
         hue_col (str, optional): Colonne pour la coloration (ex. "gender").
-        figsize (tuple): Taille de la figure.
+        figsize (tuple, optional): Taille de la figure (par défaut celle du profil de rendu, sinon (8, 6)).
         save_path (str, optional): Chemin pour sauvegarder la figure.
     """
-    plt.figure(figsize=figsize)
+    plt.figure(figsize=resolve_figsize(figsize, (8, 6)))
     sns.scatterplot(data=df, x=x_var, y=y_var, hue=hue_col, alpha=0.7)
     plt.title(f"Comparaison entre {x_var} et {y_var}")
     plt.xlabel(x_var)
     plt.ylabel(y_var)
 
-    Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(Path(save_path)/f"Comparaison_{x_var}_{y_var}")
-
-    plt.clf()
-    plt.close()
+    save_figure(save_path, f"Comparaison_{x_var}_{y_var}")
 
 
-def plot_violin_comparison(df: pd.DataFrame, vars_to_compare: list, groupby_col: str, figsize: tuple = (10, 6), save_path: str = None) -> None:
+@renderable
+def plot_violin_comparison(df: pd.DataFrame, vars_to_compare: list, groupby_col: str, figsize: tuple = None, save_path: str = None,
+                           show_ci: bool = False, n_resamples: int = 1000, confidence: float = 0.95, random_state: int = None,
+                           families: TimeFamilies = None, cluster_col: str = "iid") -> None:
     """
     Trace des diagrammes en violon pour comparer les distributions de deux variables, stratifiées par une variable catégorielle.
     
@@ -246,25 +324,48 @@ def plot_violin_comparison(df: pd.DataFrame, vars_to_compare: list, groupby_col:
         df (pd.DataFrame): DataFrame contenant les données.
         vars_to_compare (list): Liste de deux variables à comparer (ex. ["attr3_1", "attr_o"]).
         groupby_col (str): Colonne de regroupement (ex. "gender").
-        figsize (tuple): Taille de la figure.
+        figsize (tuple, optional): Taille de la figure (par défaut celle du profil de rendu, sinon (10, 6)).
         save_path (str, optional): Chemin pour sauvegarder la figure.
+        show_ci (bool): Si True, superpose la moyenne de chaque groupe avec son intervalle de confiance bootstrap.
+        n_resamples (int): Nombre de réplications bootstrap.
+        confidence (float): Niveau de confiance.
+        random_state (int, optional): Graine du bootstrap.
+        families (TimeFamilies, optional): Vues longues déjà construites pour df (réutilisées entre appels).
+        cluster_col (str): Participant rééchantillonné entier par le bootstrap (ses rendez-vous ne sont
+            pas indépendants) ; ignoré s'il est absent de df.
     """
     if len(vars_to_compare) != 2:
         raise ValueError("vars_to_compare doit contenir exactement deux variables.")
     
-    df_long = df.melt(id_vars=[groupby_col], value_vars=vars_to_compare, var_name="Variable", value_name="Valeur")
-    plt.figure(figsize=figsize)
-    sns.violinplot(data=df_long.dropna(), x="Variable", y="Valeur", hue=groupby_col, split=True, inner="quart")
+    families = families if families is not None else TimeFamilies(df)
+    df_long = families.stack(vars_to_compare, [groupby_col], var_name="Variable", value_name="Valeur")
+    df_long = df_long.dropna()
+    # Ordre explicite des variables et des groupes, partagé par les violons et les intervalles superposés
+    groups = list(pd.unique(df_long[groupby_col]))
+    plt.figure(figsize=resolve_figsize(figsize, (10, 6)))
+    ax = sns.violinplot(data=df_long, x="Variable", y="Valeur", hue=groupby_col, order=vars_to_compare,
+                        hue_order=groups, split=True, inner="quart")
+    if show_ci:
+        for x_pos, var in enumerate(vars_to_compare):
+            ci = bootstrap_group_ci(df, var, groupby_col, cluster_col=cluster_col if cluster_col in df.columns else None,
+                                    n_resamples=n_resamples, confidence=confidence, random_state=random_state)
+            for i, group in enumerate(groups):
+                if group not in ci.index:
+                    continue
+                # Demi-violon gauche pour le premier groupe, droit pour le second
+                offset = -0.1 if i == 0 else 0.1
+                estimate = ci.at[group, "estimate"]
+                ax.errorbar(x_pos + offset, estimate,
+                            yerr=[[estimate - ci.at[group, "ci_low"]], [ci.at[group, "ci_high"] - estimate]],
+                            fmt="o", color="black", capsize=4)
     plt.title(f"Comparaison des distributions de {vars_to_compare[0]} et {vars_to_compare[1]} par {groupby_col}")
     
-    Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(Path(save_path)/f"Distributions_{vars_to_compare[0]}_{vars_to_compare[1]}_by_{groupby_col}")
+    save_figure(save_path, f"Distributions_{vars_to_compare[0]}_{vars_to_compare[1]}_by_{groupby_col}")
 
-    plt.clf()
-    plt.close()
 
-
-def plot_boxplots_by_decision(df: pd.DataFrame, vars_list: list, decision_col: str, figsize: tuple = (12, 8), save_path: str = None) -> None:
+@renderable
+def plot_boxplots_by_decision(df: pd.DataFrame, vars_list: list, decision_col: str, figsize: tuple = None, save_path: str = None,
+                              test_results: pd.DataFrame = None) -> None:
     """
     Trace des boxplots pour des variables quantitatives stratifiées par la décision.
     
@@ -272,42 +373,40 @@ def plot_boxplots_by_decision(df: pd.DataFrame, vars_list: list, decision_col: s
         df (pd.DataFrame): DataFrame contenant les données.
         vars_list (list): Liste des variables à visualiser (ex. ["attr", "sinc"]).
         decision_col (str): Colonne de décision (ex. "dec").
-        figsize (tuple): Taille de la figure.
+        figsize (tuple, optional): Taille de la figure (par défaut celle du profil de rendu, sinon (12, 8)).
         save_path (str, optional): Chemin pour sauvegarder la figure.
+        test_results (pd.DataFrame, optional): Résultat de `permutation_test` ; la p-value corrigée
+            est ajoutée au titre de chaque boxplot.
     """
     n_vars = len(vars_list)
-    fig, axes = plt.subplots(nrows=1, ncols=n_vars, figsize=figsize)
+    fig, axes = plt.subplots(nrows=1, ncols=n_vars, figsize=resolve_figsize(figsize, (12, 8)))
     if n_vars == 1:
         axes = [axes]  # Pour gérer le cas d’une seule variable
     for i, var in enumerate(vars_list):
         sns.boxplot(x=decision_col, y=var, data=df.dropna(subset=[var, decision_col]), ax=axes[i])
-        axes[i].set_title(f"{var} par {decision_col}")
+        title = f"{var} par {decision_col}"
+        if test_results is not None and var in test_results.index:
+            title += f"\np = {test_results.at[var, 'p_adjusted']:.3g}"
+        axes[i].set_title(title)
     plt.tight_layout()
     
-    Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(Path(save_path)/f"Boxplots_by_{decision_col}")
-    
-    plt.clf()
-    plt.close()
+    save_figure(save_path, f"Boxplots_by_{decision_col}")
 
 
-def plot_correlation_heatmap(df: pd.DataFrame, vars_list: list, figsize: tuple = (10, 8), save_path: str = None) -> None:
+@renderable
+def plot_correlation_heatmap(df: pd.DataFrame, vars_list: list, figsize: tuple = None, save_path: str = None) -> None:
     """
     Trace une heatmap de corrélation pour un ensemble de variables quantitatives.
     
     Args:
         df (pd.DataFrame): DataFrame contenant les données.
         vars_list (list): Liste des variables à inclure (ex. ["attr", "sinc", "dec"]).
-        figsize (tuple): Taille de la figure.
+        figsize (tuple, optional): Taille de la figure (par défaut celle du profil de rendu, sinon (10, 8)).
         save_path (str, optional): Chemin pour sauvegarder la figure.
     """
-    corr_matrix = df[vars_list].corr()
-    plt.figure(figsize=figsize)
+    corr_matrix = correlation_matrix(df, vars_list)
+    plt.figure(figsize=resolve_figsize(figsize, (10, 8)))
     sns.heatmap(corr_matrix, annot=True, cmap="coolwarm", fmt=".2f")
     plt.title("Heatmap de corrélation")
     
-    Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(Path(save_path)/f"Heatmap_correlation")
-
-    plt.clf()
-    plt.close()
\ No newline at end of file
+    save_figure(save_path, f"Heatmap_correlation")
\ No newline at end of file
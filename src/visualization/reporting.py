@@ -1,6 +1,7 @@
 import pandas as pd
 from src.visualization.quantitative import plot_correlation_matrix
 from src.visualization.qualitative import plot_bar_chart, plot_pie_chart
+from src.analysis.contingency import ContingencyEngine
 
 def generate_summary_report(df: pd.DataFrame, figures_path: str) -> None:
     """Génère un rapport résumé avec statistiques et visualisations."""
@@ -14,6 +15,7 @@ def generate_summary_report(df: pd.DataFrame, figures_path: str) -> None:
     
     if not numeric_cols.empty:
         plot_correlation_matrix(df[numeric_cols], figures_path)
+    engine = ContingencyEngine(df)
     for col in object_cols:
-        plot_bar_chart(df, col, figures_path)
-        plot_pie_chart(df, col, figures_path)
\ No newline at end of file
+        plot_bar_chart(df, col, figures_path, counts=engine.counts(col))
+        plot_pie_chart(df, col, figures_path, counts=engine.counts(col))
\ No newline at end of file
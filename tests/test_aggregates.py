@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.aggregates import RunningAggregate, SUPPORTED_FUNCS
+
+@pytest.fixture
+def waves():
+    rng = np.random.default_rng(3)
+    frames = []
+    for wave in range(1, 4):
+        n = 60
+        frames.append(pd.DataFrame({
+            "wave": wave,
+            "iid": rng.integers(1, 15, n) + 5 * wave,
+            "pid": rng.integers(1, 25, n),
+            "match": rng.integers(0, 2, n),
+            "like": np.where(rng.random(n) < 0.1, np.nan, rng.normal(6, 2, n)),
+        }))
+    return frames
+
+@pytest.mark.parametrize("agg_func", SUPPORTED_FUNCS)
+def test_incremental_matches_full_recompute(waves, agg_func):
+    aggregate = RunningAggregate("pid", "like")
+    for batch in waves:
+        aggregate.update(batch)
+    full = pd.concat(waves, ignore_index=True)
+    expected = full.groupby("pid")["like"].transform(agg_func)
+    result = aggregate.transform(full, agg_func)
+    np.testing.assert_allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float), rtol=1e-10)
+
+def test_integer_sum_keeps_dtype(waves):
+    aggregate = RunningAggregate("iid", "match")
+    for batch in waves:
+        aggregate.update(batch)
+    full = pd.concat(waves, ignore_index=True)
+    pd.testing.assert_series_equal(aggregate.transform(full, "sum"), full.groupby("iid")["match"].transform("sum"),
+                                   check_names=False)
+
+def test_unknown_keys_and_function(waves):
+    aggregate = RunningAggregate("iid", "match").update(waves[0])
+    result = aggregate.transform(pd.DataFrame({"iid": [-1]}), "mean")
+    assert np.isnan(result.iloc[0])
+    with pytest.raises(ValueError):
+        aggregate.result("median")
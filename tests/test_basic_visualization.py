@@ -1,6 +1,7 @@
 import pandas as pd
 import pytest
 import matplotlib.pyplot as plt
+from src.analysis.sketches import FrameSketch
 from src.utils.basic_visualization import display_head, display_info, display_description, plot_missing_values
 
 # Fixture pour un DataFrame de test
@@ -48,4 +49,13 @@ def test_display_description(sample_df, capsys):
 def test_plot_missing_values(sample_df):
     # Vérifie que la fonction s'exécute sans erreur
     plot_missing_values(sample_df)
-    plt.close()  # Ferme la figure pour éviter les interférences
\ No newline at end of file
+    plt.close()  # Ferme la figure pour éviter les interférences
+
+def test_display_from_sketch(sample_df, capsys):
+    sketch = FrameSketch().update(sample_df.iloc[:2]).update(sample_df.iloc[2:])
+    display_info(sketch=sketch)
+    display_description(sketch=sketch)
+    captured = capsys.readouterr()
+    assert "5 entries, 4 columns" in captured.out
+    assert "non_null" in captured.out and "object" in captured.out
+    assert "mean" in captured.out and "25%" in captured.out
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.bootstrap import (bootstrap_distribution, bootstrap_difference_ci, bootstrap_correlation_ci,
+                                    bootstrap_group_ci, compare_groups)
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(4)
+    n = 200
+    gender = rng.integers(0, 2, n)
+    attr1_1 = np.where(gender == 1, rng.normal(27, 5, n), rng.normal(18, 5, n))
+    return pd.DataFrame({
+        "gender": gender,
+        "attr1_1": attr1_1,
+        "attr1_2": attr1_1 + rng.normal(0, 2, n),
+        "attr": attr1_1 / 4 + rng.normal(0, 1, n),
+    })
+
+def test_chunking_and_processes_do_not_change_result():
+    rng = np.random.default_rng(5)
+    samples = (rng.normal(size=50), rng.normal(size=40))
+    serial = bootstrap_distribution("difference", "mean", samples, n_resamples=300, chunk_size=64, random_state=1)
+    parallel = bootstrap_distribution("difference", "mean", samples, n_resamples=300, chunk_size=64, n_jobs=2, random_state=1)
+    assert len(serial) == 300
+    np.testing.assert_array_equal(serial, parallel)
+
+def test_difference_ci_brackets_estimate(sample_df):
+    men = sample_df.loc[sample_df["gender"] == 1, "attr1_1"]
+    women = sample_df.loc[sample_df["gender"] == 0, "attr1_1"]
+    for statistic in ["mean", "median"]:
+        result = bootstrap_difference_ci(men, women, statistic, n_resamples=500, random_state=0)
+        assert result["ci_low"] < result["estimate"] < result["ci_high"]
+        assert result["ci_low"] > 0
+    assert bootstrap_difference_ci(men, women, random_state=0)["estimate"] == pytest.approx(men.mean() - women.mean())
+
+def test_correlation_ci(sample_df):
+    for method in ["pearson", "spearman"]:
+        result = bootstrap_correlation_ci(sample_df["attr1_1"], sample_df["attr"], method, n_resamples=500, random_state=0)
+        assert result["ci_low"] <= result["estimate"] <= result["ci_high"]
+    assert result["estimate"] == pytest.approx(sample_df["attr1_1"].corr(sample_df["attr"], method="spearman"))
+
+def test_group_ci_and_compare_groups(sample_df):
+    ci = bootstrap_group_ci(sample_df, "attr1_1", "gender", n_resamples=200, random_state=0)
+    assert list(ci.index) == [0, 1]
+    np.testing.assert_allclose(ci["estimate"], sample_df.groupby("gender")["attr1_1"].mean())
+    comparison = compare_groups(sample_df, ["attr1_1", "attr1_2", "attr1_3"], "gender", n_resamples=200, random_state=0)
+    assert list(comparison.index) == ["attr1_1", "attr1_2"]
+    assert (comparison["comparison"] == "1 - 0").all()
+    with pytest.raises(ValueError):
+        compare_groups(sample_df.assign(gender=0), ["attr1_1"], "gender")
+
+def test_cluster_bootstrap_not_narrowed_by_repeated_rows(sample_df):
+    # Une ligne par rendez-vous : la même valeur de participant répétée 10 fois
+    people = sample_df.assign(iid=np.arange(len(sample_df)))
+    dates = people.loc[people.index.repeat(10)]
+    single = bootstrap_group_ci(people, "attr1_1", "gender", n_resamples=300, random_state=0)
+    for statistic in ["mean", "median"]:
+        clustered = bootstrap_group_ci(dates, "attr1_1", "gender", statistic, cluster_col="iid", n_resamples=300,
+                                       random_state=0)
+        reference = bootstrap_group_ci(people, "attr1_1", "gender", statistic, cluster_col="iid", n_resamples=300,
+                                       random_state=0)
+        pd.testing.assert_frame_equal(clustered, reference)
+    naive = bootstrap_group_ci(dates, "attr1_1", "gender", n_resamples=300, random_state=0)
+    width = lambda ci: (ci["ci_high"] - ci["ci_low"]).to_numpy()
+    assert (width(naive) < width(single) / 2).all()
+    assert (width(clustered) > width(single) / 2).all()
+    np.testing.assert_allclose(clustered["estimate"], people.groupby("gender")["attr1_1"].median())
+
+    comparison = compare_groups(dates, ["attr1_1"], "gender", cluster_col="iid", n_resamples=300, random_state=0)
+    expected = compare_groups(people, ["attr1_1"], "gender", cluster_col="iid", n_resamples=300, random_state=0)
+    pd.testing.assert_frame_equal(comparison, expected)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chi2_contingency
+from src.analysis.contingency import ContingencyEngine
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "field": rng.choice(["Law", "Business", "MBA", "Physics"], size=200),
+        "gender": rng.integers(0, 2, size=200),
+        "race": rng.choice([1.0, 2.0, 3.0, np.nan], size=200),
+    })
+    return df
+
+def test_table_matches_crosstab(sample_df):
+    engine = ContingencyEngine(sample_df)
+    expected = pd.crosstab(sample_df["field"], sample_df["race"])
+    pd.testing.assert_frame_equal(engine.table("field", "race"), expected, check_names=False, check_dtype=False)
+
+def test_nway_table_matches_crosstab(sample_df):
+    engine = ContingencyEngine(sample_df)
+    expected = pd.crosstab([sample_df["field"], sample_df["gender"]], sample_df["race"])
+    result = engine.table("field", "gender", "race")
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+    assert list(result.index) == list(expected.index)
+
+def test_counts_matches_value_counts(sample_df):
+    engine = ContingencyEngine(sample_df)
+    expected = sample_df["field"].value_counts()
+    pd.testing.assert_series_equal(engine.counts("field"), expected, check_names=False, check_index_type=False)
+
+def test_columns_are_factorized_once(sample_df):
+    engine = ContingencyEngine(sample_df)
+    engine.table("field", "gender")
+    codes = engine._codes["field"][0]
+    engine.table("field", "race")
+    assert engine._codes["field"][0] is codes
+    assert engine.table("field", "gender") is engine.table("field", "gender")
+
+def test_association(sample_df):
+    engine = ContingencyEngine(sample_df)
+    table = pd.crosstab(sample_df["field"], sample_df["gender"])
+    chi2, p_value, dof, _ = chi2_contingency(table, correction=False)
+    result = engine.association("field", "gender")
+    assert result["chi2"] == pytest.approx(chi2)
+    assert result["p_value"] == pytest.approx(p_value)
+    assert result["dof"] == dof
+    assert result["cramers_v"] == pytest.approx(np.sqrt(chi2 / (table.to_numpy().sum() * 1)))
+
+def test_proportions(sample_df):
+    engine = ContingencyEngine(sample_df)
+    proportions = engine.proportions("field", "gender")
+    np.testing.assert_allclose(proportions.sum(axis=1), 1.0)
+
+def test_high_cardinality_table_counts_observed_combinations():
+    n = 3000
+    df = pd.DataFrame({"a": np.arange(n) % 1500, "b": np.arange(n) % 2000, "c": np.arange(n).astype(str)})
+    table = ContingencyEngine(df).table("a", "b", "c")
+    expected = pd.crosstab([df["a"], df["b"]], df["c"])
+    assert table.shape == expected.shape and table.to_numpy().sum() == n
+    np.testing.assert_array_equal(table.loc[expected.index, expected.columns].to_numpy(), expected.to_numpy())
@@ -0,0 +1,74 @@
+import json
+import threading
+import urllib.request
+import urllib.error
+import numpy as np
+import pandas as pd
+import pytest
+import src.visualization.dashboard as dashboard
+from src.visualization.dashboard import build_dashboard_aggregates, create_dashboard_server
+from src.utils.memory import MemoryBudget, memory_budget
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(8)
+    n = 500
+    return pd.DataFrame({
+        "attr": rng.normal(6, 2, n),
+        "like": rng.normal(6, 2, n),
+        "gender": rng.integers(0, 2, n),
+        "field": rng.choice(["Law", "MBA", "Art"], n),
+    })
+
+@pytest.fixture
+def server(sample_df):
+    aggregates = build_dashboard_aggregates(sample_df, bins=10)
+    server = create_dashboard_server(aggregates, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def get(url):
+    with urllib.request.urlopen(url) as response:
+        return response.read()
+
+def test_aggregates(sample_df, tmp_path):
+    cache_path = tmp_path / "cache" / "dashboard.pkl"
+    aggregates = build_dashboard_aggregates(sample_df, cache_path=str(cache_path), bins=10)
+    assert aggregates.histograms["attr"][0].sum() == len(sample_df)
+    assert aggregates.categorical_columns == ["field", "gender"]
+    assert aggregates.crosstabs[("field", "gender")].to_numpy().sum() == len(sample_df)
+    cached = build_dashboard_aggregates(sample_df, cache_path=str(cache_path), bins=10)
+    np.testing.assert_array_equal(cached.histograms["attr"][0], aggregates.histograms["attr"][0])
+
+def test_correlation_follows_memory_budget(sample_df, caplog):
+    with memory_budget(MemoryBudget(limit_mb=0.01, chunk_rows=100)):
+        with caplog.at_level("INFO"):
+            aggregates = build_dashboard_aggregates(sample_df, bins=10)
+    assert "par morceaux" in caplog.text
+    pd.testing.assert_frame_equal(aggregates.correlation, sample_df[["attr", "like", "gender"]].corr(), atol=1e-10)
+
+def test_cache_invalidated_by_data_or_parameters(sample_df, tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "dashboard.pkl")
+    build_dashboard_aggregates(sample_df, cache_path=cache_path, bins=10)
+    calls = []
+    original = dashboard.compute_dashboard_aggregates
+    monkeypatch.setattr(dashboard, "compute_dashboard_aggregates", lambda df, **kw: calls.append(kw) or original(df, **kw))
+    build_dashboard_aggregates(sample_df, cache_path=cache_path, bins=10)
+    assert calls == []
+    assert build_dashboard_aggregates(sample_df, cache_path=cache_path, bins=5).histograms["attr"][0].size == 5
+    changed = sample_df.assign(attr=sample_df["attr"] + 1)
+    build_dashboard_aggregates(changed, cache_path=cache_path, bins=5)
+    assert len(calls) == 2
+
+def test_server_endpoints(server):
+    assert b"plotly.min.js" in get(server + "/")
+    meta = json.loads(get(server + "/api/meta"))
+    assert meta["numeric"] == ["attr", "like", "gender"]
+    for path in ["/api/histogram?column=attr", "/api/correlation?columns=attr,like", "/api/crosstab?col1=gender&col2=field"]:
+        figure = json.loads(get(server + path))
+        assert figure["data"]
+    with pytest.raises(urllib.error.HTTPError):
+        get(server + "/api/histogram?column=unknown")
@@ -1,6 +1,6 @@
 import pandas as pd
 import pytest
-from src.visualization.exploratory import explore_quantitative_data, explore_qualitative_data, explore_mixed_data
+from src.visualization.exploratory import explore_quantitative_data, explore_qualitative_data, explore_mixed_data, grouped_box_stats
 
 @pytest.fixture
 def sample_mixed_df(tmpdir):
@@ -17,4 +17,22 @@ def test_explore_qualitative_data(sample_mixed_df):
 
 def test_explore_mixed_data(sample_mixed_df):
     df, figures_path = sample_mixed_df
-    explore_mixed_data(df, figures_path)
\ No newline at end of file
+    explore_mixed_data(df, figures_path)
+
+def test_grouped_box_stats():
+    df = pd.DataFrame({
+        'field': ['Law'] * 6 + ['MBA'] * 4 + ['Art'],
+        'attr': [1, 2, 3, 4, 5, 40, 6, 7, 8, 9, 5],
+        'like': [5, 5, 6, 6, 7, 7, 1, 2, 3, 4, 8],
+    })
+    stats = grouped_box_stats(df, ['attr', 'like'], 'field', max_categories=2)
+    assert [s['label'] for s in stats['attr']] == ['Law', 'MBA']
+    law = stats['attr'][0]
+    expected = df.loc[df['field'] == 'Law', 'attr'].quantile([0.25, 0.5, 0.75])
+    assert (law['q1'], law['med'], law['q3']) == tuple(expected)
+    assert law['whishi'] == 5  # 40 est au-delà de la moustache
+
+def test_explore_mixed_data_faceted(tmpdir):
+    df = pd.DataFrame({'A': [1, 2, 3, 4], 'C': [4.0, 3.0, 2.0, 1.0], 'B': ['x', 'y', 'x', 'y']})
+    explore_mixed_data(df, str(tmpdir), max_panels=1)
+    assert sorted(p.basename for p in tmpdir.listdir()) == ['boxplots_by_B_1.png', 'boxplots_by_B_2.png']
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+from src.models.folds import (FoldStore, date_components, build_fold_store, POST_DECISION_COLUMNS,
+                              is_post_decision)
+from src.analysis.network import add_network_features
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(11)
+    # 6 vagues de 6 participants (3 + 3) : chaque rencontre est stockée deux fois, (iid, pid) et (pid, iid)
+    rows = []
+    for wave in range(6):
+        men, women = range(6 * wave, 6 * wave + 3), range(6 * wave + 3, 6 * wave + 6)
+        for man in men:
+            for woman in women:
+                rows += [(man, woman, wave), (woman, man, wave)]
+    df = pd.DataFrame(rows, columns=["iid", "pid", "wave"])
+    n = len(df)
+    df["id"] = df.groupby("iid").cumcount()
+    df["attr"] = rng.normal(6, 2, n)
+    df["like"] = rng.normal(6, 2, n)
+    df["field"] = rng.choice(["Law", "MBA"], n)
+    pair = np.minimum(df["iid"], df["pid"]) * 100 + np.maximum(df["iid"], df["pid"])
+    df["match"] = pair.map(dict(zip(pair.unique(), rng.integers(0, 2, pair.nunique()))))
+    df.loc[::7, "attr"] = np.nan
+    return df
+
+def test_build_and_load_folds(sample_df, tmp_path):
+    store = FoldStore(str(tmp_path / "folds")).build(sample_df, "match", n_folds=5, drop_columns=["iid", "pid", "id"])
+    assert store.exists() and store.n_folds == 5
+    assert store.feature_names == ["attr", "like"]
+    seen = []
+    for fold in store:
+        assert isinstance(fold["X_train"], np.memmap)
+        assert fold["X_train"].dtype == np.float32
+        assert not np.isnan(fold["X_val"]).any()
+        train, val = sample_df.iloc[fold["train_index"]], sample_df.iloc[fold["val_index"]]
+        assert not set(train["wave"]) & set(val["wave"])
+        # Les deux lignes d'une même rencontre sont dans le même pli
+        assert not set(zip(val["pid"], val["iid"])) & set(zip(train["iid"], train["pid"]))
+        seen.extend(fold["val_index"].tolist())
+    assert sorted(seen) == list(range(len(sample_df)))
+
+def test_preprocessing_fitted_on_train_only(sample_df, tmp_path):
+    store = FoldStore(str(tmp_path / "folds")).build(sample_df, "match", n_folds=3, feature_cols=["attr", "like"], n_jobs=2)
+    fold = store.load_fold(0)
+    np.testing.assert_allclose(fold["X_train"].mean(axis=0), 0, atol=1e-5)
+    train = sample_df.iloc[fold["train_index"]]
+    imputer = store.load_preprocessor(0).steps[0][1]
+    assert imputer.statistics_[0] == pytest.approx(train["attr"].median())
+
+def test_network_features_excluded_by_default(sample_df, tmp_path):
+    # Les métriques de réseau contiennent la cible de la ligne : jamais sélectionnées implicitement
+    df = add_network_features(sample_df.assign(dec=sample_df["match"], dec_o=sample_df["match"]))
+    store = FoldStore(str(tmp_path / "folds")).build(df, "match", n_folds=3, drop_columns=["iid", "id"])
+    assert store.feature_names == ["attr", "like"]
+    store = FoldStore(str(tmp_path / "folds")).build(df, "match", n_folds=3, feature_cols=["attr", "net_popularity"])
+    assert store.feature_names == ["attr", "net_popularity"]
+
+def test_load_missing_fold(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FoldStore(str(tmp_path)).load_fold(0)
+
+def test_knn_fill_strategy(sample_df, tmp_path):
+    store = FoldStore(str(tmp_path / "folds")).build(sample_df, "match", n_folds=3, feature_cols=["attr", "like"],
+                                                     fill_strategy="knn", scaling="none")
+    fold = store.load_fold(1)
+    assert not np.isnan(fold["X_train"]).any() and not np.isnan(fold["X_val"]).any()
+    assert type(store.load_preprocessor(1).steps[0][1]).__name__ == "IndexedKNNImputer"
+
+def test_component_groups_keep_mirror_rows_together(sample_df, tmp_path):
+    np.testing.assert_array_equal(date_components(sample_df), sample_df["wave"].to_numpy())
+    store = FoldStore(str(tmp_path / "folds")).build(sample_df.drop(columns="wave"), "match", group_col="component",
+                                                     n_folds=3, feature_cols=["attr", "like"])
+    for fold in store:
+        train, val = sample_df.iloc[fold["train_index"]], sample_df.iloc[fold["val_index"]]
+        assert not (set(train["iid"]) | set(train["pid"])) & (set(val["iid"]) | set(val["pid"]))
+
+def test_rebuild_removes_stale_folds(sample_df, tmp_path):
+    root = tmp_path / "folds"
+    FoldStore(str(root)).build(sample_df, "match", n_folds=5, feature_cols=["attr", "like"])
+    store = FoldStore(str(root)).build(sample_df, "match", n_folds=3, feature_cols=["like"])
+    assert sorted(path.name for path in root.glob("fold_*")) == ["fold_0", "fold_1", "fold_2"]
+    assert store.n_folds == 3 and store.feature_names == ["like"] and len(list(store)) == 3
+    with pytest.raises(FileNotFoundError):
+        store.load_fold(4)
+
+def test_build_from_config_encodes_categoricals_sparse(sample_df, tmp_path):
+    config = {
+        "preprocessing": {"drop_columns": ["iid", "pid", "id"], "fill_strategy": "median", "scaling": "standard",
+                          "categorical_encoding": "onehot", "max_categories": 50, "min_frequency": 5},
+        "models": {"target_variable": "match", "cross_validation_folds": 3},
+    }
+    store = build_fold_store(sample_df, config, str(tmp_path / "folds"))
+    assert store.manifest["categorical_cols"] == ["field"] and store.feature_names == ["attr", "like"]
+    fold = store.load_fold(0)
+    assert sparse.isspmatrix_csr(fold["X_train"]) and fold["X_train"].dtype == np.float32
+    encoder = store.load_encoder(0)
+    assert encoder.min_frequency == 5 and fold["X_val"].shape[1] == 2 + encoder.n_features_out_
+    train = sample_df.iloc[fold["train_index"]]
+    assert set(encoder.vocabularies_["field"]) == set(train["field"].value_counts().loc[lambda c: c >= 5].index)
+
+    config["preprocessing"].update(categorical_encoding="hashing", hashing_features=16)
+    store = build_fold_store(sample_df, config, str(tmp_path / "folds"))
+    assert store.load_fold(1)["X_train"].shape[1] == 2 + 16
+
+def test_knn_imputation_from_config(sample_df, tmp_path):
+    config = {
+        "preprocessing": {"drop_columns": ["iid", "pid"], "fill_strategy": "knn", "scaling": "none",
+                          "knn_imputation": {"n_neighbors": 3, "max_reference_rows": 40, "n_jobs": 2}},
+        "models": {"target_variable": "match", "cross_validation_folds": 3, "random_state": 0},
+    }
+    sample_df.loc[::5, "id"] = np.nan
+    store = build_fold_store(sample_df, config, str(tmp_path / "folds"), categorical_cols=None)
+    assert store.feature_names == ["id", "attr", "like"] and store.manifest["knn_columns"] == ["attr", "like"]
+    fold = store.load_fold(0)
+    imputer = store.load_preprocessor(0).steps[0][1]
+    assert (imputer.n_neighbors, imputer.max_reference_rows, imputer.n_jobs, imputer.random_state) == (3, 40, 2, 0)
+    assert list(imputer.knn_columns_) == [1, 2] and len(imputer.reference_) == 40
+    # Colonne hors notes liées : médiane de l'entraînement
+    train = sample_df.iloc[fold["train_index"]]
+    assert set(fold["X_train"][train["id"].isna().to_numpy(), 0]) == {train["id"].median()}
+
+def test_default_features_exclude_post_decision_columns(sample_df, tmp_path):
+    # Configuration livrée : seuls iid, id, idg et tuition sont retirés à la main
+    df = sample_df.assign(dec=sample_df["match"], dec_o=sample_df["match"], partner=sample_df["pid"] % 3,
+                          you_call=0, them_cal=1, date_3=0, match_es=2.0, attr1_2=20.0, satis_2=5.0, attr3_3=7.0)
+    config = {"preprocessing": {"drop_columns": ["iid", "id", "idg", "tuition"], "fill_strategy": "median"},
+              "models": {"target_variable": "match", "cross_validation_folds": 3}}
+    store = build_fold_store(df, config, str(tmp_path / "folds"), categorical_cols=None)
+    assert store.feature_names == ["attr", "like"]
+    assert not set(store.feature_names) & POST_DECISION_COLUMNS
+    assert is_post_decision("net_pagerank") and is_post_decision("attr1_3") and not is_post_decision("attr1_1")
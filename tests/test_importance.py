@@ -0,0 +1,75 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from src.utils.io import save_model
+import src.models.importance as importance
+from src.models.importance import permutation_importance_batched, select_important_features, compute_model_importance
+
+@pytest.fixture
+def classification_data():
+    rng = np.random.default_rng(9)
+    n = 400
+    X = pd.DataFrame({"like": rng.normal(size=n), "attr": rng.normal(size=n), "noise": rng.normal(size=n)})
+    y = (2 * X["like"] + X["attr"] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    return X, y
+
+def test_importance_ranking(classification_data):
+    X, y = classification_data
+    model = LogisticRegression().fit(X, y)
+    importances = permutation_importance_batched(model, X, y, n_repeats=5, random_state=0)
+    assert importances["feature"].tolist() == ["like", "attr", "noise"]
+    assert importances.loc[2, "importance_mean"] == pytest.approx(0, abs=0.02)
+    assert importances["importance_share"].sum() == pytest.approx(1.0)
+
+def test_shuffled_columns_realigned_on_fit_order(classification_data):
+    X, y = classification_data
+    model = LogisticRegression().fit(X, y)
+    expected = permutation_importance_batched(model, X, y, n_repeats=3, random_state=0)
+    shuffled = permutation_importance_batched(model, X[["noise", "like", "attr"]], y, n_repeats=3, random_state=0)
+    pd.testing.assert_frame_equal(shuffled, expected)
+    with pytest.raises(ValueError):
+        permutation_importance_batched(model, X.drop(columns="attr"), y)
+
+def test_parallel_and_batching_do_not_change_result(classification_data, monkeypatch):
+    X, y = classification_data
+    model = LogisticRegression().fit(X, y)
+    serial = permutation_importance_batched(model, X, y, scoring="roc_auc", n_repeats=4, random_state=1)
+    monkeypatch.setattr(importance, "MAX_BATCH_ELEMENTS", 400 * 3)  # un appel predict par répétition
+    parallel = permutation_importance_batched(model, X, y, scoring="roc_auc", n_repeats=4, n_jobs=2, random_state=1)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+def test_batches_bounded_by_rows_and_columns(classification_data, monkeypatch):
+    X, y = classification_data
+    model = LogisticRegression().fit(X, y)
+    monkeypatch.setattr(importance, "MAX_BATCH_ELEMENTS", 400 * 3 * 2)
+    sizes = []
+    original = importance._predict
+    monkeypatch.setattr(importance, "_predict", lambda m, values, proba: sizes.append(values.shape) or original(m, values, proba))
+    permutation_importance_batched(model, X, y, n_repeats=5, random_state=0)
+    # Référence, puis pour chaque feature deux lots de 2 répétitions et un lot de 1
+    assert sizes == [(400, 3)] + [(800, 3), (800, 3), (400, 3)] * 3
+
+def test_subsampled_regression():
+    rng = np.random.default_rng(10)
+    X = pd.DataFrame({"a": rng.normal(size=1000), "b": rng.normal(size=1000)})
+    y = 3 * X["a"] + rng.normal(scale=0.1, size=1000)
+    model = LinearRegression().fit(X, y)
+    importances = permutation_importance_batched(model, X, y, max_samples=0.2, random_state=0)
+    assert select_important_features(importances, 0.05) == ["a"]
+    with pytest.raises(ValueError):
+        permutation_importance_batched(model, X, y, scoring="unknown")
+
+def test_compute_model_importance(classification_data, tmp_path):
+    X, y = classification_data
+    model_path = tmp_path / "models" / "logreg.pkl"
+    save_model(LogisticRegression().fit(X, y), str(model_path))
+    output_path = tmp_path / "metrics" / "importance.json"
+    importances, selected = compute_model_importance(str(model_path), X, y, importance_threshold=0.05,
+                                                     output_path=str(output_path), random_state=0)
+    assert selected == ["like", "attr"]
+    with open(output_path) as f:
+        report = json.load(f)
+    assert report["selected_features"] == selected
+    assert len(report["importances"]) == 3
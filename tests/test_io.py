@@ -3,7 +3,7 @@ import pytest
 import pandas as pd
 import yaml
 import json
-from src.utils.io import load_config, load_data, save_data, save_model, load_model, save_metrics, ensure_dir
+from src.utils.io import load_config, load_data, save_data, save_model, load_model, save_metrics, save_json, load_json, ensure_dir
 
 # Fixture pour un répertoire temporaire
 @pytest.fixture
@@ -95,8 +95,73 @@ def test_save_metrics(tmp_dir):
         loaded_metrics = json.load(f)
     assert loaded_metrics == metrics, "Les métriques chargées ne correspondent pas"
 
+# Tests pour save_json et load_json
+def test_save_and_load_json(tmp_dir):
+    data = {"features": ["attr", "like"], "n": 2}
+    json_path = tmp_dir / "sub" / "data.json"
+    save_json(data, str(json_path))
+    assert load_json(str(json_path)) == data
+
+def test_load_json_not_found():
+    with pytest.raises(FileNotFoundError):
+        load_json("non_existent.json")
+
 # Tests pour ensure_dir
 def test_ensure_dir(tmp_dir):
     new_dir = tmp_dir / "new_dir"
     ensure_dir(str(new_dir))
-    assert os.path.exists(new_dir), "Le répertoire n'a pas été créé"
\ No newline at end of file
+    assert os.path.exists(new_dir), "Le répertoire n'a pas été créé"
+
+# Tests pour le stockage partitionné
+@pytest.fixture
+def waves_df():
+    return pd.DataFrame({
+        "iid": [1, 2, 3, 4, 5, 6],
+        "wave": [1, 1, 2, 2, 3, 3],
+        "attr": [6.0, 7.0, None, 5.0, 8.0, 9.0],
+        "field": ["Law", "MBA", "Law", float("nan"), "Art", "MBA"],
+    })
+
+def test_save_and_load_partitioned(tmp_dir, waves_df):
+    store = tmp_dir / "store"
+    save_data(waves_df, str(store), partition_by="wave")
+    assert sorted(p.name for p in store.glob("wave=*")) == ["wave=1", "wave=2", "wave=3"]
+    result = load_data(str(store))
+    pd.testing.assert_frame_equal(result, waves_df)
+
+def test_load_partitioned_projection_and_filters(tmp_dir, waves_df):
+    store = tmp_dir / "store"
+    save_data(waves_df, str(store), partition_by="wave")
+    # Une partition illisible prouve qu'elle n'est pas ouverte lorsque le filtre l'exclut
+    (store / "wave=3" / "part-00000.csv").write_text("corrompu\n\"")
+    result = load_data(str(store), columns=["iid", "attr"], filters=[("wave", "in", [1, 2]), ("attr", ">", 5)])
+    assert list(result.columns) == ["iid", "attr"]
+    assert result["iid"].tolist() == [1, 2]
+
+def test_append_new_wave_keeps_existing_partitions(tmp_dir, waves_df):
+    store = tmp_dir / "store"
+    save_data(waves_df[waves_df["wave"] < 3], str(store), partition_by="wave")
+    wave1_file = store / "wave=1" / "part-00000.csv"
+    mtime = os.path.getmtime(wave1_file)
+    save_data(waves_df[waves_df["wave"] == 3], str(store), partition_by="wave")
+    assert os.path.getmtime(wave1_file) == mtime
+    pd.testing.assert_frame_equal(load_data(str(store)), waves_df)
+    save_data(waves_df[waves_df["wave"] == 3], str(store), partition_by="wave", mode="append")
+    assert len(load_data(str(store), filters=[("wave", "==", 3)])) == 4
+
+def test_save_partitioned_schema_mismatch(tmp_dir, waves_df):
+    store = tmp_dir / "store"
+    save_data(waves_df, str(store), partition_by="wave")
+    with pytest.raises(ValueError):
+        save_data(waves_df.drop(columns="field"), str(store), partition_by="wave")
+
+def test_save_partitioned_rejects_index(tmp_dir, waves_df):
+    with pytest.raises(ValueError):
+        save_data(waves_df, str(tmp_dir / "store"), index=True, partition_by="wave")
+    assert not (tmp_dir / "store").exists()
+
+def test_load_data_csv_columns_and_filters(tmp_dir, waves_df):
+    file_path = tmp_dir / "data.csv"
+    waves_df.to_csv(file_path, index=False)
+    result = load_data(str(file_path), columns=["iid"], filters=[("wave", "==", 2)])
+    assert result.to_dict("list") == {"iid": [3, 4]}
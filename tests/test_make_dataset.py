@@ -1,6 +1,7 @@
 import pandas as pd
 import pytest
 from src.data.make_dataset import *
+from src.data.aggregates import RunningAggregate
 
 @pytest.fixture
 def sample_df():
@@ -57,4 +58,28 @@ def test_convert_types():
     df = pd.DataFrame({"num": [1.0, 2.0], "cat": ["a", "b"]})
     df_converted = convert_types(df, {"num": "int", "cat": "category"})
     assert df_converted["num"].dtype == "int"
-    assert df_converted["cat"].dtype.name == "category"
\ No newline at end of file
+    assert df_converted["cat"].dtype.name == "category"
+
+def test_add_aggregated_column_with_running_aggregate(sample_df):
+    aggregate = RunningAggregate("iid", "match").update(sample_df.iloc[:3]).update(sample_df.iloc[3:])
+    df = add_aggregated_column(sample_df.copy(), "iid", "match", "sum", "total_matches", aggregate=aggregate)
+    expected = add_aggregated_column(sample_df.copy(), "iid", "match", "sum", "total_matches")
+    pd.testing.assert_frame_equal(df, expected)
+    with pytest.raises(ValueError):
+        add_aggregated_column(sample_df, "iid", "age", "sum", "total_age", aggregate=aggregate)
+
+def test_harmonize_allocation_scales():
+    df = pd.DataFrame({
+        "wave": [1, 1, 2, 2, 2],
+        "attr1_1": [60.0, 30.0, 8.0, 5.0, None],
+        "sinc1_1": [40.0, 70.0, 2.0, 5.0, None],
+        "attr2_1": [50.0, 50.0, 20.0, 40.0, 50.0],
+        "sinc2_1": [50.0, 50.0, 80.0, 60.0, 50.0],
+    })
+    families = {"attr1_1": ["attr1_1", "sinc1_1"], "attr2_1": ["attr2_1", "sinc2_1"], "absent": ["x"]}
+    result = harmonize_allocation_scales(df, families)
+    assert result["attr1_1"].tolist()[:4] == [60.0, 30.0, 80.0, 50.0]
+    assert result["sinc1_1"].tolist()[:4] == [40.0, 70.0, 20.0, 50.0]
+    assert result["attr2_1"].tolist() == [50.0, 50.0, 20.0, 40.0, 50.0]
+    assert pd.isna(result.loc[4, "attr1_1"])
+    assert result["scale_harmonized"].tolist() == [False, False, True, True, False]
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.io import load_data, save_data
+from src.utils.memory import (MemoryBudget, memory_budget, get_memory_budget, estimate_column_bytes,
+                              estimate_csv_bytes, sample_to_budget, track_peak, MB)
+from src.analysis.correlation import chunked_corr, correlation_matrix, MIN_CHUNK_ROWS
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(2000, 4)), columns=list("abcd"))
+    df["b"] += df["a"]
+    df.loc[rng.choice(2000, 300, replace=False), "a"] = np.nan
+    df.loc[rng.choice(2000, 200, replace=False), "c"] = np.nan
+    df["label"] = np.where(df["d"] > 0, "yes", "no")
+    return df
+
+def test_from_config_and_estimates(sample_df, tmp_path):
+    budget = MemoryBudget.from_config({"memory": {"limit_mb": 2, "chunk_rows": 500}})
+    assert budget.active and budget.limit_bytes == 2 * MB and budget.chunk_rows == 500
+    assert not MemoryBudget.from_config({}).active
+    estimate = estimate_column_bytes(sample_df)
+    assert estimate["a"] == 2000 * 8 and estimate["label"] > 2000 * 8
+    path = tmp_path / "data.csv"
+    sample_df.to_csv(path, index=False)
+    csv_estimate = estimate_csv_bytes(str(path), sample_rows=100)
+    assert csv_estimate["a"] == pytest.approx(2000 * 8, rel=0.1)
+
+def test_chunked_corr_matches_pandas(sample_df):
+    numeric = sample_df[list("abcd")]
+    pd.testing.assert_frame_equal(chunked_corr(numeric, chunk_rows=128), numeric.corr(), atol=1e-10)
+
+def test_chunked_corr_precise_far_from_zero(sample_df):
+    # Les moments centrés évitent la perte de précision des sommes brutes lorsque les valeurs sont décalées
+    shifted = sample_df[list("abcd")] + 1e7
+    pd.testing.assert_frame_equal(chunked_corr(shifted, chunk_rows=128), shifted.corr(), atol=1e-8)
+
+def test_correlation_matrix_switches_strategy(sample_df, caplog):
+    numeric = sample_df[list("abcd")]
+    with memory_budget(MemoryBudget(limit_mb=0.01, chunk_rows=1000, random_state=0)):
+        with caplog.at_level("INFO"):
+            corr = correlation_matrix(sample_df)
+            spearman = correlation_matrix(sample_df, method="spearman")
+    assert "par morceaux" in caplog.text and "échantillon" in caplog.text and "pic mémoire" in caplog.text
+    pd.testing.assert_frame_equal(corr, numeric.corr(), atol=1e-10)
+    assert spearman.shape == (4, 4) and spearman.loc["a", "b"] > 0.5
+    assert not get_memory_budget().active
+
+def test_correlation_chunks_have_a_floor(sample_df, caplog):
+    numeric = sample_df[list("abcd")]
+    # Budget si faible que les morceaux déduits feraient moins d'une ligne
+    with memory_budget(MemoryBudget(limit_mb=0.0005, chunk_rows=100000)):
+        with caplog.at_level("INFO"):
+            corr = correlation_matrix(numeric)
+    assert f"morceaux de {MIN_CHUNK_ROWS} lignes" in caplog.text and "minimum" in caplog.text
+    pd.testing.assert_frame_equal(corr, numeric.corr(), atol=1e-10)
+
+def test_load_data_chunked_under_budget(sample_df, tmp_path):
+    path = tmp_path / "data.csv"
+    sample_df.to_csv(path, index=False)
+    with memory_budget(MemoryBudget(limit_mb=1, chunk_rows=300)):
+        projected = load_data(str(path), columns=["a", "label"], filters=[("label", "==", "yes")])
+    expected = sample_df.loc[sample_df["label"] == "yes", ["a", "label"]].reset_index(drop=True)
+    pd.testing.assert_frame_equal(projected, expected, check_exact=False)
+
+    # Sans accord explicite, pas d'échantillon silencieux : erreur si le résultat ne tient pas
+    with memory_budget(MemoryBudget(limit_mb=0.02, chunk_rows=300, random_state=0)):
+        with pytest.raises(MemoryError):
+            load_data(str(path))
+        sampled = load_data(str(path), allow_sampling=True)
+    assert 0 < len(sampled) < len(sample_df) and list(sampled.columns) == list(sample_df.columns)
+
+def test_load_partitioned_under_budget(sample_df, tmp_path, caplog):
+    store = tmp_path / "store"
+    save_data(sample_df.assign(wave=np.arange(len(sample_df)) % 4), str(store), partition_by="wave")
+    with memory_budget(MemoryBudget(limit_mb=0.03, chunk_rows=300, random_state=0)):
+        # Projection et filtre de partition : l'estimation des seules partitions retenues tient dans le budget
+        projected = load_data(str(store), columns=["a", "wave"], filters=[("wave", "in", [1, 2])])
+        with pytest.raises(MemoryError):
+            load_data(str(store))
+        with caplog.at_level("INFO"):
+            sampled = load_data(str(store), allow_sampling=True)
+    assert "par morceaux" in caplog.text and "échantillon" in caplog.text
+    assert len(projected) == 1000 and list(projected.columns) == ["a", "wave"]
+    assert 0 < len(sampled) < len(sample_df) and set(sampled["wave"]) == {0, 1, 2, 3}
+
+def test_sample_to_budget_and_peak(sample_df):
+    assert sample_to_budget(sample_df, "test") is sample_df
+    with memory_budget(MemoryBudget(limit_mb=0.05, random_state=0)):
+        sampled = sample_to_budget(sample_df, "test")
+        with track_peak("test") as measure:
+            np.ones(MB // 8)
+    assert len(sampled) < len(sample_df) and estimate_column_bytes(sampled).sum() <= 0.05 * MB
+    assert measure["peak_mb"] >= 1.0
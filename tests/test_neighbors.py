@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.spatial.distance import cdist
+from src.analysis.neighbors import ParticipantIndex, build_participant_matrix, PREFERENCE_COLUMNS
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(0)
+    n_participants = 40
+    prefs = rng.dirichlet(np.ones(6), size=n_participants) * 100
+    participants = pd.DataFrame(prefs, columns=PREFERENCE_COLUMNS)
+    participants["iid"] = np.arange(1, n_participants + 1)
+    participants["wave"] = np.where(participants["iid"] <= 30, 1, 2)
+    # Deux rendez-vous par participant, comme dans les données brutes
+    return pd.concat([participants, participants], ignore_index=True)
+
+def brute_force(participants, points, k):
+    dist = cdist(points, participants.to_numpy())
+    order = np.argsort(dist, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(dist, order, axis=1), participants.index.to_numpy()[order]
+
+def test_build_participant_matrix(sample_df):
+    participants = build_participant_matrix(sample_df, PREFERENCE_COLUMNS)
+    assert len(participants) == 40
+    assert participants.index.is_unique
+
+@pytest.mark.parametrize("algorithm", ["kd_tree", "ball_tree"])
+def test_query_matches_brute_force(sample_df, algorithm):
+    index = ParticipantIndex(algorithm=algorithm).fit(sample_df)
+    participants = build_participant_matrix(sample_df, PREFERENCE_COLUMNS)
+    dist, ids = index.query(participants.iloc[:5], k=3)
+    expected_dist, expected_ids = brute_force(participants, participants.iloc[:5].to_numpy(), 3)
+    np.testing.assert_allclose(dist, expected_dist)
+    np.testing.assert_array_equal(ids, expected_ids)
+
+def test_incremental_add_uses_buffer(sample_df):
+    wave1 = sample_df[sample_df["wave"] == 1]
+    wave2 = sample_df[sample_df["wave"] == 2]
+    index = ParticipantIndex(rebuild_ratio=0.5).fit(wave1)
+    index.add(wave2)
+    assert len(index) == 40
+    assert len(index._buffer_ids) == 10  # pas de reconstruction sous le seuil
+    participants = build_participant_matrix(sample_df, PREFERENCE_COLUMNS)
+    dist, ids = index.query(participants.to_numpy(), k=4)
+    expected_dist, expected_ids = brute_force(participants, participants.to_numpy(), 4)
+    np.testing.assert_allclose(dist, expected_dist)
+    np.testing.assert_array_equal(ids, expected_ids)
+
+def test_add_duplicate_raises(sample_df):
+    index = ParticipantIndex().fit(sample_df)
+    with pytest.raises(ValueError):
+        index.add(sample_df.head(1))
+
+def test_query_radius(sample_df):
+    index = ParticipantIndex(rebuild_ratio=1.0).fit(sample_df[sample_df["wave"] == 1])
+    index.add(sample_df[sample_df["wave"] == 2])
+    participants = build_participant_matrix(sample_df, PREFERENCE_COLUMNS)
+    distances, ids = index.query_radius(participants.iloc[:3], radius=20)
+    full = cdist(participants.iloc[:3].to_numpy(), participants.to_numpy())
+    for i in range(3):
+        assert set(ids[i]) == set(participants.index[full[i] <= 20])
+        assert np.all(np.diff(distances[i]) >= 0)
+
+def test_neighbors_of_excludes_self(sample_df):
+    index = ParticipantIndex().fit(sample_df)
+    neighbors = index.neighbors_of([1, 2], k=3)
+    assert len(neighbors) == 6
+    assert not (neighbors["iid"] == neighbors["neighbor"]).any()
+    assert neighbors.groupby("iid")["rank"].apply(list).tolist() == [[1, 2, 3], [1, 2, 3]]
+
+def test_save_and_load(sample_df, tmp_path):
+    index = ParticipantIndex().fit(sample_df)
+    path = tmp_path / "index" / "participants.pkl"
+    index.save(str(path))
+    loaded = ParticipantIndex.load(str(path))
+    np.testing.assert_array_equal(loaded.query(np.full(6, 100 / 6), k=5)[1], index.query(np.full(6, 100 / 6), k=5)[1])
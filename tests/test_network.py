@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.network import MatchNetwork, add_network_features
+
+@pytest.fixture
+def sample_df():
+    # Vague 1 : 1 et 2 se plaisent mutuellement, 3 dit oui à 1 sans retour ; vague 2 : 10 et 11
+    rows = [
+        (1, 2, 1, 1, 1, 1), (2, 1, 1, 1, 1, 1),
+        (1, 3, 1, 0, 1, 0), (3, 1, 1, 1, 0, 0),
+        (2, 3, 1, 0, 0, 0), (3, 2, 1, 0, 0, 0),
+        (10, 11, 2, 1, 0, 0), (11, 10, 2, 0, 1, 0),
+    ]
+    return pd.DataFrame(rows, columns=["iid", "pid", "wave", "dec", "dec_o", "match"])
+
+def test_participant_metrics(sample_df):
+    metrics = MatchNetwork(sample_df).participant_metrics()
+    assert metrics.loc[1, ["n_dates", "yes_given", "yes_received", "matches"]].tolist() == [2, 1, 2, 1]
+    assert metrics.loc[3, "selectivity"] == 0.5 and metrics.loc[3, "popularity"] == 0
+    assert metrics.loc[3, "reciprocity"] == 0 and metrics.loc[1, "reciprocity"] == 1
+    assert metrics.loc[10, "wave"] == 2 and metrics.loc[11, "yes_received"] == 1
+    # Le participant le plus désiré est le plus central, et les scores sont de moyenne 1 par vague
+    assert metrics.loc[[1, 2, 3], "pagerank"].idxmax() == 1
+    np.testing.assert_allclose(metrics.groupby("wave")["pagerank"].mean(), 1.0)
+
+def test_dec_o_completes_missing_rows(sample_df):
+    # Sans la ligne (3, 1), le oui de 3 à 1 reste connu par dec_o de la ligne (1, 3)
+    metrics = MatchNetwork(sample_df.drop(index=3)).participant_metrics()
+    assert metrics.loc[1, "yes_received"] == 2 and metrics.loc[3, "n_dates"] == 2
+
+def test_wave_summary(sample_df):
+    summary = MatchNetwork(sample_df).wave_summary()
+    assert summary["n_participants"].tolist() == [3, 2]
+    assert summary["n_yes"].tolist() == [3, 1]
+    assert summary.loc[1, "reciprocity"] == pytest.approx(2 / 3)
+    assert summary.loc[2, "reciprocity"] == 0
+
+def test_add_network_features(sample_df):
+    df = add_network_features(sample_df.set_index(pd.Index(range(100, 108))))
+    assert list(df.index) == list(range(100, 108))
+    assert (df.loc[df["iid"] == 1, "net_yes_received"] == 2).all()
+    assert "net_wave" not in df.columns
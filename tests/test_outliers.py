@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.outliers import OutlierScorer, detect_outliers
+from src.analysis.sketches import KLLSketch
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"attr": rng.normal(6, 1, 500), "sinc": rng.normal(7, 1, 500), "field": ["x"] * 500})
+    df.loc[3, "attr"] = 40.0
+    df.loc[7, "sinc"] = -20.0
+    df.loc[9, "attr"] = np.nan
+    return df
+
+def test_iqr_flags_match_pandas_quantiles(sample_df):
+    scorer = OutlierScorer("iqr").fit(sample_df)
+    flags = scorer.flags(sample_df)
+    assert list(flags.columns) == ["attr", "sinc"] and flags.shape == (500, 2)
+    q1, q3 = sample_df["attr"].quantile(0.25), sample_df["attr"].quantile(0.75)
+    expected = (sample_df["attr"] < q1 - 1.5 * (q3 - q1)) | (sample_df["attr"] > q3 + 1.5 * (q3 - q1))
+    assert flags["attr"].equals(expected)
+    assert flags.at[3, "attr"] and flags.at[7, "sinc"] and not flags.at[9, "attr"]
+    scores, flagged = scorer.scores(sample_df).to_numpy(), flags.to_numpy()
+    assert (scores[flagged] > 0).all() and (np.nan_to_num(scores[~flagged]) == 0).all()
+
+def test_mad_and_isolation_forest(sample_df):
+    flags = detect_outliers(sample_df, "mad")
+    assert flags.at[3, "attr"] and flags.at[7, "sinc"]
+    assert flags.to_numpy().sum() < 20
+    flags = detect_outliers(sample_df, "isolation_forest", contamination=0.01, random_state=0)
+    assert flags.loc[[3, 7]].any(axis=1).all()
+    with pytest.raises(ValueError):
+        OutlierScorer("zscore")
+
+def test_streaming_matches_exact_fences(sample_df):
+    scorer = OutlierScorer("iqr", random_state=0)
+    for start in range(0, 500, 100):
+        scorer.partial_fit(sample_df.iloc[start:start + 100])
+    exact = OutlierScorer("iqr").fit(sample_df)
+    assert np.allclose(scorer.fences.to_numpy(), exact.fences.to_numpy(), atol=0.2)
+    assert scorer.flags(sample_df).loc[[3, 7]].any(axis=1).all()
+    with pytest.raises(ValueError):
+        OutlierScorer("isolation_forest").partial_fit(sample_df)
+
+def test_kll_sketch_quantiles_and_merge():
+    values = np.random.default_rng(1).uniform(0, 1, 20000)
+    left = KLLSketch(k=200, random_state=0).update(values[:10000])
+    right = KLLSketch(k=200, random_state=1).update(values[10000:])
+    merged = left.merge(right)
+    assert merged.n == 20000
+    assert sum(len(items) for items in merged.compactors) < 1000
+    assert np.allclose(merged.quantile([0.1, 0.5, 0.9]), np.quantile(values, [0.1, 0.5, 0.9]), atol=0.02)
+    assert abs(merged.rank(0.25) - 0.25) < 0.02
+    assert np.isnan(KLLSketch().quantile(0.5)).all()
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import permutation_test as scipy_permutation_test
+from src.analysis.permutation import permutation_test, _permutation_block
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(6)
+    n = 240
+    iid = np.repeat(np.arange(20), 12)
+    dec = rng.integers(0, 2, n)
+    df = pd.DataFrame({
+        "iid": iid,
+        "wave": iid // 10,
+        "dec": dec,
+        "attr": rng.normal(6, 2, n) + 1.5 * dec,
+        "sinc": rng.normal(7, 2, n),
+    })
+    df.loc[::9, "sinc"] = np.nan
+    return df
+
+def test_permutation_detects_effect(sample_df):
+    result = permutation_test(sample_df, ["attr", "sinc"], "dec", n_permutations=2000, random_state=0)
+    assert result.loc["attr", "p_value"] < 0.01
+    assert result.loc["sinc", "p_value"] > 0.05
+    assert result.loc["attr", "reject"] and not result.loc["sinc", "reject"]
+    expected = sample_df.groupby("dec")["sinc"].mean()
+    assert result.loc["sinc", "difference"] == pytest.approx(expected[1] - expected[0])
+    assert result.loc["sinc", "n_0"] + result.loc["sinc", "n_1"] == sample_df["sinc"].notna().sum()
+
+def test_pvalue_close_to_scipy(sample_df):
+    data = sample_df.dropna(subset=["sinc"])
+    x, y = data.loc[data["dec"] == 1, "sinc"], data.loc[data["dec"] == 0, "sinc"]
+    expected = scipy_permutation_test((x, y), lambda a, b: np.mean(a) - np.mean(b), n_resamples=4000,
+                                      random_state=0).pvalue
+    result = permutation_test(data, ["sinc"], "dec", n_permutations=4000, random_state=0)
+    assert result.loc["sinc", "p_value"] == pytest.approx(expected, abs=0.05)
+
+def test_within_strata_keeps_label_counts(sample_df):
+    labels = sample_df["dec"].to_numpy(dtype=float)
+    strata = sample_df["iid"].to_numpy()
+    values = np.ones((len(labels), 1))
+    # Avec une variable égale au nombre de "oui" de la strate, la statistique est invariante
+    # par permutation intra-strate : toutes les permutations sont au moins aussi extrêmes.
+    values[:, 0] = sample_df.groupby("iid")["dec"].transform("sum")
+    observed = np.array([0.0])
+    counts = _permutation_block(values, np.ones_like(values), labels, strata, observed, 50, np.random.SeedSequence(0))
+    assert counts[0] == 50
+
+def test_processes_and_blocks_do_not_change_result(sample_df):
+    serial = permutation_test(sample_df, ["attr", "sinc"], "dec", n_permutations=600, block_size=200,
+                              strata_col="wave", random_state=1)
+    parallel = permutation_test(sample_df, ["attr", "sinc"], "dec", n_permutations=600, block_size=200,
+                                strata_col="wave", n_jobs=2, random_state=1)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+def test_non_binary_label_raises(sample_df):
+    with pytest.raises(ValueError):
+        permutation_test(sample_df, ["attr"], "iid", n_permutations=10)
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression
+from src.data.preprocess import (SparseOneHotEncoder, SparseHashingEncoder, make_categorical_encoder,
+                                 build_sparse_design_matrix, IndexedKNNImputer, OTHER_LABEL)
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        "field": ["Law", "law ", "Math", "Art", None, "Law", "Math", ""],
+        "from": ["Paris", "NYC", "NYC", "NYC", "Rome", "Paris", "NYC", "Oslo"],
+        "attr": [5.0, 6.0, 7.0, 8.0, 5.0, 6.0, 7.0, 8.0],
+        "dec": [1, 0, 1, 0, 1, 0, 1, 0],
+    })
+
+def test_onehot_vocabulary_capped_with_other_bucket(sample_df):
+    encoder = SparseOneHotEncoder(["field", "from"], max_categories=2, min_frequency=1).fit(sample_df)
+    assert list(encoder.vocabularies_["field"]) == ["Law", "Math"]
+    assert list(encoder.get_feature_names_out()) == ["field=Law", "field=Math", f"field={OTHER_LABEL}",
+                                                      "from=NYC", "from=Paris", f"from={OTHER_LABEL}"]
+    matrix = encoder.transform(sample_df)
+    assert sparse.isspmatrix_csr(matrix) and matrix.shape == (8, 6) and matrix.dtype == np.float32
+    dense = matrix.toarray()
+    assert dense[1].tolist() == [0, 0, 1, 1, 0, 0]  # "law " : hors vocabulaire (sensible à la casse)
+    assert dense[4].tolist() == [0, 0, 0, 0, 0, 1]  # field manquant : ligne vide
+    assert dense[7].tolist() == [0, 0, 0, 0, 0, 1]  # chaîne vide : manquante
+    unseen = encoder.transform(pd.DataFrame({"field": ["Physics"], "from": ["Lima"]})).toarray()
+    assert unseen.tolist() == [[0, 0, 1, 0, 0, 1]]
+
+def test_min_frequency(sample_df):
+    encoder = SparseOneHotEncoder(["from"], min_frequency=2).fit(sample_df)
+    assert list(encoder.vocabularies_["from"]) == ["NYC", "Paris"]
+
+def test_hashing_encoder_is_stateless_and_sparse(sample_df):
+    encoder = make_categorical_encoder("hashing", ["field", "from"], n_features=64).fit(sample_df)
+    matrix = encoder.transform(sample_df)
+    assert matrix.shape == (8, 64)
+    assert matrix.getnnz(axis=1).tolist() == [2, 2, 2, 2, 1, 2, 2, 1]
+    assert (abs(matrix).sum(axis=1).A1 <= 2).all()
+    # Même valeur -> même indice d'une ligne à l'autre
+    assert (matrix[0] != matrix[5]).nnz == 0
+    with pytest.raises(ValueError):
+        make_categorical_encoder("target")
+
+def test_sparse_design_matrix_feeds_model(sample_df):
+    encoder = make_categorical_encoder("onehot", ["field", "from"]).fit(sample_df)
+    X = build_sparse_design_matrix(sample_df, ["attr"], encoder)
+    assert sparse.isspmatrix_csr(X) and X.shape == (8, 1 + encoder.n_features_out_)
+    model = LogisticRegression().fit(X, sample_df["dec"])
+    assert model.predict(X).shape == (8,)
+
+@pytest.fixture
+def ratings():
+    rng = np.random.default_rng(0)
+    latent = rng.normal(size=(2000, 1))
+    values = latent + 0.1 * rng.normal(size=(2000, 4))
+    missing = values.copy()
+    mask = rng.random(values.shape) < 0.1
+    missing[mask] = np.nan
+    return values, missing, mask
+
+def test_knn_imputer_uses_related_columns(ratings):
+    values, missing, mask = ratings
+    imputer = IndexedKNNImputer(n_neighbors=5, batch_size=100, n_jobs=2).fit(missing)
+    imputed = imputer.transform(missing)
+    assert not np.isnan(imputed).any()
+    assert np.array_equal(imputed[~mask], missing[~mask])
+    knn_error = np.abs(imputed[mask] - values[mask]).mean()
+    median_error = np.abs(np.nanmedian(missing, axis=0)[np.nonzero(mask)[1]] - values[mask]).mean()
+    assert knn_error < median_error / 3
+    # Un seul index, construit à l'apprentissage, quel que soit le motif de valeurs manquantes
+    tree = imputer.tree_
+    imputer.transform(missing[:100])
+    assert imputer.tree_ is tree
+
+def test_knn_imputer_options_and_fallbacks(ratings):
+    _, missing, _ = ratings
+    sparse_column = np.full((len(missing), 1), np.nan)
+    sparse_column[:10, 0] = 3.0
+    X = np.hstack([missing, sparse_column])
+    imputer = IndexedKNNImputer(weights="distance", algorithm="ball_tree", max_reference_rows=500, random_state=0).fit(X)
+    assert list(imputer.knn_columns_) == [0, 1, 2, 3] and len(imputer.reference_) == 500
+    imputed = imputer.transform(np.vstack([X, np.full((1, 5), np.nan)]))
+    assert not np.isnan(imputed).any() and (imputed[10:, 4] == 3.0).all()
+    # Trop peu de lignes complètes : repli sur la médiane
+    few = np.array([[1.0, np.nan], [np.nan, 2.0], [3.0, 4.0]])
+    fallback = IndexedKNNImputer(n_neighbors=5).fit(few)
+    assert fallback.tree_ is None and len(fallback.knn_columns_) == 0
+    np.testing.assert_array_equal(fallback.transform(few), [[1.0, 3.0], [2.0, 2.0], [3.0, 4.0]])
+    with pytest.raises(ValueError):
+        IndexedKNNImputer(weights="gaussian").fit(X)
+
+def test_knn_imputer_restricted_columns(ratings):
+    values, missing, mask = ratings
+    X = np.hstack([missing, np.where(mask[:, :1], np.nan, 10.0)])
+    imputer = IndexedKNNImputer(columns=[0, 1, 2, 3]).fit(X)
+    assert list(imputer.knn_columns_) == [0, 1, 2, 3] and imputer.reference_.shape[1] == 4
+    imputed = imputer.transform(X)
+    assert (imputed[:, 4] == 10.0).all()
+    assert np.abs(imputed[:, :4][mask] - values[mask]).mean() < 0.3
@@ -2,6 +2,7 @@ import pandas as pd
 import pytest
 from src.visualization.qualitative import (plot_bar_chart, plot_pie_chart, plot_contingency_heatmap,
                                       plot_stacked_bar, plot_countplot_with_hue, plot_mosaic)
+from src.analysis.contingency import ContingencyEngine
 
 @pytest.fixture
 def sample_qual_df(tmpdir):
@@ -30,4 +31,14 @@ def test_plot_countplot_with_hue(sample_qual_df):
 
 def test_plot_mosaic(sample_qual_df):
     df, figures_path = sample_qual_df
-    plot_mosaic(df, ['Cat', 'Group'], figures_path)
\ No newline at end of file
+    plot_mosaic(df, ['Cat', 'Group'], figures_path)
+
+def test_plots_accept_precomputed_tables(sample_qual_df):
+    df, figures_path = sample_qual_df
+    engine = ContingencyEngine(df)
+    table = engine.table('Cat', 'Group')
+    plot_bar_chart(df, 'Cat', figures_path, counts=engine.counts('Cat'))
+    plot_contingency_heatmap(df, 'Cat', 'Group', figures_path, table=table)
+    plot_stacked_bar(df, 'Cat', 'Group', figures_path, table=table)
+    plot_countplot_with_hue(df, 'Cat', 'Group', figures_path, table=table)
+    plot_mosaic(df, ['Cat', 'Group'], figures_path, table=table)
@@ -1,5 +1,7 @@
 import pandas as pd
+from pathlib import Path
 import pytest
+from src.analysis.outliers import OutlierScorer
 from src.visualization.quantitative import (plot_correlation_matrix, plot_feature_distributions, 
                                        plot_feature_target_relations, analyse_multivariee_selective,
                                        plot_boxplots, diagramme_dispersion_cibles, plot_boxenplot)
@@ -43,4 +45,17 @@ def test_diagramme_dispersion_cibles(sample_quant_df, sample_target_df):
 
 def test_plot_boxenplot(sample_quant_df):
     df, figures_path = sample_quant_df
-    plot_boxenplot(df, figures_path)
\ No newline at end of file
+    plot_boxenplot(df, figures_path)
+
+def test_plot_feature_target_relations_top_k(sample_quant_df, sample_target_df):
+    df, figures_path = sample_quant_df
+    ranking = plot_feature_target_relations(df, sample_target_df, figures_path, top_k=1)
+    assert ranking["selected"].sum() == 1
+    assert len(list(Path(figures_path).glob("relation_*.png"))) == 1
+
+def test_plots_reuse_outlier_scorer(sample_quant_df, monkeypatch):
+    df, figures_path = sample_quant_df
+    scorer = OutlierScorer("mad").fit(df)
+    monkeypatch.setattr(OutlierScorer, "fit", lambda *args: pytest.fail("quantiles recomputed"))
+    plot_boxplots(df, figures_path, scorer=scorer)
+    plot_boxenplot(df, figures_path, scorer=scorer)
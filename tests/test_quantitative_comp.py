@@ -3,6 +3,9 @@ import pytest
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+from src.utils.rendering import capture_figures
+from src.data.reshape import TimeFamilies
+from src.analysis.permutation import permutation_test
 from src.visualization.quantitative import (
     plot_temporal_histograms,
     plot_temporal_histograms2,
@@ -75,4 +78,53 @@ def test_plot_correlation_heatmap(sample_df):
     df, figures_path = sample_df
     plot_correlation_heatmap(df, ["attr", "sinc", "intel", "dec"], save_path=figures_path)
     output_file = Path(figures_path) / "Heatmap_correlation.png"
-    assert output_file.exists(), f"Le fichier {output_file} n'a pas été créé."
\ No newline at end of file
+    assert output_file.exists(), f"Le fichier {output_file} n'a pas été créé."
+
+def test_plots_with_bootstrap_ci(sample_df):
+    df, figures_path = sample_df
+    plot_temporal_histograms2(df, "attr1_", ["1"], "gender", save_path=figures_path, show_ci=True, n_resamples=50, random_state=0)
+    assert (Path(figures_path) / "temporal_histogram_attr1__time_1_by_gender.png").exists()
+    plot_violin_comparison(df, ["attr3_1", "attr_o"], "gender", save_path=figures_path, show_ci=True, n_resamples=50, random_state=0)
+    assert (Path(figures_path) / "Distributions_attr3_1_attr_o_by_gender.png").exists()
+
+def test_violin_ci_follows_hue_order(sample_df):
+    # Groupes textuels dont l'ordre d'apparition diffère de l'ordre alphabétique
+    df = sample_df[0].assign(gender=["M", "F", "M", "F"])
+    with capture_figures(mode="figure") as sink:
+        plot_violin_comparison(df, ["attr3_1", "attr_o"], "gender", show_ci=True, n_resamples=50, random_state=0)
+    ax = sink.figures["Distributions_attr3_1_attr_o_by_gender.png"].axes[0]
+    assert [text.get_text() for text in ax.get_legend().get_texts()] == ["M", "F"]
+    points = [line.get_xydata()[0] for line in ax.lines if line.get_marker() == "o"]
+    # Premier groupe (M) à gauche du premier violon : moyenne de attr3_1 pour M
+    assert points[0][0] == pytest.approx(-0.1) and points[0][1] == pytest.approx(df.loc[df["gender"] == "M", "attr3_1"].mean())
+
+def test_plot_boxplots_by_decision_with_tests(sample_df):
+    df, figures_path = sample_df
+    results = permutation_test(df, ["attr", "sinc"], "dec", n_permutations=20, random_state=0)
+    plot_boxplots_by_decision(df, ["attr", "sinc"], "dec", save_path=figures_path, test_results=results)
+    assert (Path(figures_path) / "Boxplots_by_dec.png").exists()
+
+def test_plots_share_time_families(sample_df, monkeypatch):
+    df, figures_path = sample_df
+    families = TimeFamilies(df)
+    plot_temporal_histograms(df, "attr1_", ["1", "2"], "gender", save_path=figures_path, families=families)
+    plot_temporal_histograms2(df, "attr1_", ["1", "2"], "gender", save_path=figures_path, families=families)
+    plot_violin_comparison(df, ["attr3_1", "attr_o"], "gender", save_path=figures_path, families=families)
+    views = dict(families._views)
+    monkeypatch.setattr("src.data.reshape.long_format", lambda *args, **kwargs: pytest.fail("vue reconstruite"))
+    plot_temporal_histograms2(df, "attr1_", ["1", "2"], "gender", save_path=figures_path, families=families)
+    plot_violin_comparison(df, ["attr3_1", "attr_o"], "gender", save_path=figures_path, families=families)
+    assert families._views == views and len(views) == 2
+
+def test_ci_overlays_resample_participants(sample_df):
+    # Chaque participant répété sur 10 rendez-vous : l'intervalle affiché ne doit pas se resserrer
+    df = sample_df[0].assign(iid=range(4))
+    dates = df.loc[df.index.repeat(10)].reset_index(drop=True)
+
+    def spans(data):
+        with capture_figures(mode="figure") as sink:
+            plot_temporal_histograms2(data, "attr1_", ["1"], "gender", show_ci=True, n_resamples=50, random_state=0)
+        ax = sink.figures["temporal_histogram_attr1__time_1_by_gender.png"].axes[0]
+        return [(patch.get_x(), patch.get_width()) for patch in ax.patches if "IC" in patch.get_label()]
+
+    assert len(spans(df)) == 2 and spans(dates) == pytest.approx(spans(df))
@@ -0,0 +1,89 @@
+import pandas as pd
+import pytest
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import src.utils.rendering as rendering
+from src.utils.rendering import (capture_figures, save_figure, RenderProfile, render_profile, resolve_figsize,
+                                  render_full_resolution, clear_render_cache)
+from src.utils.basic_visualization import plot_missing_values
+from src.visualization.quantitative import plot_correlation_heatmap, plot_feature_distributions
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({"attr": [6, 7, None, 8], "sinc": [7, 6, 8, 5], "dec": [0, 1, 0, 1]})
+
+def test_capture_bytes_writes_nothing(sample_df, tmp_path):
+    with capture_figures() as sink:
+        plot_correlation_heatmap(sample_df, ["attr", "sinc", "dec"], save_path=str(tmp_path))
+        plot_missing_values(sample_df, str(tmp_path))
+    assert list(sink) == ["Heatmap_correlation.png", "Matrix_missing_values.png", "Heatmap_missing_values.png"]
+    assert sink["Heatmap_correlation.png"].startswith(b"\x89PNG")
+    assert not any(tmp_path.iterdir())
+    assert not plt.get_fignums()
+
+def test_capture_figure_objects_and_svg(sample_df):
+    with capture_figures(mode="figure") as sink:
+        plot_feature_distributions(sample_df[["sinc"]], None)
+    assert isinstance(sink["sinc_distribution.png"], Figure)
+    with capture_figures(fmt="svg") as sink:
+        plot_correlation_heatmap(sample_df, ["attr", "sinc"])
+    assert b"<svg" in sink["Heatmap_correlation.svg"]
+
+def test_save_figure_to_disk_and_without_directory(tmp_path, caplog):
+    plt.figure()
+    save_figure(str(tmp_path / "new_dir"), "figure")
+    assert (tmp_path / "new_dir" / "figure.png").exists()
+    plt.figure()
+    save_figure(None, "figure.png")
+    assert "Aucun dossier" in caplog.text
+    assert not plt.get_fignums()
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        with capture_figures(mode="html"):
+            pass
+
+def test_render_profile_from_config(sample_df, tmp_path):
+    config = {"visualization": {"dpi": 50, "figsize": [4, 3], "save_format": "svg", "vector_format": "svgz"}}
+    with render_profile(RenderProfile.from_config(config)):
+        assert resolve_figsize(None, (10, 6)) == (4, 3)
+        assert resolve_figsize((8, 8), (10, 6)) == (8, 8)
+        with capture_figures(mode="figure") as sink:
+            plot_correlation_heatmap(sample_df, ["attr", "sinc"])
+            plot_feature_distributions(sample_df[["sinc"]], None)
+        assert tuple(sink["Heatmap_correlation.svg"].get_size_inches()) == (4, 3)
+        # Histogramme + QQ-plot : format matriciel du profil, taille du profil
+        assert tuple(sink["sinc_distribution.svg"].get_size_inches()) == (4, 3)
+        plot_correlation_heatmap(sample_df, ["attr", "sinc"], save_path=str(tmp_path))
+    assert (tmp_path / "Heatmap_correlation.svg").exists()
+    assert resolve_figsize(None, (10, 6)) == (10, 6)
+
+def test_thumbnail_then_full_resolution(sample_df, tmp_path):
+    clear_render_cache()
+    with render_profile(RenderProfile(dpi=100, thumbnail=True, thumbnail_dpi=20)):
+        with capture_figures() as thumbnails:
+            plot_correlation_heatmap(sample_df, ["attr", "sinc"], figsize=(4, 4))
+        full = render_full_resolution("Heatmap_correlation.png", directory=str(tmp_path))
+    assert len(full) > len(thumbnails["Heatmap_correlation.png"])
+    assert (tmp_path / "Heatmap_correlation.png").read_bytes() == full
+    with pytest.raises(KeyError):
+        render_full_resolution("inconnue.png")
+    clear_render_cache()
+
+def test_render_cache_keyed_by_directory_and_bounded(sample_df, tmp_path, monkeypatch):
+    clear_render_cache()
+    monkeypatch.setattr(rendering, "RENDER_CACHE_SIZE", 2)
+    with render_profile(RenderProfile(thumbnail=True, thumbnail_dpi=20)):
+        plot_correlation_heatmap(sample_df, ["attr", "sinc"], figsize=(4, 4), save_path=str(tmp_path / "a"))
+        plot_correlation_heatmap(sample_df, ["attr", "sinc", "dec"], figsize=(4, 4), save_path=str(tmp_path / "b"))
+        with pytest.raises(KeyError):
+            render_full_resolution("Heatmap_correlation.png")
+        first = render_full_resolution("Heatmap_correlation.png", figures_path=str(tmp_path / "a"))
+        second = render_full_resolution("Heatmap_correlation.png", figures_path=str(tmp_path / "b"))
+        assert first != second
+        plot_correlation_heatmap(sample_df, ["attr", "sinc"], figsize=(4, 4), save_path=str(tmp_path / "c"))
+    # La vignette la moins récemment utilisée (dossier a) a été oubliée
+    assert [key[0] for key in rendering._RENDER_CACHE] == [str(tmp_path / "b"), str(tmp_path / "c")]
+    clear_render_cache(str(tmp_path / "b"))
+    assert len(rendering._RENDER_CACHE) == 1
+    clear_render_cache()
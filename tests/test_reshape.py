@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.reshape import discover_time_families, long_format, TimeFamilies
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(7)
+    n = 20
+    return pd.DataFrame({
+        "iid": np.arange(n),
+        "gender": rng.integers(0, 2, n),
+        "attr1_1": rng.normal(20, 5, n),
+        "attr1_2": rng.normal(21, 5, n),
+        "attr1_3": rng.normal(22, 5, n),
+        "attr1_s": rng.normal(20, 5, n),
+        "attr3_1": rng.normal(7, 1, n),
+        "satis_2": rng.normal(5, 1, n),
+        "int_corr": rng.normal(0, 0.3, n),
+    })
+
+def test_discover_time_families(sample_df):
+    families = discover_time_families(sample_df.columns)
+    assert families == {"attr1_": ["1", "2", "3", "s"]}
+    assert discover_time_families(sample_df.columns, min_times=1)["satis_"] == ["2"]
+
+def test_long_format_matches_melt(sample_df):
+    result = long_format(sample_df, ["attr1_1", "attr1_2"], ["gender"], var_name="Variable", value_name="Valeur")
+    expected = sample_df.melt(id_vars=["gender"], value_vars=["attr1_1", "attr1_2"], var_name="Variable", value_name="Valeur")
+    pd.testing.assert_frame_equal(result.drop(columns="row"), expected.astype({"Variable": result["Variable"].dtype}))
+    assert result["Variable"].cat.codes.dtype == np.int8
+
+def test_long_view_is_cached(sample_df):
+    families = TimeFamilies(sample_df)
+    view = families.long("attr1_", ["gender"])
+    assert families.long("attr1_", ["gender"]) is view
+    assert list(view["time"].cat.categories) == ["1", "2", "3", "s"]
+    at_time_2 = view[view["time"] == "2"]
+    np.testing.assert_array_equal(at_time_2["value"], sample_df["attr1_2"])
+    np.testing.assert_array_equal(at_time_2["row"], np.arange(len(sample_df)))
+
+def test_stacked_view_is_cached(sample_df):
+    families = TimeFamilies(sample_df)
+    view = families.stack(["attr1_1", "attr1_2"], ["gender"], var_name="Variable", value_name="Valeur")
+    assert families.stack(["attr1_1", "attr1_2"], ["gender"], var_name="Variable", value_name="Valeur") is view
+    np.testing.assert_array_equal(view["Valeur"], np.concatenate([sample_df["attr1_1"], sample_df["attr1_2"]]))
+
+def test_summary_matches_groupby(sample_df):
+    families = TimeFamilies(sample_df)
+    summary = families.summary("attr1_", by="gender", times=["1", "3"])
+    assert summary.loc[("3", 1), "mean"] == pytest.approx(sample_df.loc[sample_df["gender"] == 1, "attr1_3"].mean())
+    assert set(summary.index.get_level_values("time")) == {"1", "3"}
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import spearmanr, pointbiserialr
+from src.analysis.screening import screen_features, select_features
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(2)
+    n = 300
+    X = pd.DataFrame({
+        "like": rng.normal(6, 2, n),
+        "attr": rng.normal(6, 2, n),
+        "noise": rng.normal(0, 1, n),
+    })
+    X.loc[::17, "attr"] = np.nan
+    y = pd.DataFrame({
+        "dec": (X["like"] + rng.normal(0, 0.5, n) > 6).astype(int),
+        "prob": X["like"] * 0.8 + rng.normal(0, 0.3, n),
+    })
+    return X, y
+
+def test_screen_features_scores(sample_data):
+    X, y = sample_data
+    ranking = screen_features(X, y, random_state=0)
+    assert len(ranking) == 6
+    dec = ranking[ranking["target"] == "dec"].set_index("feature")
+    assert dec.loc["like", "rank"] == 1
+    assert dec.loc["like", "task"] == "classification"
+    assert dec.loc["like", "pearson"] == pytest.approx(pointbiserialr(y["dec"], X["like"])[0])
+    prob = ranking[ranking["target"] == "prob"].set_index("feature")
+    assert prob.loc["like", "task"] == "regression"
+    assert prob.loc["noise", "spearman"] == pytest.approx(spearmanr(X["noise"], y["prob"])[0])
+
+def test_select_features(sample_data):
+    X, y = sample_data
+    ranking = screen_features(X, y, random_state=0)
+    top = select_features(ranking, top_k=1)
+    assert top.groupby("target")["selected"].sum().tolist() == [1, 1]
+    thresholded = select_features(ranking, importance_threshold=0.05)
+    assert thresholded.set_index(["target", "feature"]).loc[("dec", "like"), "selected"]
+    assert not thresholded.set_index(["target", "feature"]).loc[("dec", "noise"), "selected"]
+    with pytest.raises(ValueError):
+        select_features(ranking, score="unknown")
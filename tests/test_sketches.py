@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.sketches import MomentSketch, HyperLogLog, FrameSketch, build_frame_sketches, merge_sketches
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "wave": np.repeat([1, 2, 3], 1000),
+        "attr": rng.normal(6, 2, 3000),
+        "iid": np.arange(3000) // 2,
+        "field": rng.choice(["law", "math", "art"], 3000),
+    })
+    df.loc[::10, "attr"] = np.nan
+    return df
+
+def test_moment_sketch_merge_is_exact():
+    values = np.random.default_rng(2).normal(size=1001)
+    merged = MomentSketch().update(values[:300]).merge(MomentSketch().update(values[300:]))
+    assert merged.n == 1001
+    assert np.isclose(merged.mean, values.mean()) and np.isclose(merged.var, values.var(ddof=1))
+    assert merged.min == values.min() and merged.max == values.max()
+
+def test_hyperloglog_counts_and_merge():
+    left = HyperLogLog().update(np.arange(0, 6000))
+    right = HyperLogLog().update(np.arange(4000, 10000))
+    assert abs(left.count() - 6000) / 6000 < 0.05
+    assert abs(left.merge(right).count() - 10000) / 10000 < 0.05
+    assert HyperLogLog().update(["a", "b", "a", None]).count() == 2
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+def test_frame_sketch_per_wave_matches_describe(sample_df, tmp_path):
+    by_wave = build_frame_sketches(sample_df, by="wave", random_state=0)
+    assert sorted(by_wave) == [1, 2, 3]
+    merged = merge_sketches(by_wave.values())
+    assert by_wave[1].n_rows == 1000 and merged.n_rows == 3000
+
+    described, expected = merged.describe(), sample_df.describe()
+    for stat in ["count", "mean", "std", "min", "max"]:
+        assert np.allclose(described.loc[stat, ["attr", "iid"]], expected.loc[stat, ["attr", "iid"]])
+    assert np.allclose(described.loc[["25%", "50%", "75%"], "attr"], expected.loc[["25%", "50%", "75%"], "attr"], atol=0.1)
+    assert "field" not in described.columns
+
+    info = merged.info()
+    assert info.at["attr", "null"] == 300 and info.at["attr", "non_null"] == 2700
+    assert info.at["field", "distinct"] == 3 and abs(info.at["iid", "distinct"] - 1500) < 75
+
+    merged.save(str(tmp_path / "sketch.pkl"))
+    assert FrameSketch.load(str(tmp_path / "sketch.pkl")).describe().equals(described)
+
+def test_chunked_sketches_cover_all_rows(sample_df):
+    chunks = build_frame_sketches(sample_df, chunk_size=700)
+    assert len(chunks) == 5
+    assert merge_sketches(chunks.values()).info().at["attr", "non_null"] == 2700
+    assert merge_sketches([]).n_rows == 0
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+from src.utils.io import load_json
+from src.utils.io import save_json
+from src.data.text_normalization import (TextNormalizer, normalize_text_columns, normalize_key, soundex,
+                                         blocking_keys, edit_distance, CACHE_VERSION)
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        "field": ["Law", "law ", "LAW.", "Lawe", "Economics", "Economics", "Econimics", "Business/MBA", "MBA business", None],
+        "from": ["New York", "new york", "NYC", "Paris", "Paris", "Pariss", "Bogotá", "Bogota", "Paris", "Paris"],
+    })
+
+def test_keys():
+    assert normalize_key("  Bogotá, COLOMBIA ") == "bogota colombia"
+    assert soundex("robert") == "r163" and soundex("rupert") == "r163" and soundex("ashcraft") == "a261"
+    assert "tok:business mba" in blocking_keys("mba business")
+    assert edit_distance("econimics", "economics") == 1 and edit_distance("pairs", "paris") == 1
+    assert edit_distance("australia", "austria", max_distance=1) == 2
+
+def test_variants_grouped(sample_df):
+    normalizer = TextNormalizer()
+    assert normalizer.update(sample_df["field"]) == 8
+    result = normalizer.transform(sample_df["field"])
+    # Clés identiques fusionnées ; "Lawe" est trop court pour une fusion approximative
+    assert result[:4].tolist() == ["Law"] * 3 + ["Lawe"]
+    assert result[4:7].tolist() == ["Economics"] * 3
+    assert result[7] == result[8]
+    assert pd.isna(result[9])
+    assert normalizer.update(sample_df["field"]) == 0
+
+def test_distinct_entities_not_merged():
+    values = pd.Series(["Colombia"] * 3 + ["Columbia"] * 3 + ["Australia"] * 2 + ["Austria"] * 5 + ["Austrial"])
+    normalizer = TextNormalizer()
+    normalizer.update(values)
+    result = normalizer.transform(values)
+    assert result.value_counts().to_dict() == {"Austria": 6, "Colombia": 3, "Columbia": 3, "Australia": 2}
+
+def test_persistent_cache_only_processes_unseen(sample_df, tmp_path):
+    cache_path = str(tmp_path / "mapping.json")
+    df = normalize_text_columns(sample_df.copy(), cache_path=cache_path)
+    assert df["from"].tolist()[:2] == ["New York", "New York"]
+    assert df["from"].tolist()[3:6] == ["Paris"] * 3 and df["from"][6] == df["from"][7]
+
+    # Nouvelle vague : les correspondances existantes sont réutilisées, seules les nouvelles chaînes sont traitées
+    new_wave = pd.DataFrame({"field": ["law", "Lawe", "Physics"], "from": ["Pariss", "Paris", "Lyon"]})
+    cache = load_json(cache_path)
+    assert cache["version"] == CACHE_VERSION and cache["columns"]["from"]["counts"]["Paris"] == 5
+    normalizer = TextNormalizer(mapping=cache["columns"]["field"]["mapping"])
+    assert normalizer.update(new_wave["field"]) == 2
+    result = normalize_text_columns(new_wave, cache_path=cache_path)
+    assert result["field"].tolist() == ["Law", "Lawe", "Physics"]
+    assert result["from"].tolist() == ["Paris", "Paris", "Lyon"]
+
+def test_cache_hand_edits_kept_and_old_format_rebuilt(sample_df, tmp_path):
+    cache_path = str(tmp_path / "mapping.json")
+    normalize_text_columns(sample_df.copy(), cache_path=cache_path)
+    cache = load_json(cache_path)
+    cache["columns"]["field"]["mapping"]["Lawe"] = "Law"
+    save_json(cache, cache_path)
+    assert normalize_text_columns(sample_df.copy(), cache_path=cache_path)["field"][3] == "Law"
+
+    # Un cache sans version (anciennes règles) est ignoré puis reconstruit
+    save_json({"field": {"Columbia": "Colombia"}}, cache_path)
+    df = normalize_text_columns(pd.DataFrame({"field": ["Columbia", "Colombia"]}), cache_path=cache_path)
+    assert df["field"].tolist() == ["Columbia", "Colombia"]
+    assert load_json(cache_path)["version"] == CACHE_VERSION
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.validation import (DataQualityValidator, RangeRule, SumRule, ReferenceRule, DtypeRule,
+                                 validate_data, default_rules)
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        "wave": [1, 1, 1, 1, 2],
+        "iid": [1, 2, 1, 3, 4],
+        "pid": [2, 1, 3, 5, np.nan],
+        "attr": [5, 11, 0, 7, np.nan],
+        "like": [5, 6, 7, 8, 9],
+        "attr1_1": [50, 40, np.nan, 10, 20],
+        "sinc1_1": [50, 40, np.nan, 10, 20],
+        "match": [0, 1, 0.5, 1, 0],
+    }, index=[10, 11, 12, 13, 14])
+
+def test_range_and_sum_rules(sample_df):
+    rules = [RangeRule("rating", ["attr", "like"], 1, 10), SumRule("alloc", ["attr1_1", "sinc1_1"], total=100)]
+    report = DataQualityValidator(rules).validate(sample_df)
+    assert list(report["rating"]) == [11, 12]
+    # La ligne entièrement manquante est ignorée
+    assert list(report["alloc"]) == [11, 13, 14]
+    assert report.summary.set_index("rule")["n_violations"].to_dict() == {"rating": 2, "alloc": 3}
+    assert not report.is_valid
+
+def test_reference_rule(sample_df):
+    report = DataQualityValidator([ReferenceRule("ref", "iid", "pid", "wave", reciprocal=True)]).validate(sample_df)
+    # pid 3 existe mais sans ligne réciproque ; pid 5 n'existe pas ; pid manquant ignoré
+    assert list(report["ref"]) == [12, 13]
+    report = DataQualityValidator([ReferenceRule("ref", "iid", "pid", "wave", reciprocal=False)]).validate(sample_df)
+    assert list(report["ref"]) == [13]
+    # Dans une autre vague, la référence n'existe pas
+    shifted = sample_df.assign(wave=[1, 2, 1, 1, 2])
+    report = DataQualityValidator([ReferenceRule("ref", reciprocal=False)]).validate(shifted)
+    assert list(report["ref"]) == [10, 11, 13]
+
+def test_dtype_rule_and_missing_columns(sample_df):
+    rules = [DtypeRule("ints", ["iid", "match"], "integer"), DtypeRule("text", ["field"], "string"),
+             RangeRule("absent", ["unknown"], 0, 1)]
+    report = validate_data(sample_df, rules)
+    assert list(report["ints"]) == [12]
+    summary = report.summary.set_index("rule")
+    assert summary.loc["text", "n_violations"] == 0 and summary.loc["absent", "n_checked_columns"] == 0
+
+def test_default_rules_and_invalid_definitions(sample_df):
+    report = validate_data(sample_df)
+    assert set(report.violations) == {rule.name for rule in default_rules()}
+    with pytest.raises(ValueError):
+        DataQualityValidator([RangeRule("r", ["attr"]), RangeRule("r", ["like"])])
+    with pytest.raises(ValueError):
+        DtypeRule("d", ["attr"], "date")